@@ -4,9 +4,18 @@ set -o errexit
 # Instalar dependencias de Python desde requirements.txt
 pip install -r requirements.txt
 
-# Recolectar archivos estáticos
+# Verificar que el Chart.js versionado sea el fijado en settings (falla el build si no coincide el SHA-256)
+python manage.py verificar_chartjs
+
+# Recolectar archivos estáticos (con hash en el nombre y versiones .gz/.br, ver settings.STORAGES)
 python manage.py collectstatic --noinput
 
 # Ejecutar migraciones de la base de datos
 # Render inyectará la DATABASE_URL, así que este comando funcionará con PostgreSQL
 python manage.py migrate
+
+# Precargar las series: compila en paralelo los artefactos (COMPARADOR_ARTEFACTOS_DIR) de todos los libros del Excel,
+# también los archivados como vintages, así el proceso web no parsea ni levanta un pool de procesos, y verifica que
+# todas las fuentes se puedan leer. Como hook post-deploy, 'python manage.py calentar --url https://<host>/listo/'
+# espera a que un worker haya precargado sus series; /listo/ también sirve como health check (503 hasta estar listo).
+python manage.py calentar
@@ -1,3 +1,19 @@
 from django.contrib import admin
 
-# Register your models here.
+from .models import RegistroComparacion, ResumenComparaciones
+
+
+@admin.register(RegistroComparacion)
+class RegistroComparacionAdmin(admin.ModelAdmin):
+    list_display = ('fecha_registro', 'fuente', 'region', 'mes_inicial', 'mes_final', 'resultado', 'diferencia')
+    list_filter = ('fuente', 'resultado')
+    date_hierarchy = 'fecha_registro'
+    show_full_result_count = False # Evita un COUNT(*) sobre toda la tabla en cada página
+
+
+@admin.register(ResumenComparaciones)
+class ResumenComparacionesAdmin(admin.ModelAdmin):
+    list_display = ('fuente', 'region', 'mes_inicial', 'mes_final', 'comparaciones', 'ganadas', 'perdidas',
+                    'empatadas', 'diferencia_promedio', 'ultima_consulta')
+    list_filter = ('fuente', 'region')
+    ordering = ('-comparaciones',)
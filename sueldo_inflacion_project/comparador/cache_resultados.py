@@ -0,0 +1,44 @@
+# comparador/cache_resultados.py
+import hashlib
+
+from django.core.cache import caches
+from django.template.loader import render_to_string
+
+# Alias del cache definido en settings.CACHES
+CACHE_ALIAS = 'resultados'
+
+# Forma de los fragmentos: cambia cuando cambian las plantillas, así un cache persistente no
+# devuelve fragmentos viejos (ej. los que traían el script del gráfico en línea)
+VERSION_FRAGMENTOS = 2
+
+
+def clave_resultado(version, *entradas):
+    """
+    Clave del cache a partir de las entradas ya normalizadas (ej. fechas 'AAAA-MM', sueldos como float)
+    y de la versión de los datos (Fuente.version en domain/fuentes.py).
+    """
+    normalizadas = "|".join(str(entrada) for entrada in entradas)
+    return f"resultado:v{VERSION_FRAGMENTOS}:" + hashlib.sha1(f"{version}|{normalizadas}".encode()).hexdigest()
+
+
+def obtener_fragmentos(clave):
+    """
+    Devuelve el dict de fragmentos HTML cacheados ('resultado_html', 'grafico_html', 'error_message', 'registro') o None.
+    """
+    return caches[CACHE_ALIAS].get(clave)
+
+
+def renderizar_fragmentos(clave, result, error_message=None, registro=None):
+    """
+    Renderiza los fragmentos de resultado y gráfico una sola vez y los guarda en el cache.
+    'registro' (los valores numéricos de la comparación) se guarda junto a ellos para poder
+    registrar también los pedidos que se responden desde el cache.
+    """
+    fragmentos = {
+        'resultado_html': render_to_string('comparador/_resultado.html', {'result': result}),
+        'grafico_html': render_to_string('comparador/_grafico.html', {'result': result}),
+        'error_message': error_message,
+        'registro': registro,
+    }
+    caches[CACHE_ALIAS].set(clave, fragmentos)
+    return fragmentos
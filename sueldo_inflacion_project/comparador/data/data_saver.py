@@ -1,22 +1,64 @@
+import atexit
+import logging
+import queue
+import threading
+import time
+
 import pandas as pd
 from sqlalchemy import create_engine
 from sqlalchemy.exc import SQLAlchemyError
 from decouple import config
 
+logger = logging.getLogger(__name__)
+
+# Engine compartido por todo el proceso: se crea con el primer guardado, no al importar ni al construir DataSaver
+_ENGINE = None
+_lock_engine = threading.Lock()
+
+
+def _url_base_datos():
+    # DATASAVER_URL permite apuntar a otra base (por ejemplo sqlite:///ipc.sqlite3) sin las variables DB_*
+    url = config('DATASAVER_URL', default='')
+    if url:
+        return url
+    user = config('DB_USER')
+    password = config('DB_PASSWORD')
+    host = config('DB_HOST')
+    port = config('DB_PORT')
+    database = config('DB_NAME')
+    return f"mysql+pymysql://{user}:{password}@{host}:{port}/{database}"
+
+
+def obtener_engine():
+    """
+    Devuelve el engine de SQLAlchemy del proceso, creándolo (con su pool de conexiones) la primera vez.
+    """
+    global _ENGINE
+    if _ENGINE is None:
+        with _lock_engine:
+            if _ENGINE is None:
+                url = _url_base_datos()
+                opciones = {}
+                if not url.startswith('sqlite'):
+                    opciones = {
+                        'pool_size': config('DATASAVER_POOL_SIZE', default=5, cast=int),
+                        'max_overflow': config('DATASAVER_POOL_OVERFLOW', default=5, cast=int),
+                        'pool_recycle': 3600, # MySQL cierra las conexiones inactivas (wait_timeout)
+                        'pool_pre_ping': True,
+                    }
+                _ENGINE = create_engine(url, **opciones)
+    return _ENGINE
 
-class DataSaver:
-    def __init__(self):
-         user = config('DB_USER')
-         password = config('DB_PASSWORD')
-         host = config('DB_HOST')
-         port = config('DB_PORT')
-         database = config('DB_NAME')
 
-         url = f"mysql+pymysql://{user}:{password}@{host}:{port}/{database}"
-         self.engine = create_engine(url)
+class DataSaver:
+    def __init__(self, engine=None):
+        self._engine = engine
 
+    @property
+    def engine(self):
+        return self._engine if self._engine is not None else obtener_engine()
 
-    def guardar_dataframe(self, df, nombre_tabla):
+    def guardar_dataframe(self, df, nombre_tabla, if_exists='replace'):
         if df is None:
             print(f"No se puede guardar: datos vacios para {nombre_tabla}")
             return
@@ -27,9 +69,143 @@ class DataSaver:
 
         try:
 
-            df.to_sql(nombre_tabla, con=self.engine, if_exists='replace', index=False)
+            df.to_sql(nombre_tabla, con=self.engine, if_exists=if_exists, index=False,
+                      method='multi', chunksize=1000)
 
             print(f"Datos guardados en tabla: {nombre_tabla}")
 
         except SQLAlchemyError as e:
-            print(f"Error guardando datos: {e}")
\ No newline at end of file
+            print(f"Error guardando datos: {e}")
+
+
+class ColaEscritura:
+    """
+    Cola acotada de escrituras diferidas ("write-behind"): quien encola no espera a la base de datos.
+    Un hilo en segundo plano la vacía en lotes: los DataFrames en modo 'append' de una misma tabla se
+    concatenan en un único INSERT multi-fila, y de los 'replace' de una tabla solo se escribe el último.
+
+    Si la cola está llena, la escritura se descarta (y se cuenta) en lugar de bloquear al que encola.
+    """
+
+    def __init__(self, saver=None, max_pendientes=1000, max_lote=200):
+        self.saver = saver or DataSaver()
+        self.max_lote = max_lote
+        self._cola = queue.Queue(maxsize=max_pendientes)
+        self._hilo = None
+        self._lock = threading.Lock()
+        self._estadisticas = {
+            'encolados': 0, 'escritos': 0, 'descartados': 0, 'errores': 0, 'lotes': 0,
+            'ultimo_lote_ms': None, 'max_lote_ms': 0.0, 'total_lotes_ms': 0.0,
+        }
+
+    def _iniciar(self):
+        with self._lock:
+            if self._hilo is None or not self._hilo.is_alive():
+                self._hilo = threading.Thread(target=self._trabajar, name='comparador-escrituras', daemon=True)
+                self._hilo.start()
+
+    def encolar(self, df, nombre_tabla, if_exists='append'):
+        """
+        Agrega una escritura a la cola sin bloquear.
+
+        Returns:
+            bool: False si la cola estaba llena y la escritura se descartó.
+        """
+        self._iniciar()
+        try:
+            self._cola.put_nowait((df, nombre_tabla, if_exists))
+        except queue.Full:
+            with self._lock:
+                self._estadisticas['descartados'] += 1
+            return False
+        with self._lock:
+            self._estadisticas['encolados'] += 1
+        return True
+
+    def _trabajar(self):
+        while True:
+            lote = [self._cola.get()]
+            while len(lote) < self.max_lote:
+                try:
+                    lote.append(self._cola.get_nowait())
+                except queue.Empty:
+                    break
+            try:
+                self._escribir_lote(lote)
+            finally:
+                for _ in lote:
+                    self._cola.task_done()
+
+    def _escribir_lote(self, lote):
+        # Se agrupa por tabla respetando el orden de llegada; un 'replace' descarta lo anterior de esa tabla
+        por_tabla = {}
+        for df, nombre_tabla, if_exists in lote:
+            if if_exists == 'replace' or nombre_tabla not in por_tabla:
+                por_tabla[nombre_tabla] = [if_exists, [df]]
+            else:
+                por_tabla[nombre_tabla][1].append(df)
+
+        inicio = time.perf_counter()
+        errores = 0
+        for nombre_tabla, (if_exists, dfs) in por_tabla.items():
+            try:
+                df = dfs[0] if len(dfs) == 1 else pd.concat(dfs, ignore_index=True)
+                df.to_sql(nombre_tabla, con=self.saver.engine, if_exists=if_exists, index=False,
+                          method='multi', chunksize=1000)
+            except Exception: # El hilo de escritura no debe morir por un lote con problemas
+                errores += len(dfs)
+                logger.exception("Error guardando datos en %s", nombre_tabla)
+        duracion_ms = (time.perf_counter() - inicio) * 1000
+
+        with self._lock:
+            estadisticas = self._estadisticas
+            estadisticas['lotes'] += 1
+            estadisticas['escritos'] += len(lote) - errores
+            estadisticas['errores'] += errores
+            estadisticas['ultimo_lote_ms'] = round(duracion_ms, 2)
+            estadisticas['max_lote_ms'] = round(max(estadisticas['max_lote_ms'], duracion_ms), 2)
+            estadisticas['total_lotes_ms'] += duracion_ms
+
+    def vaciar(self, timeout=None):
+        """
+        Espera a que se escriba todo lo encolado (o a que pase 'timeout' segundos).
+
+        Returns:
+            bool: True si la cola quedó vacía.
+        """
+        limite = None if timeout is None else time.monotonic() + timeout
+        while self._cola.unfinished_tasks:
+            if limite is not None and time.monotonic() >= limite:
+                return False
+            time.sleep(0.01)
+        return True
+
+    def estadisticas(self):
+        """
+        Profundidad actual de la cola y contadores/tiempos de los lotes escritos.
+        """
+        with self._lock:
+            estadisticas = dict(self._estadisticas)
+        lotes = estadisticas['lotes']
+        estadisticas['promedio_lote_ms'] = round(estadisticas.pop('total_lotes_ms') / lotes, 2) if lotes else None
+        estadisticas['profundidad'] = self._cola.qsize()
+        estadisticas['capacidad'] = self._cola.maxsize
+        return estadisticas
+
+
+_COLA = None
+_lock_cola = threading.Lock()
+
+
+def cola_escritura():
+    """
+    Devuelve la cola de escrituras del proceso, creándola la primera vez. Al terminar el proceso
+    se espera (con límite) a que se escriba lo pendiente.
+    """
+    global _COLA
+    if _COLA is None:
+        with _lock_cola:
+            if _COLA is None:
+                _COLA = ColaEscritura(max_pendientes=config('DATASAVER_COLA_MAXIMA', default=1000, cast=int))
+                atexit.register(_COLA.vaciar, 10)
+    return _COLA
@@ -0,0 +1,195 @@
+# domain/alineacion.py
+"""
+Varias series mensuales alineadas en un mismo eje de meses (ordinales, ver meses.py).
+
+Cada fuente arma su índice de fechas a su manera (primer día del mes, fin de mes, lo que salga del
+Excel); acá todas pasan a una matriz (series x meses) con una máscara de validez, sobre meses contiguos.
+Así comparar un sueldo contra el IPC, un tipo de cambio o un índice de salarios (cualquier serie
+mensual registrada en fuentes.py, por ejemplo un CSV propio vía COMPARADOR_FUENTES_JSON) son operaciones
+sobre columnas de la matriz, sin joins de pandas.
+"""
+import threading
+
+import numpy as np
+
+from . import meses as meses_utils
+from .fuentes import cargar_serie, clave_serie
+
+# Paneles ya armados: tupla de (codigo, region, vintage) -> (versiones, PanelMensual)
+_CACHE = {}
+# Las combinaciones las elige el usuario: al llegar a este tamaño el cache se vacía
+MAX_PANELES = 256
+_lock = threading.Lock()
+
+
+class PanelMensual:
+    """
+    Matriz de series mensuales alineadas.
+
+    Attributes:
+        nombres (list[str]): Nombre de cada fila.
+        meses (np.ndarray): Eje común de meses contiguos, int64.
+        valores (np.ndarray): Matriz float64 (series x meses), NaN donde la serie no tiene dato.
+        validos (np.ndarray): Máscara bool de la misma forma: True donde hay un dato.
+    """
+    def __init__(self, series):
+        """
+        Args:
+            series (dict): {nombre: (meses int64, valores float64)}. Los meses de cada serie pueden
+                           tener huecos y no necesitan estar ordenados, pero no repetirse.
+        """
+        self.nombres = list(series)
+        todos = [np.asarray(meses, dtype=np.int64) for meses, _ in series.values()]
+        con_datos = [meses for meses in todos if len(meses)]
+        if con_datos:
+            inicio = min(int(meses.min()) for meses in con_datos)
+            fin = max(int(meses.max()) for meses in con_datos)
+        else:
+            inicio, fin = 0, -1
+        self.meses = np.arange(inicio, fin + 1, dtype=np.int64)
+
+        self.valores = np.full((len(self.nombres), len(self.meses)), np.nan)
+        for fila, (meses, (_, valores)) in enumerate(zip(todos, series.values())):
+            self.valores[fila, meses - inicio] = valores
+        self.validos = ~np.isnan(self.valores)
+        # Posición del último mes con dato en o antes de cada mes del eje, por serie (-1 si no hay ninguno)
+        self._ultimos = np.maximum.accumulate(np.where(self.validos, np.arange(len(self.meses)), -1), axis=1)
+
+    @classmethod
+    def desde_dataframes(cls, series):
+        """
+        Arma el panel a partir de DataFrames con índice de fechas.
+
+        Args:
+            series (dict): {nombre: (DataFrame, columna de valores)}.
+        """
+        return cls({nombre: meses_utils.de_serie(df, columna) for nombre, (df, columna) in series.items()})
+
+    def fila(self, nombre):
+        try:
+            return self.nombres.index(nombre)
+        except ValueError:
+            raise ValueError(f"La serie '{nombre}' no está en el panel.") from None
+
+    def columnas(self, meses_buscados):
+        """
+        Posición de cada mes en el eje común, -1 si queda fuera del panel.
+        """
+        posiciones = np.asarray(meses_buscados, dtype=np.int64) - (self.meses[0] if len(self.meses) else 0)
+        return np.where((posiciones >= 0) & (posiciones < len(self.meses)), posiciones, -1)
+
+    def valores_en(self, meses_buscados):
+        """
+        Valores de todas las series en los meses buscados: matriz (series x meses buscados), NaN fuera del panel.
+        """
+        posiciones = self.columnas(meses_buscados)
+        resultado = np.full((len(self.nombres), len(posiciones)), np.nan)
+        dentro = posiciones >= 0
+        resultado[:, dentro] = self.valores[:, posiciones[dentro]]
+        return resultado
+
+    def valores_asof(self, meses_buscados):
+        """
+        Como valores_en, pero con la regla de calculo.comparar_meses (Series.asof()): el último dato de cada
+        serie en o antes de cada mes buscado, también pasado el final del panel. NaN si no hay ninguno.
+        """
+        meses_buscados = np.asarray(meses_buscados, dtype=np.int64)
+        resultado = np.full((len(self.nombres), len(meses_buscados)), np.nan)
+        if not len(self.meses):
+            return resultado
+        posiciones = np.minimum(meses_buscados - self.meses[0], len(self.meses) - 1)
+        dentro = posiciones >= 0
+        ultimos = self._ultimos[:, posiciones[dentro]]
+        filas = np.arange(len(self.nombres))[:, None]
+        resultado[:, dentro] = np.where(ultimos >= 0, self.valores[filas, np.maximum(ultimos, 0)], np.nan)
+        return resultado
+
+    def primeros(self):
+        """
+        Primer dato de cada serie (NaN para una serie sin datos).
+        """
+        if not len(self.meses):
+            return np.full(len(self.nombres), np.nan)
+        primeros = self.valores[np.arange(len(self.nombres)), self.validos.argmax(axis=1)]
+        return np.where(self.validos.any(axis=1), primeros, np.nan)
+
+    def comunes(self, nombres=None):
+        """
+        Máscara de meses en los que todas las series indicadas (por defecto todas) tienen dato.
+        """
+        filas = self.valores if nombres is None else self.valores[[self.fila(nombre) for nombre in nombres]]
+        return ~np.isnan(filas).any(axis=0)
+
+    def cociente(self, numerador, denominador):
+        """
+        Serie numerador / denominador mes a mes (ej. IPC en dólares = IPC / tipo de cambio), NaN si falta alguno.
+        """
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return self.valores[self.fila(numerador)] / self.valores[self.fila(denominador)]
+
+    def rebasar(self, mes_base):
+        """
+        Todas las series con base 100 en 'mes_base' (NaN para las que no tienen dato ese mes).
+        """
+        base = self.valores_en([mes_base])
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return self.valores / base * 100
+
+    def variaciones(self, mes_base, mes_hasta):
+        """
+        Variación porcentual de cada serie entre dos meses: un vector con una entrada por serie.
+        Usa las reglas de calculo.comparar_meses (con mes_base = mes anterior al inicial): el último dato
+        en o antes de cada mes y, si no hay ninguno antes del mes base, el primer dato de la serie.
+        """
+        base = self.valores_asof([mes_base])[:, 0]
+        base = np.where(np.isnan(base), self.primeros(), base)
+        fin = self.valores_asof([mes_hasta])[:, 0]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return np.where(base != 0, (fin / base - 1) * 100, np.nan)
+
+    def deflactar(self, meses_sueldos, sueldos, mes_base):
+        """
+        Expresa cada sueldo en unidades de cada serie, llevadas al mes base: sueldo * S[base] / S[mes del sueldo].
+        Con el IPC son pesos constantes del mes base; con un tipo de cambio, el equivalente en esa moneda a
+        la cotización del mes base; con un índice de salarios, el sueldo relativo al salario de referencia.
+        Los valores se buscan como en valores_asof (el 'sueldo_real_ajustado' de calculo.comparar_meses).
+
+        Returns:
+            np.ndarray: Matriz (series x sueldos).
+        """
+        sueldos = np.asarray(sueldos, dtype=np.float64)
+        base = self.valores_asof([mes_base])
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return sueldos * base / self.valores_asof(meses_sueldos)
+
+
+def obtener_panel(series):
+    """
+    Panel de series del registro de fuentes, armado una sola vez por combinación de versiones.
+
+    Args:
+        series (list[tuple]): (codigo, region_name, fecha_vintage) de cada serie, en el orden de las filas.
+
+    Returns:
+        PanelMensual: Con nombres 'codigo' o 'codigo/region'.
+    """
+    claves = tuple(clave_serie(codigo, region_name, fecha_vintage) for codigo, region_name, fecha_vintage in series)
+    if len(set(claves)) != len(claves):
+        raise ValueError("Hay series repetidas en el pedido.")
+    cargadas = [cargar_serie(codigo, region_name, fecha_vintage) for codigo, region_name, fecha_vintage in series]
+    versiones = tuple(version for _, _, version in cargadas)
+
+    cacheado = _CACHE.get(claves)
+    if cacheado is None or cacheado[0] != versiones:
+        datos = {}
+        for (codigo, region_name, vintage), (df, columna, _) in zip(claves, cargadas):
+            if df is None or df.empty:
+                raise ValueError(f"No se pudieron cargar los datos de la fuente '{codigo}'.")
+            nombre = "/".join(parte for parte in (codigo, region_name, vintage) if parte)
+            datos[nombre] = meses_utils.de_serie(df, columna)
+        cacheado = (versiones, PanelMensual(datos))
+        with _lock:
+            if len(_CACHE) >= MAX_PANELES:
+                _CACHE.clear()
+            _CACHE[claves] = cacheado
+    return cacheado[1]
@@ -0,0 +1,93 @@
+# domain/analitica.py
+import threading
+
+import numpy as np
+
+from . import meses as meses_utils
+from .fuentes import cargar_serie, clave_serie
+
+# Ventanas (en meses) de la inflación acumulada "móvil"
+VENTANAS = (3, 6, 12)
+
+# Analítica ya calculada por serie: (codigo, region, vintage) -> (versión, resultado)
+_CACHE = {}
+_lock = threading.Lock()
+
+
+def grilla_mensual(df, valor_columna='ipc_valor'):
+    """
+    Lleva la serie a una grilla de meses contiguos (ordinales año * 12 + mes - 1) con NaN en los huecos,
+    para que un desplazamiento de k posiciones sea siempre k meses.
+
+    Returns:
+        tuple: (meses int64, valores float64), ambos del mismo largo.
+    """
+    meses_serie, valores_serie = meses_utils.de_serie(df, valor_columna)
+    if len(meses_serie) == 0:
+        return meses_serie, valores_serie
+
+    meses = np.arange(meses_serie[0], meses_serie[-1] + 1, dtype=np.int64)
+    valores = np.full(len(meses), np.nan)
+    valores[meses_serie - meses[0]] = valores_serie
+    return meses, valores
+
+
+def _variacion(log_indice, k):
+    """
+    Variación porcentual entre cada mes y k meses antes: exp(log I_t - log I_{t-k}) - 1.
+    """
+    resultado = np.full(len(log_indice), np.nan)
+    if k < len(log_indice):
+        resultado[k:] = np.expm1(log_indice[k:] - log_indice[:-k]) * 100
+    return resultado
+
+
+def calcular_analitica(meses, valores):
+    """
+    Calcula para cada mes de la serie, en forma vectorizada:
+    - 'mensual': variación contra el mes anterior (la tasa mensual implícita en el índice).
+    - 'acumulada_3m', 'acumulada_6m', 'acumulada_12m': variación acumulada en los últimos 3, 6 y 12 meses.
+      La de 12 meses es la variación interanual.
+    - 'anualizada_mensual' y 'anualizada_3m': la tasa mensual y la de los últimos 3 meses llevadas a un año.
+
+    Todas en porcentaje, NaN donde no hay meses suficientes o el índice no es positivo.
+    """
+    with np.errstate(divide='ignore', invalid='ignore'):
+        log_indice = np.log(np.where(valores > 0, valores, np.nan))
+
+        resultado = {
+            'meses': meses,
+            'indice': valores,
+            'mensual': _variacion(log_indice, 1),
+        }
+        for ventana in VENTANAS:
+            resultado[f'acumulada_{ventana}m'] = _variacion(log_indice, ventana)
+
+        # Anualizar es escalar la diferencia de logaritmos: 12/k veces el crecimiento de k meses
+        for nombre, k in (('anualizada_mensual', 1), ('anualizada_3m', 3)):
+            diferencia = np.full(len(log_indice), np.nan)
+            if k < len(log_indice):
+                diferencia[k:] = log_indice[k:] - log_indice[:-k]
+            resultado[nombre] = np.expm1(diferencia * 12 / k) * 100
+
+    return resultado
+
+
+def obtener_analitica(codigo, region_name=None, fecha_vintage=None):
+    """
+    Devuelve la analítica completa de una serie del registro, calculándola una sola vez por versión de datos.
+
+    Returns:
+        tuple: (versión de los datos, dict de arrays de calcular_analitica)
+    """
+    df, columna, version = cargar_serie(codigo, region_name, fecha_vintage)
+    if df is None or df.empty:
+        raise ValueError("No se pudieron cargar los datos de IPC desde la fuente seleccionada.")
+
+    clave = clave_serie(codigo, region_name, fecha_vintage)
+    cacheado = _CACHE.get(clave)
+    if cacheado is None or cacheado[0] != version:
+        cacheado = (version, calcular_analitica(*grilla_mensual(df, columna)))
+        with _lock:
+            _CACHE[clave] = cacheado
+    return cacheado
@@ -0,0 +1,120 @@
+# domain/artefactos.py
+"""
+Cache en disco de "artefactos compilados": el resultado de parsear un archivo fuente (por ejemplo las
+variaciones por región de un sh_ipc_*.xls) guardado como .npz.
+
+La clave es el SHA-256 del contenido del archivo más la versión del parser, así que un archivo sin
+cambios nunca se vuelve a parsear (ni entre reinicios ni entre workers), y un archivo modificado solo
+recompila sus propios artefactos. Las escrituras son atómicas (archivo temporal + os.replace), por lo
+que varios procesos pueden compartir el directorio.
+"""
+import hashlib
+import os
+import tempfile
+import threading
+
+import numpy as np
+
+# Directorio de artefactos; configurable para compartirlo entre procesos o ubicarlo en un disco persistente
+ARTEFACTOS_DIR = os.environ.get('COMPARADOR_ARTEFACTOS_DIR',
+                                os.path.join(tempfile.gettempdir(), 'comparador_artefactos'))
+
+# Incrementar cuando cambie la salida de un parser para invalidar los artefactos existentes
+# (2: los libros del INDEC agregan la matriz de divisiones por región)
+VERSION_PARSER = 2
+
+# Hashes ya calculados: ruta -> ((mtime_ns, tamaño), sha256)
+_HASHES = {}
+_lock = threading.Lock()
+
+
+def hash_archivo(ruta):
+    """
+    SHA-256 del contenido del archivo. Se recalcula solo si cambian su fecha de modificación o tamaño.
+    """
+    estado = os.stat(ruta)
+    firma = (estado.st_mtime_ns, estado.st_size)
+    cacheado = _HASHES.get(ruta)
+    if cacheado is not None and cacheado[0] == firma:
+        return cacheado[1]
+
+    sha = hashlib.sha256()
+    with open(ruta, 'rb') as archivo:
+        for bloque in iter(lambda: archivo.read(1 << 20), b''):
+            sha.update(bloque)
+    digest = sha.hexdigest()
+    with _lock:
+        _HASHES[ruta] = (firma, digest)
+    return digest
+
+
+def ruta_artefacto(ruta, nombre):
+    """
+    Ruta del artefacto 'nombre' para el contenido actual del archivo 'ruta'.
+    """
+    return os.path.join(ARTEFACTOS_DIR, f"{nombre}-v{VERSION_PARSER}-{hash_archivo(ruta)}.npz")
+
+
+def _guardar(destino, compilado):
+    """
+    Guarda {clave: (array, array, ...)} en un .npz sin objetos pickle y lo publica con os.replace.
+    """
+    os.makedirs(ARTEFACTOS_DIR, exist_ok=True)
+    claves = list(compilado)
+    arrays = {'claves': np.array(claves, dtype=str)}
+    for i, clave in enumerate(claves):
+        for j, array in enumerate(compilado[clave]):
+            arrays[f"a{i}_{j}"] = array
+    descriptor, temporal = tempfile.mkstemp(dir=ARTEFACTOS_DIR, suffix='.tmp')
+    try:
+        with os.fdopen(descriptor, 'wb') as archivo:
+            np.savez(archivo, **arrays)
+        os.replace(temporal, destino)
+    except BaseException:
+        os.unlink(temporal)
+        raise
+
+
+def _cargar(origen):
+    with np.load(origen, allow_pickle=False) as npz:
+        claves = npz['claves'].tolist()
+        compilado = {}
+        for i, clave in enumerate(claves):
+            partes = []
+            j = 0
+            while f"a{i}_{j}" in npz.files:
+                partes.append(npz[f"a{i}_{j}"])
+                j += 1
+            compilado[clave] = tuple(partes)
+        return compilado
+
+
+def buscar(ruta, nombre):
+    """
+    Devuelve el artefacto compilado si existe para el contenido actual del archivo, o None.
+    """
+    destino = ruta_artefacto(ruta, nombre)
+    try:
+        return _cargar(destino)
+    except (OSError, ValueError, KeyError):
+        # No existe, o quedó ilegible: se recompila
+        return None
+
+
+def cargar_o_compilar(ruta, nombre, compilar):
+    """
+    Devuelve el artefacto 'nombre' de 'ruta', compilándolo con compilar(ruta) solo si no existe.
+
+    Args:
+        ruta (str): Archivo fuente.
+        nombre (str): Nombre del artefacto (identifica al parser).
+        compilar (callable): Función ruta -> {clave: tuple de arrays numpy}.
+    """
+    compilado = buscar(ruta, nombre)
+    if compilado is None:
+        compilado = compilar(ruta)
+        try:
+            _guardar(ruta_artefacto(ruta, nombre), compilado)
+        except OSError as e:
+            print(f"Advertencia: no se pudo guardar el artefacto compilado de {ruta}: {e}")
+    return compilado
@@ -0,0 +1,132 @@
+# domain/calculo.py
+import numpy as np
+import pandas as pd
+
+from . import meses
+
+
+def _asof(meses_serie, valores_serie, meses_buscados):
+    """
+    Equivalente vectorizado de Series.asof() sobre un índice mensual ordenado:
+    devuelve el último valor en o antes de cada mes buscado, NaN si no hay ninguno.
+    """
+    posiciones = np.searchsorted(meses_serie, meses_buscados, side='right') - 1
+    resultado = np.full(len(meses_buscados), np.nan)
+    validas = posiciones >= 0
+    resultado[validas] = valores_serie[posiciones[validas]]
+    return resultado
+
+
+def calcular_comparaciones(df, fechas_inicio, fechas_fin, sueldos_inicio, sueldos_fin, valor_columna='ipc_valor'):
+    """
+    Calcula en bloque, para muchas comparaciones contra una misma serie de IPC, los mismos valores
+    que muestra views.index: inflación del período (base = mes anterior al inicial, con la misma
+    contingencia que calcular_inflacion_periodo en los bordes de la serie), incremento salarial y
+    sueldo final en pesos de la fecha inicial.
+
+    Args:
+        df (pd.DataFrame): IPC con DatetimeIndex mensual y la columna 'valor_columna'.
+        fechas_inicio, fechas_fin: Meses de los sueldos, como fechas u ordinales (ver meses.py).
+        sueldos_inicio, sueldos_fin: Sueldos inicial y final.
+        valor_columna (str): Columna con los valores del IPC.
+
+    Returns:
+        pd.DataFrame: Columnas 'inflacion_acumulada', 'incremento_salarial', 'diferencia' y
+                      'sueldo_real_ajustado', en el orden de las entradas (NaN donde no se pudo calcular).
+    """
+    meses_serie, valores_serie = meses.de_serie(df, valor_columna)
+    return pd.DataFrame(comparar_meses(meses_serie, valores_serie, meses.desde_fechas(fechas_inicio),
+                                       meses.desde_fechas(fechas_fin), sueldos_inicio, sueldos_fin))
+
+
+def comparar_meses(meses_serie, valores_serie, meses_inicio, meses_fin, sueldos_inicio, sueldos_fin):
+    """
+    Núcleo de calcular_comparaciones sobre arrays: la serie como (ordinales de mes, valores) ordenados
+    y las comparaciones con sus meses ya como ordinales. Sin DataFrames, para usarlo también por pedido.
+
+    Returns:
+        dict: Arrays 'inflacion_acumulada', 'incremento_salarial', 'diferencia' y 'sueldo_real_ajustado'.
+    """
+    meses_inicio = np.asarray(meses_inicio, dtype=np.int64)
+    meses_fin = np.asarray(meses_fin, dtype=np.int64)
+    sueldos_inicio = np.asarray(sueldos_inicio, dtype=np.float64)
+    sueldos_fin = np.asarray(sueldos_fin, dtype=np.float64)
+
+    # Base: mes anterior al inicial. Si queda antes del comienzo de la serie se usa el primer valor disponible.
+    ipc_base = _asof(meses_serie, valores_serie, meses_inicio - 1)
+    if len(valores_serie):
+        ipc_base = np.where(np.isnan(ipc_base), valores_serie[0], ipc_base)
+    ipc_fin = _asof(meses_serie, valores_serie, meses_fin)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        inflacion = np.where(ipc_base != 0, (ipc_fin / ipc_base - 1) * 100, np.nan)
+        incremento = np.where(sueldos_inicio != 0, (sueldos_fin - sueldos_inicio) / sueldos_inicio * 100, 0.0)
+
+        # Poder adquisitivo: IPC de los meses de los sueldos (no de la base)
+        ipc_sueldo_inicio = _asof(meses_serie, valores_serie, meses_inicio)
+        sueldo_real = np.where(ipc_sueldo_inicio != 0, sueldos_fin / (ipc_fin / ipc_sueldo_inicio), np.nan)
+
+    return {
+        'inflacion_acumulada': inflacion,
+        'incremento_salarial': incremento,
+        'diferencia': incremento - inflacion,
+        'sueldo_real_ajustado': sueldo_real,
+    }
+
+
+def proyectar_sueldo(meses_serie, valores_serie, mes_inicial, sueldo_inicial, meses_pagos=(), pagos=()):
+    """
+    Sueldo que mantiene el poder adquisitivo de 'sueldo_inicial' en cada mes de la serie desde 'mes_inicial':
+    sueldo_inicial * IPC[mes] / IPC[base], con la misma base que comparar_meses (el mes anterior al inicial).
+    Así, un sueldo final igual al proyectado para su mes "empata" en el formulario.
+
+    Con pagos (los sueldos efectivamente cobrados), compara cada uno con el proyectado de su mes.
+
+    Args:
+        meses_serie, valores_serie (np.ndarray): La serie como (ordinales de mes, valores), ordenada.
+                                                 Los meses sin dato (NaN) se ignoran.
+        mes_inicial (int): Ordinal del mes del sueldo inicial.
+        sueldo_inicial (float): Sueldo en el mes inicial.
+        meses_pagos (array-like): Ordinales de los meses de cada pago.
+        pagos (array-like): Monto de cada pago.
+
+    Returns:
+        dict: 'meses' y 'sueldo_requerido' (arrays desde el mes inicial hasta el último de la serie) y, por
+              pago, 'requerido' (NaN si el mes no tiene dato), 'diferencia' (pagado - requerido) y 'atraso'
+              (lo que falta para empatar, 0 si el pago alcanza).
+
+    Raises:
+        ValueError: Si la serie no tiene datos desde el mes inicial o algún pago es anterior a ese mes.
+    """
+    validos = valores_serie > 0
+    meses_serie, valores_serie = meses_serie[validos], valores_serie[validos]
+    meses_pagos = np.asarray(meses_pagos, dtype=np.int64)
+    pagos = np.asarray(pagos, dtype=np.float64)
+
+    inicio = int(np.searchsorted(meses_serie, mes_inicial, side='left'))
+    if inicio == len(meses_serie):
+        raise ValueError(f"La serie no tiene datos desde {meses.texto(mes_inicial)}.")
+    if len(meses_pagos) and meses_pagos.min() < mes_inicial:
+        raise ValueError("Los pagos deben ser del mes del sueldo inicial en adelante.")
+
+    ipc_base = _asof(meses_serie, valores_serie, np.array([mes_inicial - 1]))[0]
+    if np.isnan(ipc_base):
+        ipc_base = valores_serie[0]
+    # Sueldo por punto de índice: toda la proyección es una sola multiplicación sobre la serie
+    factor = sueldo_inicial / ipc_base
+
+    # Un pago en un mes sin dato (ej. posterior al último publicado) no se compara con un mes anterior
+    posiciones = np.searchsorted(meses_serie, meses_pagos, side='left')
+    con_dato = posiciones < len(meses_serie)
+    con_dato[con_dato] = meses_serie[posiciones[con_dato]] == meses_pagos[con_dato]
+    requerido = np.full(len(meses_pagos), np.nan)
+    requerido[con_dato] = valores_serie[posiciones[con_dato]] * factor
+
+    diferencia = pagos - requerido
+    return {
+        'meses': meses_serie[inicio:],
+        'sueldo_requerido': valores_serie[inicio:] * factor,
+        'requerido': requerido,
+        'diferencia': diferencia,
+        'atraso': np.where(np.isnan(diferencia), np.nan, np.maximum(-diferencia, 0.0)),
+    }
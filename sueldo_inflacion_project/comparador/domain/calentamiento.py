@@ -0,0 +1,112 @@
+# domain/calentamiento.py
+"""
+Precarga ("calentamiento") de todas las series del registro en el proceso actual.
+
+Cada worker tiene su propio cache de series (ver fuentes.cargar_serie): sin precarga, el primer pedido
+de cada fuente paga el parseo del Excel con xlrd o la llamada a la API. El endpoint /listo/ dispara la
+precarga en un hilo la primera vez que se lo consulta y responde 503 hasta que termina, así el balanceador
+o el hook de deploy (ver 'manage.py calentar') no manda tráfico a un worker frío.
+"""
+import os
+import threading
+import time
+from datetime import datetime
+
+from .dataset_vintage import archivos_vintage
+from .fuentes import REGIONES, cargar_serie, fuentes_registradas
+from .ingesta import ingerir_archivos
+
+PENDIENTE = 'pendiente'
+CARGANDO = 'cargando'
+LISTO = 'listo'
+
+_ESTADO = {'estado': PENDIENTE, 'inicio': None, 'fin': None, 'segundos': None, 'cargadas': 0, 'total': 0, 'errores': {}}
+_lock = threading.Lock()
+
+
+def series_configuradas():
+    """
+    (codigo, region_name) de cada serie a precargar: una por fuente, o una por región en las fuentes
+    por región. Las versiones publicadas a una fecha (vintage) se cargan a pedido.
+    """
+    series = []
+    for fuente in fuentes_registradas():
+        regiones = REGIONES.values() if fuente.requiere_region else [None]
+        series.extend((fuente.codigo, region_name) for region_name in regiones)
+    return series
+
+
+def compilar_vintages(max_workers):
+    """
+    Compila los artefactos de todos los libros archivados (vintages) de las fuentes Excel, en paralelo.
+    Es para el build ('manage.py calentar'): el proceso web después encuentra los artefactos y no parsea.
+
+    Returns:
+        int: Cantidad de libros revisados.
+    """
+    directorios = sorted({os.path.dirname(fuente.ruta) for fuente in fuentes_registradas() if fuente.tipo == 'excel'})
+    rutas = [ruta for directorio in directorios for _, ruta in archivos_vintage(directorio)]
+    ingerir_archivos(rutas, max_workers=max_workers)
+    return len(rutas)
+
+
+def calentar():
+    """
+    Carga todas las series configuradas, una tras otra. Una serie que falla (ej. la API caída) queda
+    registrada en 'errores' y no frena a las demás: el worker igual puede atender el resto.
+
+    Returns:
+        dict: {'codigo' o 'codigo/region': mensaje de error} de las series que no se pudieron cargar.
+    """
+    series = series_configuradas()
+    _ESTADO.update(total=len(series), cargadas=0, errores={})
+    errores = {}
+    for codigo, region_name in series:
+        nombre = f"{codigo}/{region_name}" if region_name else codigo
+        try:
+            df, _, _ = cargar_serie(codigo, region_name)
+            if df is None or df.empty:
+                errores[nombre] = "La fuente no devolvió datos."
+        except Exception as e:
+            errores[nombre] = str(e)
+        _ESTADO['cargadas'] += 1
+    _ESTADO['errores'] = errores
+    return errores
+
+
+def _ejecutar():
+    inicio = time.perf_counter()
+    try:
+        errores = calentar()
+    except Exception as e:
+        errores = {'*': str(e)}
+        _ESTADO['errores'] = errores
+    _ESTADO.update(estado=LISTO, fin=datetime.now(), segundos=round(time.perf_counter() - inicio, 3))
+    print(f"Precarga de series terminada en {_ESTADO['segundos']} s ({len(errores)} con error).")
+
+
+def iniciar():
+    """
+    Inicia la precarga en un hilo de fondo, solo la primera vez. Devuelve el estado actual.
+    """
+    with _lock:
+        if _ESTADO['estado'] == PENDIENTE:
+            _ESTADO.update(estado=CARGANDO, inicio=datetime.now())
+            threading.Thread(target=_ejecutar, name='comparador-calentamiento', daemon=True).start()
+    return _ESTADO['estado']
+
+
+def estado():
+    """
+    Estado de la precarga: 'estado' (pendiente, cargando o listo), momentos de inicio y fin, duración,
+    progreso ('cargadas' de 'total') y errores por serie.
+    """
+    return {
+        'estado': _ESTADO['estado'],
+        'inicio': _ESTADO['inicio'].isoformat(timespec='seconds') if _ESTADO['inicio'] else None,
+        'fin': _ESTADO['fin'].isoformat(timespec='seconds') if _ESTADO['fin'] else None,
+        'segundos': _ESTADO['segundos'],
+        'cargadas': _ESTADO['cargadas'],
+        'total': _ESTADO['total'],
+        'errores': dict(_ESTADO['errores']),
+    }
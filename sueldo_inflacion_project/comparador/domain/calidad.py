@@ -0,0 +1,211 @@
+# domain/calidad.py
+"""
+Controles de calidad de una serie mensual de IPC, sobre los arrays de meses (ordinales, ver meses.py)
+y valores, sin copiar el DataFrame.
+
+Cada control es una operación vectorizada: valores faltantes o no positivos, meses repetidos o fuera
+de orden, meses faltantes (huecos) y saltos mensuales implausibles (ej. un cambio de base mal empalmado).
+El registro de fuentes valida una sola vez por versión de los datos y guarda el reporte junto a la
+serie; si la nueva versión solo agrega meses al final, se validan únicamente los meses nuevos.
+"""
+import os
+from dataclasses import dataclass, field, replace
+
+import numpy as np
+
+from . import meses as meses_utils
+
+# Variación mensual (en %) a partir de la cual un salto se considera implausible, hacia arriba o hacia abajo:
+# con 300 se marcan subas de más del 300% o bajas de más del 75% (un factor 4 en cualquier sentido).
+# La mayor inflación mensual de la serie de Chaco (julio de 1989) ronda el 200%.
+SALTO_MAXIMO = float(os.environ.get('COMPARADOR_SALTO_MAXIMO', 300))
+
+# Cuántos casos de cada control se guardan en el reporte (los contadores son siempre completos)
+MAX_EJEMPLOS = 20
+
+
+@dataclass(frozen=True)
+class ReporteCalidad:
+    """
+    Resultado de los controles. Los contadores cubren toda la serie; 'huecos' y 'saltos' guardan
+    hasta MAX_EJEMPLOS casos como ('AAAA-MM', 'AAAA-MM') y ('AAAA-MM', variación en %).
+    """
+    filas: int = 0
+    mes_min: int = None
+    mes_max: int = None
+    ultimo_valor: float = None
+    faltantes: int = 0
+    no_positivos: int = 0
+    repetidos: int = 0
+    desordenados: int = 0
+    meses_faltantes: int = 0
+    huecos: tuple = field(default=())
+    cantidad_saltos: int = 0
+    saltos: tuple = field(default=())
+    incremental: bool = False
+
+    @property
+    def valido(self):
+        """
+        Sin errores: valores faltantes, no positivos o meses repetidos/desordenados rompen los cálculos.
+        Los huecos y los saltos son advertencias.
+        """
+        return not (self.faltantes or self.no_positivos or self.repetidos or self.desordenados)
+
+    def advertencias(self):
+        mensajes = []
+        if self.faltantes:
+            mensajes.append(f"{self.faltantes} valores faltantes")
+        if self.no_positivos:
+            mensajes.append(f"{self.no_positivos} valores no positivos")
+        if self.repetidos:
+            mensajes.append(f"{self.repetidos} meses repetidos")
+        if self.desordenados:
+            mensajes.append(f"{self.desordenados} meses fuera de orden")
+        if self.meses_faltantes:
+            mensajes.append(f"{self.meses_faltantes} meses faltantes en {len(self.huecos)} huecos (ej. {self.huecos[0][0]} a {self.huecos[0][1]})")
+        if self.cantidad_saltos:
+            mes, variacion = self.saltos[0]
+            mensajes.append(f"{self.cantidad_saltos} saltos mensuales implausibles (ej. {mes}: {variacion:+.1f}%)")
+        return mensajes
+
+    def como_dict(self):
+        return {
+            'valido': self.valido,
+            'filas': self.filas,
+            'desde': meses_utils.texto(self.mes_min) if self.mes_min is not None else None,
+            'hasta': meses_utils.texto(self.mes_max) if self.mes_max is not None else None,
+            'faltantes': self.faltantes,
+            'no_positivos': self.no_positivos,
+            'repetidos': self.repetidos,
+            'desordenados': self.desordenados,
+            'meses_faltantes': self.meses_faltantes,
+            'huecos': [list(hueco) for hueco in self.huecos],
+            'saltos': [list(salto) for salto in self.saltos],
+            'cantidad_saltos': self.cantidad_saltos,
+            'incremental': self.incremental,
+            'advertencias': self.advertencias(),
+        }
+
+
+def _controles(meses, valores, salto_maximo):
+    """
+    Contadores y casos de los controles sobre arrays ya alineados. Las diferencias entre filas
+    consecutivas (orden, huecos y saltos) se calculan sobre los pares (i - 1, i) de estos arrays.
+    """
+    faltantes = np.isnan(valores)
+    pasos = np.diff(meses)
+
+    # Huecos: pasos de más de un mes
+    en_hueco = np.flatnonzero(pasos > 1)
+    huecos = tuple((meses_utils.texto(int(meses[i] + 1)), meses_utils.texto(int(meses[i + 1] - 1)))
+                   for i in en_hueco[:MAX_EJEMPLOS])
+
+    # Saltos: variación entre meses consecutivos más allá del factor permitido (en logaritmos, simétrico)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        log_valores = np.log(np.where(valores > 0, valores, np.nan))
+        cambio = np.diff(log_valores)
+    en_salto = np.flatnonzero((pasos == 1) & (np.abs(cambio) > np.log1p(salto_maximo / 100)))
+    saltos = tuple((meses_utils.texto(int(meses[i + 1])), round(float(np.expm1(cambio[i]) * 100), 1))
+                   for i in en_salto[:MAX_EJEMPLOS])
+
+    return {
+        'faltantes': int(faltantes.sum()),
+        'no_positivos': int((valores[~faltantes] <= 0).sum()),
+        'repetidos': int((pasos == 0).sum()),
+        'desordenados': int((pasos < 0).sum()),
+        'meses_faltantes': int((pasos[en_hueco] - 1).sum()),
+        'huecos': huecos,
+        'cantidad_saltos': len(en_salto),
+        'saltos': saltos,
+    }
+
+
+def validar(meses, valores, salto_maximo=None):
+    """
+    Controla una serie completa.
+
+    Args:
+        meses (np.ndarray): Ordinales de mes, en el orden en que están en la serie.
+        valores (np.ndarray): Valores del índice (float64, NaN = faltante).
+        salto_maximo (float, optional): Variación mensual máxima plausible en %. Por defecto SALTO_MAXIMO.
+
+    Returns:
+        ReporteCalidad
+    """
+    salto_maximo = SALTO_MAXIMO if salto_maximo is None else salto_maximo
+    meses = np.asarray(meses, dtype=np.int64)
+    valores = np.asarray(valores, dtype=np.float64)
+    if len(meses) == 0:
+        return ReporteCalidad()
+    return ReporteCalidad(filas=len(meses), mes_min=int(meses.min()), mes_max=int(meses.max()),
+                          ultimo_valor=float(valores[-1]), **_controles(meses, valores, salto_maximo))
+
+
+def validar_incremental(anterior, meses, valores, salto_maximo=None):
+    """
+    Controla solo las filas agregadas al final de una serie ya validada y suma el resultado al reporte
+    anterior. Las filas nuevas se controlan junto con la última fila anterior, así un hueco o un salto
+    justo en la unión también se detecta.
+
+    Solo se compara la fila de unión con el reporte anterior: quien tenga la serie anterior debe
+    confirmar antes que la nueva la extiende (ver es_extension). Si la fila de unión no coincide o la
+    serie es más corta, se valida completa.
+
+    Args:
+        anterior (ReporteCalidad): Reporte de la versión anterior de la serie.
+        meses, valores (np.ndarray): La serie nueva completa.
+        salto_maximo (float, optional): Como en validar.
+
+    Returns:
+        ReporteCalidad
+    """
+    salto_maximo = SALTO_MAXIMO if salto_maximo is None else salto_maximo
+    meses = np.asarray(meses, dtype=np.int64)
+    valores = np.asarray(valores, dtype=np.float64)
+    n = anterior.filas
+    if (n == 0 or len(meses) < n or int(meses[n - 1]) != anterior.mes_max
+            or not np.array_equal(valores[n - 1], anterior.ultimo_valor, equal_nan=True)):
+        return validar(meses, valores, salto_maximo)
+    if len(meses) == n:
+        return anterior
+
+    nuevos = _controles(meses[n - 1:], valores[n - 1:], salto_maximo)
+    # La fila de unión ya se contó en el reporte anterior para los controles por fila
+    nuevos['faltantes'] -= int(np.isnan(valores[n - 1]))
+    nuevos['no_positivos'] -= int(valores[n - 1] <= 0)
+
+    combinado = {
+        campo: getattr(anterior, campo) + nuevos[campo]
+        for campo in ('faltantes', 'no_positivos', 'repetidos', 'desordenados', 'meses_faltantes', 'cantidad_saltos')
+    }
+    combinado['huecos'] = (anterior.huecos + nuevos['huecos'])[:MAX_EJEMPLOS]
+    combinado['saltos'] = (anterior.saltos + nuevos['saltos'])[:MAX_EJEMPLOS]
+    return replace(anterior, filas=len(meses), mes_min=min(anterior.mes_min, int(meses[n:].min())),
+                   mes_max=max(anterior.mes_max, int(meses[n:].max())), ultimo_valor=float(valores[-1]),
+                   incremental=True, **combinado)
+
+
+def es_extension(df_anterior, valor_anterior, df, valor_columna):
+    """
+    Indica si df es df_anterior con filas agregadas al final: mismas fechas y mismos valores en las
+    primeras filas (una comparación de memoria, sin repetir los controles).
+    """
+    n = len(df_anterior)
+    if n == 0 or len(df) < n:
+        return False
+    return (np.array_equal(df.index[:n].to_numpy(), df_anterior.index.to_numpy())
+            and np.array_equal(df[valor_columna].to_numpy(dtype=np.float64)[:n],
+                               df_anterior[valor_anterior].to_numpy(dtype=np.float64), equal_nan=True))
+
+
+def validar_serie(df, valor_columna='ipc_valor', anterior=None):
+    """
+    Controla la columna de valores de un DataFrame con índice de fechas (o de ordinales de mes),
+    sin copiarlo. Con 'anterior' se validan solo las filas nuevas (ver validar_incremental).
+    """
+    meses = meses_utils.desde_fechas(df.index)
+    valores = df[valor_columna].to_numpy(dtype=np.float64)
+    if anterior is not None:
+        return validar_incremental(anterior, meses, valores)
+    return validar(meses, valores)
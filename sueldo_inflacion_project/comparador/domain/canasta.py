@@ -0,0 +1,142 @@
+# domain/canasta.py
+"""
+Inflación personal: un índice con las ponderaciones de la canasta de cada usuario en lugar de las del INDEC.
+
+Las variaciones mensuales de las 12 divisiones de cada región salen del mismo artefacto compilado del
+libro Excel que el "Nivel general" (ver dataset_excel.extraer_regiones). Por región se encadenan una sola
+vez en una matriz de índices (meses x divisiones, base 100 en el mes anterior al primero) y se guarda
+en memoria por versión de los datos; el índice personal de un pedido es un único producto
+matriz-vector con las ponderaciones normalizadas (un índice de Laspeyres de base fija, como el del INDEC).
+"""
+import threading
+
+import numpy as np
+
+from . import meses as meses_utils
+from .dataset_excel import DIVISIONES, compilar_excel
+from .fuentes import obtener_fuente
+
+# Ponderaciones (%) de las divisiones en el IPC Nacional del INDEC (base dic 2016 = 100, ENGHo 2004/05).
+# Se usan como valores iniciales del formulario; cada región tiene las suyas.
+PONDERACIONES_INDEC = {
+    'alimentos': 26.9,
+    'bebidas_tabaco': 3.5,
+    'prendas': 9.9,
+    'vivienda': 9.4,
+    'equipamiento': 6.4,
+    'salud': 8.0,
+    'transporte': 11.0,
+    'comunicacion': 2.8,
+    'recreacion': 7.3,
+    'educacion': 2.3,
+    'restaurantes': 9.0,
+    'otros': 3.5,
+}
+
+# Índices de las divisiones por región: (codigo, region) -> (versión, meses, matriz de índices)
+_CACHE = {}
+_lock = threading.Lock()
+
+
+def parsear_ponderaciones(valores):
+    """
+    Convierte las ponderaciones ingresadas (por código de división, vacías = 0) en un vector normalizado.
+
+    Args:
+        valores (dict): {codigo_division: texto o número}. Los códigos ausentes valen 0.
+
+    Returns:
+        np.ndarray: float64 de largo len(DIVISIONES), suma 1.
+
+    Raises:
+        ValueError: Si alguna ponderación no es un número no negativo o si todas son cero.
+    """
+    pesos = np.zeros(len(DIVISIONES))
+    for posicion, (codigo, titulo) in enumerate(DIVISIONES):
+        valor = valores.get(codigo)
+        if valor in (None, ''):
+            continue
+        try:
+            pesos[posicion] = float(valor)
+        except (TypeError, ValueError):
+            raise ValueError(f"Ponderación inválida para '{titulo}': {valor!r}.") from None
+    if not np.isfinite(pesos).all() or (pesos < 0).any():
+        raise ValueError("Las ponderaciones de la canasta deben ser números no negativos.")
+    total = pesos.sum()
+    if total <= 0:
+        raise ValueError("Ingrese al menos una ponderación mayor que cero para la canasta personal.")
+    return pesos / total
+
+
+def indices_divisiones(divisiones):
+    """
+    Encadena las variaciones mensuales (%) de cada división: índice base 100 en el mes anterior al primero.
+    Un mes sin dato deja a esa división en NaN desde ahí (no se puede encadenar por encima del hueco);
+    serie_personal lo informa como error si la división tiene peso.
+    """
+    return 100.0 * np.cumprod(1 + divisiones / 100, axis=0)
+
+
+def obtener_divisiones(codigo, region_name):
+    """
+    Meses e índices encadenados de las divisiones de una región, calculados una sola vez por versión de datos.
+
+    Returns:
+        tuple: (versión, meses int64, matriz float64 meses x divisiones)
+
+    Raises:
+        ValueError: Si la fuente no es un libro Excel por región o el libro no tiene la región.
+    """
+    fuente = obtener_fuente(codigo)
+    if fuente.tipo != 'excel':
+        raise ValueError("La canasta personal solo está disponible para los datos por región del INDEC (Excel).")
+
+    version = fuente.version()
+    clave = (codigo, region_name)
+    cacheado = _CACHE.get(clave)
+    if cacheado is None or cacheado[0] != version:
+        compilado = compilar_excel(fuente.ruta)
+        if region_name not in compilado:
+            raise ValueError(f"El archivo del INDEC no tiene datos por división para '{region_name}'.")
+        meses, _, divisiones = compilado[region_name]
+        cacheado = (version, meses, indices_divisiones(divisiones))
+        with _lock:
+            _CACHE[clave] = cacheado
+    return cacheado
+
+
+def indice_personal(indices, ponderaciones):
+    """
+    Índice ponderado de la canasta: indices @ ponderaciones, usando solo las divisiones con peso
+    (así una división sin datos que el usuario no consume no anula el índice).
+    """
+    con_peso = ponderaciones > 0
+    return indices[:, con_peso] @ ponderaciones[con_peso]
+
+
+def serie_personal(codigo, region_name, ponderaciones):
+    """
+    Serie del índice personal de una región, lista para calculo.comparar_meses.
+
+    Args:
+        codigo (str): Código de la fuente Excel en el registro.
+        region_name (str): Región como se muestra al usuario.
+        ponderaciones (np.ndarray): Salida de parsear_ponderaciones.
+
+    Returns:
+        tuple: (versión de los datos, meses int64, valores float64)
+
+    Raises:
+        ValueError: Si alguna división con peso no tiene dato en algún mes. No se recorta la serie en
+                    silencio: asof() usaría el último mes con dato para cualquier mes posterior.
+    """
+    version, meses, indices = obtener_divisiones(codigo, region_name)
+    valores = indice_personal(indices, ponderaciones)
+    faltantes = np.flatnonzero(np.isnan(valores))
+    if len(faltantes):
+        fila = faltantes[0]
+        sin_dato = [titulo for posicion, (_, titulo) in enumerate(DIVISIONES)
+                    if ponderaciones[posicion] > 0 and np.isnan(indices[fila, posicion])]
+        raise ValueError(f"El archivo del INDEC no tiene dato de {', '.join(sin_dato)} para {region_name} en "
+                         f"{meses_utils.texto(int(meses[fila]))}: ponga en 0 su ponderación para usar la canasta personal.")
+    return version, meses, valores
@@ -1,10 +1,12 @@
 from abc import ABC, abstractmethod
 
+from .calidad import validar_serie
+
 
 class Dataset(ABC):
     """
     Clase base abstracta para el manejo de conjuntos de datos.
-    Define una interfaz común para cargar, validar y transformar datos.
+    Define una interfaz común para cargar y validar datos.
     """
     def __init__(self, fuente=None):
         """
@@ -16,6 +18,7 @@ class Dataset(ABC):
         """
         self.__fuente = fuente # Se usa un atributo privado para la propiedad fuente
         self.__datos = None    # Se usa un atributo privado para la propiedad datos
+        self.calidad = None    # Reporte de validar_datos (ReporteCalidad)
 
     @property
     def datos(self):
@@ -54,13 +57,17 @@ class Dataset(ABC):
         """
         raise NotImplementedError("El método cargar_datos debe ser implementado por las subclases.")
 
-    def validar_datos(self):
+    def validar_datos(self, valor_columna=None):
         """
-        Valida la integridad de los datos cargados.
-        Detecta datos faltantes y filas duplicadas.
+        Controla la calidad de la serie cargada (ver calidad.py): valores faltantes o no positivos,
+        meses repetidos o fuera de orden, huecos y saltos mensuales implausibles. No copia ni modifica
+        los datos; el reporte queda en self.calidad.
+
+        Args:
+            valor_columna (str, optional): Columna a controlar. Por defecto la primera.
 
         Returns:
-            bool: True si la validación es exitosa.
+            bool: True si no hay errores (los huecos y saltos solo se informan como advertencias).
 
         Raises:
             ValueError: Si los datos no han sido cargados.
@@ -68,52 +75,10 @@ class Dataset(ABC):
         if self.datos is None:
             raise ValueError("Datos no cargados. Ejecute 'cargar_datos' primero.")
 
-        # Contar datos faltantes y duplicados
-        missing_data_count = self.datos.isnull().sum().sum()
-        duplicate_rows_count = self.datos.duplicated().sum()
-
-        if missing_data_count > 0:
-            print(f"Advertencia: {missing_data_count} datos faltantes detectados.")
-        if duplicate_rows_count > 0:
-            print(f"Advertencia: {duplicate_rows_count} filas duplicadas detectadas.")
-
-        return True
-
-    def transformar_datos(self):
-        """
-        Aplica transformaciones estándar a los datos, como:
-        - Nombres de columnas a minúsculas y snake_case (evitando modificar IDs de series que ya usan '_').
-        - Eliminación de filas duplicadas.
-        - Eliminación de espacios en blanco en columnas de tipo 'object'.
-        """
-        if self.datos is not None and not self.datos.empty:
-            temp_df = self.datos.copy()
-
-            # Transformar nombres de columnas a snake_case, pero solo si no parecen IDs de series
-            # Para IDs de series, el nombre de columna ya debería ser el ID tal cual.
-            new_columns = []
-            for col in temp_df.columns:
-                # Si la columna es 'fecha' o parece un ID de serie (contiene '_'), mantenerlo
-                if col == 'fecha' or '_' in col:
-                    new_columns.append(col)
-                else:
-                    new_columns.append(col.lower().replace(" ", "_"))
-            temp_df.columns = new_columns
-
-            # Eliminar filas duplicadas
-            initial_rows = len(temp_df)
-            temp_df = temp_df.drop_duplicates()
-            if len(temp_df) < initial_rows:
-                print(f"Transformación: Se eliminaron {initial_rows - len(temp_df)} filas duplicadas.")
-
-            # Eliminar espacios en blanco de columnas de tipo 'object'
-            for col in temp_df.select_dtypes(include="object").columns:
-                temp_df[col] = temp_df[col].astype(str).str.strip()
-            
-            self.datos = temp_df # Asignar el DataFrame transformado de nuevo
-            print("Transformación: Transformaciones básicas aplicadas.")
-        else:
-            print("Transformación: No hay datos o el DataFrame está vacío para transformar.")
+        self.calidad = validar_serie(self.datos, valor_columna or self.datos.columns[0])
+        for advertencia in self.calidad.advertencias():
+            print(f"Advertencia: {advertencia}.")
+        return self.calidad.valido
 
     def mostrar_resumen(self):
         """
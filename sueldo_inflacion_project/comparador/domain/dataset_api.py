@@ -1,16 +1,114 @@
+import os
+import threading
+
+import numpy as np
 import requests
 import pandas as pd
+from . import meses as meses_utils
 from .dataset import Dataset
+from .resiliencia import Circuito, pedir_con_reintentos
 from urllib.parse import urlencode
 
+# Límites del pedido a la API: un worker nunca espera más que COMPARADOR_API_PRESUPUESTO segundos
+API_TIMEOUT = (float(os.environ.get('COMPARADOR_API_TIMEOUT_CONEXION', 3.05)),
+               float(os.environ.get('COMPARADOR_API_TIMEOUT_LECTURA', 8)))
+API_REINTENTOS = int(os.environ.get('COMPARADOR_API_REINTENTOS', 1))
+API_PRESUPUESTO = float(os.environ.get('COMPARADOR_API_PRESUPUESTO', 20))
+
+# Circuito compartido por todo el proceso: tras varias fallas seguidas se deja de llamar a la API
+# durante un rato y el registro de fuentes responde con la última serie cargada (ver fuentes.cargar_serie)
+CIRCUITO_API = Circuito('apis.datos.gob.ar',
+                        fallas_apertura=int(os.environ.get('COMPARADOR_API_FALLAS_APERTURA', 3)),
+                        espera=float(os.environ.get('COMPARADOR_API_ESPERA_CIRCUITO', 30)))
+
+# requests.Session no está documentada como segura entre hilos: una sesión (y su pool de conexiones) por hilo
+_SESIONES = threading.local()
+
+
+def _sesion():
+    sesion = getattr(_SESIONES, 'sesion', None)
+    if sesion is None:
+        sesion = _SESIONES.sesion = requests.Session()
+    return sesion
+
+
+def decodificar_filas(filas, cantidad_series):
+    """
+    Decodifica el array 'data' de la API ([[fecha 'AAAA-MM-DD', valor, ...], ...]), ya parseado por
+    response.json(), en ordinales de mes y float64: las listas pasan a un array de objetos y cada columna
+    se convierte con un único astype (los null de la API quedan NaN), sin armar un DataFrame por columna
+    ni parsear fechas con pd.to_datetime.
+
+    No es un parseo incremental del JSON: la respuesta ya está completa en memoria (pedir_con_reintentos
+    la lee con un tope de tiempo) y son a lo sumo 1000 filas, así que el costo está en las listas de Python
+    de response.json(), no en la lectura.
+
+    Si alguna fila no tiene el formato esperado (largo distinto, fecha no ISO o valor no numérico), se usa
+    _decodificar_tolerante: fila por fila, descartando las fechas inválidas y dejando NaN en los valores
+    inválidos, igual que la conversión con pd.to_datetime/pd.to_numeric(errors='coerce').
+
+    Args:
+        filas (list): El array 'data' de la respuesta JSON.
+        cantidad_series (int): Cantidad de series pedidas (cada fila tiene cantidad_series + 1 elementos).
+
+    Returns:
+        tuple: (meses int64, valores float64 de forma filas x series), sin las filas cuya primera serie
+               no tiene valor.
+    """
+    try:
+        tabla = np.array(filas, dtype=object)
+        if tabla.ndim != 2 or tabla.shape[1] != cantidad_series + 1:
+            raise ValueError("las filas no tienen todas una fecha y un valor por serie")
+        fechas = tabla[:, 0].astype('U10').astype('datetime64[D]').astype('datetime64[M]')
+        if np.isnat(fechas).any():
+            raise ValueError("hay fechas faltantes")
+        meses = fechas.astype(np.int64) + meses_utils.ordinal(1970, 1)
+        valores = tabla[:, 1:].astype(np.float64)
+    except (ValueError, TypeError) as e:
+        print(f"Filas con formato inesperado en la respuesta de la API ({e}): se decodifican una por una.")
+        meses, valores = _decodificar_tolerante(filas, cantidad_series)
+
+    # La serie principal (la primera pedida) no puede tener faltantes
+    con_valor = ~np.isnan(valores[:, 0])
+    if not con_valor.all():
+        print(f"Se descartan {int((~con_valor).sum())} filas sin valor de la serie principal.")
+        meses, valores = meses[con_valor], valores[con_valor]
+    return meses, valores
+
+
+def _decodificar_tolerante(filas, cantidad_series):
+    """
+    Decodificación fila por fila para respuestas con filas mal formadas: descarta las filas sin fecha
+    válida; los valores faltantes, sobrantes o no numéricos quedan NaN o se ignoran.
+    """
+    meses = np.zeros(len(filas), dtype=np.int64)
+    valores = np.full((len(filas), cantidad_series), np.nan)
+    validas = np.zeros(len(filas), dtype=bool)
+    for i, fila in enumerate(filas):
+        if not isinstance(fila, (list, tuple)) or not fila:
+            continue
+        fecha = pd.to_datetime(fila[0], errors='coerce')
+        if pd.isna(fecha):
+            continue
+        meses[i] = meses_utils.de_fecha(fecha)
+        validas[i] = True
+        for j, valor in enumerate(fila[1:cantidad_series + 1]):
+            try:
+                valores[i, j] = float(valor)
+            except (TypeError, ValueError):
+                pass
+    if not validas.all():
+        print(f"Se descartan {int((~validas).sum())} filas de la API sin fecha válida.")
+    return meses[validas], valores[validas]
+
 
 class DatasetAPI(Dataset):
     """
     Clase para obtener datos de series de tiempo del INDEC a través de la API
     de datos.gob.ar, especialmente el Índice de Precios al Consumidor (IPC).
     """
-    # URL base para la API de series de tiempo del Ministerio de Economía
-    BASE_URL = "https://apis.datos.gob.ar/series/api/series"
+    # URL base para la API de series de tiempo del Ministerio de Economía (la prueba de carga la apunta a un servidor falso)
+    BASE_URL = os.environ.get('COMPARADOR_API_URL', "https://apis.datos.gob.ar/series/api/series")
 
     # ID de la serie para el Índice de Precios al Consumidor (IPC) - Nivel General Nacional.
     # Este es el ID comúnmente utilizado en la API de datos.gob.ar para el IPC Nacional.
@@ -25,7 +123,7 @@ class DatasetAPI(Dataset):
         # Inicializamos la clase base. La 'fuente' (URL completa) se construirá en cargar_datos.
         super().__init__(None) # Pasamos None ya que la URL se define dinámicamente
 
-    def cargar_datos(self, series_ids: list[str], start_date: str, end_date: str = None):  # type: ignore
+    def cargar_datos(self, series_ids: list[str], start_date: str, end_date: str = None, limit: int = None):  # type: ignore
         """
         Carga datos de series de tiempo del INDEC (o cualquier serie de datos.gob.ar)
         en formato JSON.
@@ -36,6 +134,7 @@ class DatasetAPI(Dataset):
             start_date (str): Fecha de inicio para la consulta en formato 'YYYY-MM-DD'.
             end_date (str, optional): Fecha de fin para la consulta en formato 'YYYY-MM-DD'.
                                        Si es None, la API traerá datos hasta la fecha más reciente.
+            limit (int, optional): Máximo de filas a devolver. La API devuelve 100 por defecto (máximo 1000).
         """
         # Parámetros para la consulta a la API
         params = {
@@ -45,6 +144,8 @@ class DatasetAPI(Dataset):
         }
         if end_date:
             params["end_date"] = end_date
+        if limit:
+            params["limit"] = limit
 
         # Construir la URL completa con los parámetros codificados
         self.fuente = f"{self.BASE_URL}?{urlencode(params)}"
@@ -52,8 +153,9 @@ class DatasetAPI(Dataset):
 
         try:
             print(f"Intentando obtener datos de: {self.fuente}")
-            response = requests.get(self.fuente)
-            response.raise_for_status()  # Lanza una excepción para códigos de estado HTTP 4xx/5xx
+            # Con timeouts, reintentos acotados y circuito; lanza una excepción para códigos de estado HTTP 4xx/5xx
+            response = pedir_con_reintentos(_sesion(), self.fuente, CIRCUITO_API, timeout=API_TIMEOUT,
+                                            reintentos=API_REINTENTOS, presupuesto=API_PRESUPUESTO)
 
             data = response.json()
 
@@ -61,39 +163,11 @@ class DatasetAPI(Dataset):
             # Simplificamos la condición para solo verificar que 'data' exista y no esté vacía.
             if 'data' in data and data['data']: 
                 
-                # Columnas esperadas: 'fecha' y el ID de la serie solicitado.
-                # Usamos la lista de series_ids pasadas a la función para nombrar las columnas.
-                # Esto es más robusto si la estructura de 'series' o 'meta' en la respuesta JSON varía.
-                column_names = ['fecha'] + series_ids
-                
-                df = pd.DataFrame(data['data'], columns=column_names)
-
-                # Convertir la columna 'fecha' a tipo datetime
-                df['fecha'] = pd.to_datetime(df['fecha'], errors='coerce') # Añadido errors='coerce' para robustez
-
-                # --- INICIO DE LAS MODIFICACIONES NECESARIAS ---
-                # Establecer 'fecha' como el índice del DataFrame
-                # y asegurar que sea DatetimeIndex con el primer día del mes
-                df = df.set_index('fecha').dropna(subset=[series_ids[0]]) # Usa el primer ID como columna clave para dropna
-                
-                if isinstance(df.index, pd.DatetimeIndex):
-                    df.index = df.index.to_period('M').to_timestamp()
-                else:
-                    # En caso de que, por alguna razón, no se pueda establecer el DatetimeIndex
-                    print(f"ERROR: No se pudo establecer DatetimeIndex en DatasetAPI. Tipo actual: {type(df.index)}")
-                    self.datos = pd.DataFrame() # Asegura un DataFrame vacío para evitar errores posteriores
-                    return # Salir de la función si el índice es incorrecto
-                # --- FIN DE LAS MODIFICACIONES NECESARIAS ---
-
-
-                # Convertir las columnas de valores a numérico, manejando posibles errores
-                for col in df.columns:
-                    if col != 'fecha': # Ahora 'fecha' es el índice, no una columna, pero esta verificación está bien.
-                        df[col] = pd.to_numeric(df[col], errors='coerce') 
-                
-                # Opcional: Eliminar filas donde el valor IPC principal sea NaN después de la conversión numérica
-                df = df.dropna(subset=[series_ids[0]]) # Asegura que al menos la serie principal no tenga NaNs
-
+                # Filas [fecha, valor serie 1, valor serie 2, ...]: se convierten a arrays de ordinales de
+                # mes y float64 (ver decodificar_filas) y se arma un único bloque con los IDs pedidos
+                # como columnas (más robusto si 'series' o 'meta' de la respuesta varían).
+                meses, valores = decodificar_filas(data['data'], len(series_ids))
+                df = pd.DataFrame(valores, index=meses_utils.a_fechas(meses), columns=series_ids, copy=False)
 
                 self.datos = df
                 print("Datos del INDEC cargados y procesados exitosamente.")
@@ -101,13 +175,7 @@ class DatasetAPI(Dataset):
                 print(self.datos.head())
                 print(f"Tipo de índice final en DatasetAPI: {type(self.datos.index)}")
 
-
-                # Llamar a los métodos de validación y transformación de la clase base
-                if self.validar_datos():
-                    self.transformar_datos()
-                    print(f"Tipo de índice después de validar/transformar en DatasetAPI: {type(self.datos.index)}") # Verificación adicional
-                else:
-                    print("La validación de los datos falló.")
+                # La calidad de la serie se controla una vez por versión en el registro de fuentes (ver calidad.py)
 
             else:
                 print("Estructura de respuesta inesperada de la API o no se encontraron datos válidos.")
@@ -1,49 +1,74 @@
 # domain/dataset_csv.py
+import numpy as np
 import pandas as pd
 # Antes:
 # from domain.dataset import Dataset
 # Después:
 from .dataset import Dataset # <-- Cambio aquí
+from . import meses as meses_utils
 
 class DatasetCsv(Dataset):
-    def __init__(self, file_path):
+    def __init__(self, file_path, date_col='indice_tiempo', ipc_col='ipc_chaco_historico_ng'):
+        """
+        Args:
+            file_path (str): Ruta del CSV.
+            date_col (str): Columna con las fechas 'AAAA-MM-DD'. Por defecto la del CSV de IPC Chaco.
+            ipc_col (str): Columna con los valores del índice. Por defecto la del CSV de IPC Chaco.
+        """
         self.file_path = file_path
+        self.date_col = date_col
+        self.ipc_col = ipc_col
         self.datos = pd.DataFrame()
 
     def cargar_datos(self):
         """
         Carga los datos de IPC desde el archivo CSV.
+
+        Lee solo las dos columnas necesarias en una única pasada por el archivo, convierte las fechas
+        'AAAA-MM-DD' directamente a ordinales de mes (ver meses.py) y arma el DataFrame final en una sola
+        asignación, sin columnas intermedias ni copias por dropna/set_index/sort_index.
         """
         try:
-            # Columnas exactas del CSV según la información del usuario
-            date_col = 'indice_tiempo'
-            ipc_col = 'ipc_chaco_historico_ng'
-
-            self.datos = pd.read_csv(self.file_path)
+            date_col = self.date_col
+            ipc_col = self.ipc_col
 
-            # Asegurarse de que las columnas existen
-            if date_col not in self.datos.columns:
+            # Una sola lectura: el usecols invocable no falla si falta una columna (se verifica después)
+            # y el valor se deja inferir a pandas, que lo parsea como float64 si toda la columna es numérica
+            crudo = pd.read_csv(self.file_path, usecols=lambda columna: columna in (date_col, ipc_col),
+                                dtype={date_col: str})
+            if date_col not in crudo.columns:
                 print(f"Error: Columna de fecha '{date_col}' no encontrada en el CSV.")
                 self.datos = pd.DataFrame() # Vaciar datos si hay error
                 return
-            if ipc_col not in self.datos.columns:
+            if ipc_col not in crudo.columns:
                 print(f"Error: Columna de IPC '{ipc_col}' no encontrada en el CSV.")
                 self.datos = pd.DataFrame() # Vaciar datos si hay error
                 return
 
-            self.datos['fecha'] = pd.to_datetime(self.datos[date_col])
-            self.datos['ipc_valor'] = pd.to_numeric(self.datos[ipc_col], errors='coerce') # Convertir a numérico, errores a NaN
+            if crudo[ipc_col].dtype == np.float64:
+                valores = crudo[ipc_col].to_numpy()
+            else:
+                # Hay valores no numéricos (la columna quedó como texto): se convierten a NaN como antes
+                valores = pd.to_numeric(crudo[ipc_col], errors='coerce').to_numpy(dtype=np.float64)
 
-            # Eliminar filas con valores NaN en ipc_valor si los hay
-            self.datos.dropna(subset=['ipc_valor'], inplace=True)
+            # 'AAAA-MM-01' -> mes; solo se mira el prefijo 'AAAA-MM', el día no aporta información
+            meses = meses_utils.desde_textos(crudo[date_col].to_numpy(dtype=str))
 
-            self.datos.set_index('fecha', inplace=True)
-            self.datos.sort_index(inplace=True)
+            # Eliminar filas con valores NaN en ipc_valor si los hay, y ordenar solo si hace falta
+            validos = ~np.isnan(valores)
+            if not validos.all():
+                meses, valores = meses[validos], valores[validos]
+            if len(meses) > 1 and (np.diff(meses) < 0).any():
+                orden = np.argsort(meses, kind='stable')
+                meses, valores = meses[orden], valores[orden]
 
-            # Seleccionar solo las columnas relevantes
-            self.datos = self.datos[['ipc_valor']]
+            self.datos = pd.DataFrame(
+                {'ipc_valor': valores},
+                index=meses_utils.a_fechas(meses),
+                copy=False,
+            )
 
-            print(f"Datos de IPC para Chaco cargados exitosamente desde CSV.")
+            print(f"Datos de IPC cargados exitosamente desde CSV ({self.file_path}).")
 
         except FileNotFoundError:
             print(f"Error: Archivo CSV no encontrado en la ruta {self.file_path}")
@@ -1,27 +1,145 @@
 # domain/dataset_excel.py
+import numpy as np
 import pandas as pd
 # Antes:
 # from domain.dataset import Dataset
 # Después:
 from .dataset import Dataset # <-- Cambio aquí
+from . import artefactos, meses as meses_utils
+
+HOJA_VARIACION_MENSUAL = "Variación mensual IPC Nacional"
+
+# Nombre de la región (como se muestra al usuario) -> título de la región en la columna A del Excel
+REGION_EXCEL_TITLES = {
+    "Total Nacional": "Total nacional",
+    "Región GBA": "Región GBA",
+    "Región Pampeana": "Región Pampeana",
+    "Región Noroeste": "Región Noroeste",
+    "Región Noreste": "Región Noreste",
+    "Región Cuyo": "Región Cuyo",
+    "Región Patagonia": "Región Patagonia"
+}
+
+
+# Divisiones COICOP de la canasta del IPC: (código, título de la fila en el Excel), en el orden del libro
+DIVISIONES = (
+    ('alimentos', "Alimentos y bebidas no alcohólicas"),
+    ('bebidas_tabaco', "Bebidas alcohólicas y tabaco"),
+    ('prendas', "Prendas de vestir y calzado"),
+    ('vivienda', "Vivienda, agua, electricidad, gas y otros combustibles"),
+    ('equipamiento', "Equipamiento y mantenimiento del hogar"),
+    ('salud', "Salud"),
+    ('transporte', "Transporte"),
+    ('comunicacion', "Comunicación"),
+    ('recreacion', "Recreación y cultura"),
+    ('educacion', "Educación"),
+    ('restaurantes', "Restaurantes y hoteles"),
+    ('otros', "Bienes y servicios varios"),
+)
+
+
+def extraer_regiones(file_path, sheet_name=HOJA_VARIACION_MENSUAL):
+    """
+    Lee la hoja de variaciones mensuales UNA sola vez y extrae, para todas las regiones presentes,
+    la fila "Nivel general" y las filas de las divisiones de la canasta (ver DIVISIONES).
+
+    Args:
+        file_path (str): Ruta del archivo Excel del INDEC (sh_ipc_MM_AA.xls).
+        sheet_name (str): Hoja con las variaciones mensuales.
+
+    Returns:
+        dict: {nombre_region: (meses, variaciones, divisiones)} donde 'meses' es un array int64 de
+              ordinales de mes (año * 12 + mes - 1), 'variaciones' un array float64 en % y 'divisiones'
+              una matriz float64 (meses x divisiones) en %, con NaN si falta una división.
+    """
+    df_full_sheet = pd.read_excel(file_path, sheet_name=sheet_name, header=None)
+    primera_columna = df_full_sheet.iloc[:, 0].astype(str).str.strip().str.lower()
+
+    titulos = {titulo.lower(): nombre for nombre, titulo in REGION_EXCEL_TITLES.items()}
+    filas_nivel_general = np.flatnonzero((primera_columna == 'nivel general').to_numpy())
+    filas_region = np.flatnonzero(primera_columna.isin(list(titulos)).to_numpy())
+    # Posición de cada división en DIVISIONES por fila de la hoja (-1 si la fila no es una división)
+    division_de_fila = primera_columna.map(
+        {titulo.lower(): posicion for posicion, (_, titulo) in enumerate(DIVISIONES)}
+    ).fillna(-1).to_numpy(dtype=np.int64)
+
+    resultado = {}
+    for k, fila_region in enumerate(filas_region):
+        # La fila "Nivel general" de la región es la primera que aparece después del encabezado de fechas
+        posteriores = filas_nivel_general[filas_nivel_general > fila_region]
+        if posteriores.size == 0:
+            continue
+
+        meses, fechas_validas = meses_utils.desde_celdas_excel(df_full_sheet.iloc[fila_region, 1:].to_numpy())
+        variaciones = pd.to_numeric(df_full_sheet.iloc[posteriores[0], 1:], errors='coerce').to_numpy(dtype=np.float64)
+        validos = fechas_validas & ~np.isnan(variaciones)
+
+        # Divisiones: la primera fila de cada una dentro del bloque de la región (hasta la región siguiente)
+        fin_bloque = filas_region[k + 1] if k + 1 < len(filas_region) else len(df_full_sheet)
+        divisiones = np.full((int(validos.sum()), len(DIVISIONES)), np.nan)
+        en_bloque = np.arange(fila_region + 1, fin_bloque)
+        # En orden inverso: si un título se repite en el bloque, queda la primera fila
+        for fila in en_bloque[division_de_fila[en_bloque] >= 0][::-1]:
+            celdas = pd.to_numeric(df_full_sheet.iloc[fila, 1:], errors='coerce').to_numpy(dtype=np.float64)
+            divisiones[:, division_de_fila[fila]] = celdas[validos]
+
+        resultado[titulos[primera_columna.iloc[fila_region]]] = (meses[validos], variaciones[validos], divisiones)
+
+    return resultado
+
+
+# Nombre del artefacto compilado con las filas "Nivel general" (y, desde VERSION_PARSER 2, las de
+# divisiones) de todas las regiones
+ARTEFACTO_NIVEL_GENERAL = 'nivel_general'
+
+
+def compilar_excel(file_path):
+    """
+    Variaciones "Nivel general" y por división de cada región del libro, desde el cache de artefactos
+    compilados (clave: SHA-256 del archivo + versión del parser). Solo se parsea el .xls si no hay artefacto.
+    """
+    return artefactos.cargar_o_compilar(file_path, ARTEFACTO_NIVEL_GENERAL, extraer_regiones)
+
+
+def serie_desde_variaciones(meses, variaciones):
+    """
+    Construye el IPC encadenado (base Dic 2016 = 100) a partir de las variaciones mensuales en %.
+
+    Returns:
+        pd.DataFrame: Columna 'ipc_valor' con DatetimeIndex (primer día de cada mes).
+    """
+    ipc_valor = 100.0 * np.cumprod(1 + variaciones / 100)
+    return pd.DataFrame({'ipc_valor': ipc_valor}, index=meses_utils.a_fechas(meses))
+
 
 class DatasetExcel(Dataset):
+    # Se mantiene como atributo de clase para que otros módulos reutilicen el mapeo
+    REGION_EXCEL_TITLES = REGION_EXCEL_TITLES
+
     def __init__(self, file_path):
         super().__init__(file_path)
 
     def cargar_datos(self, region_name):
         try:
-            actual_sheet_name = "Variación mensual IPC Nacional" 
+            # Camino rápido: artefacto compilado del archivo (sin volver a parsear el .xls si no cambió)
+            compilado = compilar_excel(self.fuente)
+            if region_name in compilado:
+                meses, variaciones = compilado[region_name][:2]
+                self.datos = serie_desde_variaciones(meses, variaciones)
+                print(f"Datos de Excel para '{region_name}' cargados desde el artefacto compilado.")
+                return
+        except FileNotFoundError:
+            print(f"Error: Archivo Excel no encontrado en {self.fuente}")
+            self.datos = pd.DataFrame()
+            return
+        except Exception as e:
+            # Si falla el camino rápido se usa el parseo detallado, que reporta mejor los problemas de estructura
+            print(f"DEBUG: No se pudo usar el artefacto compilado ({e}). Se parsea la hoja completa.")
+
+        try:
+            actual_sheet_name = HOJA_VARIACION_MENSUAL
             
-            region_excel_titles = {
-                "Total Nacional": "Total nacional", 
-                "Región GBA": "Región GBA",
-                "Región Pampeana": "Región Pampeana",
-                "Región Noroeste": "Región Noroeste",
-                "Región Noreste": "Región Noreste",
-                "Región Cuyo": "Región Cuyo",
-                "Región Patagonia": "Región Patagonia"
-            }
+            region_excel_titles = self.REGION_EXCEL_TITLES
             
             target_region_title = region_excel_titles.get(region_name)
             if not target_region_title:
@@ -134,18 +252,14 @@ class DatasetExcel(Dataset):
             if combined_df.empty:
                 raise ValueError("No se encontraron pares válidos de fecha y variación después de la alineación y limpieza.")
 
-            # Convertir la columna 'fecha_val' del DataFrame combinado a DatetimeIndex
-            fechas_final = pd.to_datetime(combined_df['fecha_val'], errors='coerce', infer_datetime_format=True) # type: ignore
+            # Convertir la columna 'fecha_val' a meses: fechas, textos o números de serie de Excel (ver meses.py)
+            meses_fecha, fechas_validas = meses_utils.desde_celdas_excel(combined_df['fecha_val'].to_numpy())
+            if not fechas_validas.all():
+                print("DEBUG: Algunas fechas no pudieron ser parseadas. Podría haber un formato inconsistente. Se eliminarán.")
 
-            if pd.isna(fechas_final).sum() > len(fechas_final) / 2 and combined_df['fecha_val'].apply(lambda x: isinstance(x, (int, float))).all():
-                print("DEBUG: Parece que las fechas son números de serie de Excel en la columna 'fecha_val'. Intentando conversión con 'origin'.")
-                fechas_final = pd.to_datetime(combined_df['fecha_val'], unit='D', origin='1899-12-30', errors='coerce')
-            elif pd.isna(fechas_final).any():
-                print("DEBUG: Algunas fechas no pudieron ser parseadas. Podría haber un formato inconsistente. Se eliminarán los NaT.")
-            
-            # Eliminar cualquier NaT que pudiera quedar en las fechas después de la conversión
-            valid_indices = fechas_final.dropna().index
-            fechas_final = fechas_final.loc[valid_indices]
+            # Eliminar las fechas que no se pudieron convertir
+            valid_indices = combined_df.index[fechas_validas]
+            fechas_final = pd.Series(meses_utils.a_fechas(meses_fecha[fechas_validas]), index=valid_indices)
             variaciones_final = pd.to_numeric(combined_df['variacion_val'].loc[valid_indices], errors='coerce').dropna()
 
             # Asegurarse de que las series finales estén alineadas y tengan la misma longitud
@@ -187,13 +301,7 @@ class DatasetExcel(Dataset):
             print(self.datos.head())
             print(self.datos.info())
             print("-------------------------------------------\n")
-            
-            if self.validar_datos():
-                print("Datos validados exitosamente.") 
-                self.transformar_datos() 
-                print("Transformaciones básicas aplicadas.") 
-            else:
-                print("La validación de los datos del Excel falló.")
+            # La calidad de la serie se controla una vez por versión en el registro de fuentes (ver calidad.py)
 
         except FileNotFoundError:
             print(f"Error: Archivo Excel no encontrado en {self.fuente}")
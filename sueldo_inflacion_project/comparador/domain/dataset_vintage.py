@@ -0,0 +1,165 @@
+# domain/dataset_vintage.py
+import os
+import re
+
+import numpy as np
+import pandas as pd
+
+from . import meses as meses_utils
+from .dataset import Dataset
+from .dataset_excel import REGION_EXCEL_TITLES, serie_desde_variaciones
+from .ingesta import ingerir_archivos
+
+# sh_ipc_05_25.xls -> publicado en mayo de 2025
+PATRON_ARCHIVO = re.compile(r'^sh_ipc_(\d{2})_(\d{2})\.xls$')
+
+# Índices ya construidos, por directorio. Se invalidan si cambia el conjunto de archivos o sus fechas de modificación.
+_INDICES = {}
+
+
+class IndiceVintage:
+    """
+    Índice (región, mes, vintage) -> variación mensual construido a partir de todos los
+    libros sh_ipc_*.xls de un directorio. Cada archivo se parsea una única vez (ver ingesta.py).
+
+    Para cada región se guarda una matriz (vintages x meses) con NaN donde el archivo
+    no publicaba ese mes, de modo que "la inflación conocida a la fecha X" es una fila.
+    """
+    def __init__(self, archivos):
+        """
+        Args:
+            archivos (list[tuple[int, str]]): Pares (vintage como ordinal de mes, ruta del archivo).
+        """
+        archivos = sorted(archivos)
+        self.vintages = np.array([vintage for vintage, _ in archivos], dtype=np.int64)
+        self.archivos = [ruta for _, ruta in archivos]
+
+        por_archivo = ingerir_archivos(self.archivos)
+        extraidos = [por_archivo[ruta] for ruta in self.archivos]
+        regiones = sorted({region for datos in extraidos for region in datos})
+
+        self.meses = {}
+        self.variaciones = {}
+        for region in regiones:
+            meses = np.unique(np.concatenate([datos[region][0] for datos in extraidos if region in datos]))
+            matriz = np.full((len(self.archivos), len(meses)), np.nan)
+            for fila, datos in enumerate(extraidos):
+                if region in datos:
+                    meses_archivo, variaciones_archivo = datos[region][:2]
+                    matriz[fila, np.searchsorted(meses, meses_archivo)] = variaciones_archivo
+            self.meses[region] = meses
+            self.variaciones[region] = matriz
+
+    def fila_vintage(self, fecha_conocimiento=None):
+        """
+        Devuelve la posición del último vintage publicado en o antes de 'fecha_conocimiento'
+        (o el más reciente si es None). Lanza ValueError si no había ningún archivo publicado.
+        """
+        if fecha_conocimiento is None:
+            return len(self.vintages) - 1
+        fila = int(np.searchsorted(self.vintages, meses_utils.de_fecha(fecha_conocimiento), side='right')) - 1
+        if fila < 0:
+            raise ValueError(f"No hay archivos del INDEC publicados a la fecha {fecha_conocimiento.strftime('%Y-%m')}.")
+        return fila
+
+    def variacion(self, region_name, mes, fecha_conocimiento=None):
+        """
+        Variación mensual (%) de 'mes' para la región, tal como se conocía a 'fecha_conocimiento'.
+        Devuelve NaN si ese mes todavía no estaba publicado.
+        """
+        meses = self.meses[region_name]
+        buscado = meses_utils.de_fecha(mes)
+        columna = int(np.searchsorted(meses, buscado))
+        if columna == len(meses) or meses[columna] != buscado:
+            return np.nan
+        return self.variaciones[region_name][self.fila_vintage(fecha_conocimiento), columna]
+
+    def serie(self, region_name, fecha_conocimiento=None):
+        """
+        Construye el IPC encadenado (base Dic 2016 = 100) de la región con las variaciones
+        del vintage vigente a 'fecha_conocimiento', con el mismo formato que DatasetExcel.
+        """
+        fila = self.variaciones[region_name][self.fila_vintage(fecha_conocimiento)]
+        publicados = ~np.isnan(fila)
+        return serie_desde_variaciones(self.meses[region_name][publicados], fila[publicados])
+
+    def revisiones(self, region_name):
+        """
+        Lista los meses cuya variación fue corregida entre un archivo y el siguiente.
+
+        Returns:
+            pd.DataFrame: Columnas 'mes', 'archivo_anterior', 'archivo', 'valor_anterior', 'valor_nuevo'.
+        """
+        matriz = self.variaciones[region_name]
+        anterior, nuevo = matriz[:-1], matriz[1:]
+        filas, columnas = np.nonzero(~np.isnan(anterior) & ~np.isnan(nuevo) & (anterior != nuevo))
+        meses = self.meses[region_name][columnas]
+        return pd.DataFrame({
+            'mes': [meses_utils.texto(mes) for mes in meses.tolist()],
+            'archivo_anterior': [os.path.basename(self.archivos[fila]) for fila in filas],
+            'archivo': [os.path.basename(self.archivos[fila + 1]) for fila in filas],
+            'valor_anterior': anterior[filas, columnas],
+            'valor_nuevo': nuevo[filas, columnas],
+        })
+
+
+def archivos_vintage(directorio):
+    """
+    Pares (vintage como ordinal de mes, ruta) de los libros sh_ipc_MM_AA.xls del directorio.
+    """
+    archivos = []
+    for nombre in os.listdir(directorio):
+        coincidencia = PATRON_ARCHIVO.match(nombre)
+        if coincidencia:
+            mes, anio = int(coincidencia.group(1)), 2000 + int(coincidencia.group(2))
+            archivos.append((meses_utils.ordinal(anio, mes), os.path.join(directorio, nombre)))
+    return archivos
+
+
+def obtener_indice(directorio):
+    """
+    Devuelve el IndiceVintage del directorio, construyéndolo solo si cambió algún archivo.
+    """
+    archivos = archivos_vintage(directorio)
+    if not archivos:
+        raise FileNotFoundError(f"No se encontraron archivos sh_ipc_MM_AA.xls en {directorio}")
+
+    firma = tuple(sorted((ruta, os.path.getmtime(ruta)) for _, ruta in archivos))
+    cacheado = _INDICES.get(directorio)
+    if cacheado is None or cacheado[0] != firma:
+        cacheado = (firma, IndiceVintage(archivos))
+        _INDICES[directorio] = cacheado
+    return cacheado[1]
+
+
+class DatasetVintage(Dataset):
+    """
+    Variación mensual por región (Excel) "tal como se conocía" a una fecha dada,
+    usando todos los archivos sh_ipc_*.xls archivados como vintages.
+    """
+    def __init__(self, directorio):
+        super().__init__(directorio)
+
+    @property
+    def indice(self):
+        return obtener_indice(self.fuente)
+
+    def cargar_datos(self, region_name, fecha_conocimiento=None):
+        """
+        Carga el IPC encadenado de la región con los datos publicados hasta 'fecha_conocimiento'.
+
+        Args:
+            region_name (str): Región como se muestra al usuario (ej. "Región GBA").
+            fecha_conocimiento (datetime, optional): Fecha de consulta. Si es None se usa el último archivo.
+        """
+        try:
+            if region_name not in REGION_EXCEL_TITLES:
+                raise ValueError(f"Región '{region_name}' no mapeada a un título de región válido en el Excel.")
+            self.datos = self.indice.serie(region_name, fecha_conocimiento)
+            print(f"Datos de Excel (vintage) para '{region_name}' cargados exitosamente.")
+        except FileNotFoundError as e:
+            print(f"Error: {e}")
+            self.datos = pd.DataFrame()
+        except ValueError as ve:
+            print(f"Error al cargar datos por vintage: {ve}")
+            self.datos = pd.DataFrame()
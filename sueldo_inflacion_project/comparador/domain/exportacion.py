@@ -0,0 +1,219 @@
+# domain/exportacion.py
+"""
+Exportación masiva de las series (y su analítica derivada) a archivos columnares particionados.
+
+Estructura de salida:
+    <directorio>/_manifiesto.json
+    <directorio>/fuente=<codigo>/region=<region>/serie-<año>.npz      (por defecto: un archivo por año)
+    <directorio>/fuente=<codigo>/region=<region>/serie.parquet        (opcional, requiere pyarrow: un row group por año)
+
+pyarrow no es una dependencia del proyecto: el formato parquet se usa solo si se pide y está instalado.
+Reexportar en un directorio existente borra los archivos y particiones que no quedan en el nuevo manifiesto.
+
+El manifiesto lista, por partición, los grupos con su rango de meses, así un lector puede abrir solo
+los row groups (o archivos .npz) que contienen los meses que necesita; ver leer_exportacion().
+"""
+import json
+import os
+import re
+import shutil
+import tempfile
+import unicodedata
+
+import numpy as np
+
+from .analitica import calcular_analitica, grilla_mensual
+
+VERSION_EXPORTACION = 1
+
+COLUMNAS = ('mes', 'indice', 'mensual', 'interanual')
+
+# Archivos de datos de una partición (los demás, si los hay, no son de la exportación)
+PATRON_ARCHIVO = re.compile(r'^serie(-\d+\.npz|\.parquet)$')
+
+
+def _slug(texto):
+    texto = unicodedata.normalize('NFKD', texto).encode('ascii', 'ignore').decode()
+    return re.sub(r'[^a-z0-9]+', '_', texto.lower()).strip('_') or 'total'
+
+
+def _pyarrow():
+    """
+    Devuelve (pyarrow, pyarrow.parquet) o None si pyarrow no está instalado.
+    """
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError:
+        return None
+    return pyarrow, pyarrow.parquet
+
+
+def columnas_serie(df, valor_columna='ipc_valor'):
+    """
+    Arma las columnas a exportar: mes (ordinal año * 12 + mes - 1), índice encadenado,
+    variación mensual e interanual en %. Los meses sin dato (huecos de la grilla) se omiten.
+    """
+    analitica = calcular_analitica(*grilla_mensual(df, valor_columna))
+    presentes = ~np.isnan(analitica['indice'])
+    return {
+        'mes': analitica['meses'][presentes].astype(np.int32),
+        'indice': analitica['indice'][presentes],
+        'mensual': analitica['mensual'][presentes],
+        'interanual': analitica['acumulada_12m'][presentes],
+    }
+
+
+def _grupos_por_anio(meses):
+    """
+    Cortes [inicio, fin) de las filas de cada año calendario.
+    """
+    anios = meses // 12
+    cortes = np.flatnonzero(np.diff(anios)) + 1
+    inicios = np.concatenate(([0], cortes))
+    fines = np.concatenate((cortes, [len(meses)]))
+    return list(zip(inicios.tolist(), fines.tolist()))
+
+
+def escribir_particion(directorio, columnas, formato):
+    """
+    Escribe una partición y devuelve la descripción de sus grupos para el manifiesto.
+    """
+    os.makedirs(directorio, exist_ok=True)
+    grupos = []
+    cortes = _grupos_por_anio(columnas['mes'])
+
+    if formato == 'parquet':
+        pa, pq = _pyarrow()
+        esquema = pa.schema([('mes', pa.int32())] + [(nombre, pa.float64()) for nombre in COLUMNAS[1:]])
+        destino = os.path.join(directorio, 'serie.parquet')
+        descriptor, temporal = tempfile.mkstemp(dir=directorio, suffix='.tmp')
+        os.close(descriptor)
+        try:
+            with pq.ParquetWriter(temporal, esquema) as writer:
+                for numero, (inicio, fin) in enumerate(cortes):
+                    # Un row group por año: las estadísticas min/max de 'mes' permiten saltearlos al leer
+                    writer.write_table(pa.table({nombre: columnas[nombre][inicio:fin] for nombre in COLUMNAS}, schema=esquema))
+                    grupos.append({'archivo': 'serie.parquet', 'row_group': numero,
+                                   'mes_min': int(columnas['mes'][inicio]), 'mes_max': int(columnas['mes'][fin - 1]),
+                                   'filas': fin - inicio})
+            os.replace(temporal, destino)
+        except BaseException:
+            os.unlink(temporal)
+            raise
+    else:
+        for inicio, fin in cortes:
+            anio = int(columnas['mes'][inicio]) // 12
+            nombre_archivo = f"serie-{anio}.npz"
+            descriptor, temporal = tempfile.mkstemp(dir=directorio, suffix='.tmp')
+            try:
+                with os.fdopen(descriptor, 'wb') as archivo:
+                    np.savez(archivo, **{nombre: columnas[nombre][inicio:fin] for nombre in COLUMNAS})
+                os.replace(temporal, os.path.join(directorio, nombre_archivo))
+            except BaseException:
+                os.unlink(temporal)
+                raise
+            grupos.append({'archivo': nombre_archivo, 'row_group': None,
+                           'mes_min': int(columnas['mes'][inicio]), 'mes_max': int(columnas['mes'][fin - 1]),
+                           'filas': fin - inicio})
+
+    # Archivos de una exportación anterior (ej. más larga o en el otro formato) que ya no están en el manifiesto
+    vigentes = {grupo['archivo'] for grupo in grupos}
+    for nombre in os.listdir(directorio):
+        if PATRON_ARCHIVO.match(nombre) and nombre not in vigentes:
+            os.remove(os.path.join(directorio, nombre))
+    return grupos
+
+
+def exportar(directorio, series, formato=None):
+    """
+    Exporta las series y escribe el manifiesto.
+
+    Args:
+        directorio (str): Directorio de salida.
+        series (iterable): Tuplas (codigo, nombre_fuente, region_name o None, versión, DataFrame, columna).
+        formato (str, optional): 'npz' (por defecto) o 'parquet' (requiere pyarrow).
+
+    Returns:
+        dict: El manifiesto escrito.
+    """
+    formato = formato or 'npz'
+    if formato not in ('npz', 'parquet'):
+        raise ValueError(f"Formato no válido: '{formato}'. Use 'npz' o 'parquet'.")
+    if formato == 'parquet' and not _pyarrow():
+        raise ValueError("El formato parquet requiere pyarrow. Use formato 'npz' o instale pyarrow.")
+
+    particiones = []
+    for codigo, nombre_fuente, region_name, version, df, columna in series:
+        relativa = os.path.join(f"fuente={codigo}", f"region={_slug(region_name or '')}")
+        grupos = escribir_particion(os.path.join(directorio, relativa), columnas_serie(df, columna), formato)
+        particiones.append({
+            'fuente': codigo, 'nombre': nombre_fuente, 'region': region_name,
+            'version_datos': version, 'directorio': relativa, 'grupos': grupos,
+        })
+
+    manifiesto = {
+        'version_exportacion': VERSION_EXPORTACION,
+        'formato': formato,
+        'columnas': list(COLUMNAS),
+        'particiones': particiones,
+    }
+    os.makedirs(directorio, exist_ok=True)
+    descriptor, temporal = tempfile.mkstemp(dir=directorio, suffix='.tmp')
+    try:
+        with os.fdopen(descriptor, 'w', encoding='utf-8') as archivo:
+            json.dump(manifiesto, archivo, ensure_ascii=False, indent=2)
+        os.replace(temporal, os.path.join(directorio, '_manifiesto.json'))
+    except BaseException:
+        os.unlink(temporal)
+        raise
+
+    # Particiones de una exportación anterior que ya no están en el manifiesto
+    vigentes = {particion['directorio'] for particion in particiones}
+    for fuente_dir in os.listdir(directorio):
+        ruta_fuente = os.path.join(directorio, fuente_dir)
+        if not (fuente_dir.startswith('fuente=') and os.path.isdir(ruta_fuente)):
+            continue
+        for region_dir in os.listdir(ruta_fuente):
+            if region_dir.startswith('region=') and os.path.join(fuente_dir, region_dir) not in vigentes:
+                shutil.rmtree(os.path.join(ruta_fuente, region_dir))
+        if not os.listdir(ruta_fuente):
+            os.rmdir(ruta_fuente)
+    return manifiesto
+
+
+def leer_exportacion(directorio, codigo, region_name=None, mes_desde=None, mes_hasta=None):
+    """
+    Lee de una exportación solo los grupos que se solapan con [mes_desde, mes_hasta] (ordinales de mes).
+
+    Returns:
+        dict: {columna: array} con las filas del rango pedido.
+    """
+    with open(os.path.join(directorio, '_manifiesto.json'), encoding='utf-8') as archivo:
+        manifiesto = json.load(archivo)
+    particion = next((p for p in manifiesto['particiones'] if p['fuente'] == codigo and p['region'] == region_name), None)
+    if particion is None:
+        raise ValueError(f"La exportación no contiene la fuente '{codigo}' para la región '{region_name}'.")
+
+    desde = mes_desde if mes_desde is not None else -np.inf
+    hasta = mes_hasta if mes_hasta is not None else np.inf
+    grupos = [g for g in particion['grupos'] if g['mes_max'] >= desde and g['mes_min'] <= hasta]
+    base = os.path.join(directorio, particion['directorio'])
+
+    partes = {nombre: [] for nombre in manifiesto['columnas']}
+    if manifiesto['formato'] == 'parquet' and grupos:
+        _, pq = _pyarrow()
+        tabla = pq.ParquetFile(os.path.join(base, 'serie.parquet')).read_row_groups([g['row_group'] for g in grupos])
+        for nombre in partes:
+            partes[nombre].append(tabla.column(nombre).to_numpy())
+    else:
+        for grupo in grupos:
+            with np.load(os.path.join(base, grupo['archivo'])) as npz:
+                for nombre in partes:
+                    partes[nombre].append(npz[nombre])
+
+    columnas = {nombre: np.concatenate(arrays) if arrays else np.array([]) for nombre, arrays in partes.items()}
+    if len(columnas['mes']):
+        dentro = (columnas['mes'] >= desde) & (columnas['mes'] <= hasta)
+        columnas = {nombre: array[dentro] for nombre, array in columnas.items()}
+    return columnas
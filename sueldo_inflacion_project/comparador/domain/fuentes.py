@@ -0,0 +1,319 @@
+# domain/fuentes.py
+"""
+Registro declarativo de fuentes de IPC.
+
+Cada fuente describe de dónde sale la serie (archivo, directorio o ID de la API), cómo se llaman
+sus columnas, su frecuencia y base, y qué política de cache usar. Las series se cargan de forma
+perezosa la primera vez que se piden y quedan en memoria del proceso según esa política.
+
+Para agregar fuentes sin tocar código, definir COMPARADOR_FUENTES_JSON con la ruta a un JSON
+con una lista de objetos con los mismos campos que Fuente, por ejemplo:
+
+    [{"codigo": "4", "nombre": "IPC Córdoba (CSV)", "tipo": "csv",
+      "ubicacion": "file/ipc-cordoba.csv", "columna_fecha": "indice_tiempo",
+      "columna_valor": "ipc_cordoba_ng", "base": "2014-07=100"}]
+"""
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass
+from datetime import date, datetime
+
+from . import meses as meses_utils
+from .calidad import es_extension, validar_serie
+from .dataset_api import DatasetAPI
+from .dataset_csv import DatasetCsv
+from .dataset_excel import DatasetExcel
+from .dataset_vintage import DatasetVintage, obtener_indice
+
+logger = logging.getLogger(__name__)
+
+# Directorio de la app comparador: las rutas relativas de las fuentes se resuelven desde acá
+COMPARADOR_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Opción del formulario -> región (solo para fuentes por región)
+REGIONES = {
+    '1': "Total Nacional",
+    '2': "Región GBA",
+    '3': "Región Pampeana",
+    '4': "Región Noroeste",
+    '5': "Región Noreste",
+    '6': "Región Cuyo",
+    '7': "Región Patagonia"
+}
+
+# Políticas de cache de la serie cargada
+CACHE_ARCHIVO = 'archivo'      # se recarga si cambia el archivo (mtime/tamaño)
+CACHE_DIARIA = 'diaria'        # se recarga una vez por día (fuentes remotas)
+CACHE_NINGUNO = 'sin_cache'    # se carga en cada pedido
+
+
+@dataclass(frozen=True)
+class Fuente:
+    codigo: str
+    nombre: str
+    tipo: str                          # 'api', 'csv' o 'excel'
+    ubicacion: str                     # ruta del archivo (relativa a la app) o ID de la serie en la API
+    etiqueta: str = ''                 # texto de la opción en el formulario
+    columna_fecha: str = 'indice_tiempo'
+    columna_valor: str = 'ipc_valor'
+    frecuencia: str = 'M'
+    base: str = ''
+    desde: str = ''                    # primera fecha a pedir (solo API)
+    cache: str = CACHE_ARCHIVO
+
+    @property
+    def requiere_region(self):
+        return self.tipo == 'excel'
+
+    @property
+    def ruta(self):
+        return os.path.join(COMPARADOR_DIR, self.ubicacion)
+
+    def archivos(self, fecha_vintage=None):
+        """
+        Archivos locales de los que depende la serie (vacío para la API).
+        Con 'fecha_vintage' una fuente Excel depende de todos los libros archivados del directorio.
+        """
+        if self.tipo == 'api':
+            return []
+        if self.tipo == 'excel' and fecha_vintage:
+            directorio = os.path.dirname(self.ruta)
+            return sorted(os.path.join(directorio, nombre) for nombre in os.listdir(directorio) if nombre.endswith('.xls'))
+        return [self.ruta]
+
+    def version(self, fecha_vintage=None):
+        """
+        Versión del snapshot de datos: cambia cuando se modifica alguno de los archivos
+        (mtime y tamaño) o, para fuentes con cache diaria, una vez por día.
+        """
+        partes = []
+        for ruta in self.archivos(fecha_vintage):
+            estado = os.stat(ruta)
+            partes.append(f"{ruta}:{estado.st_mtime_ns}:{estado.st_size}")
+        if self.cache != CACHE_ARCHIVO:
+            partes.append(date.today().isoformat())
+        return hashlib.sha1("|".join(partes).encode()).hexdigest()[:16]
+
+    def source_name(self, region_name=None, fecha_vintage=None):
+        nombre = f"{self.nombre} - {region_name}" if region_name else self.nombre
+        if fecha_vintage:
+            nombre += f" (datos publicados a {fecha_vintage.strftime('%Y-%m')})"
+        return nombre
+
+
+def _cargar_api(fuente, region_name, fecha_vintage):
+    dataset = DatasetAPI()
+    # Se pide la serie completa (la API devuelve 100 filas si no se indica 'limit')
+    dataset.cargar_datos(series_ids=[fuente.ubicacion], start_date=fuente.desde, limit=1000)
+    return dataset.datos, fuente.ubicacion
+
+
+def _cargar_csv(fuente, region_name, fecha_vintage):
+    dataset = DatasetCsv(fuente.ruta, fuente.columna_fecha, fuente.columna_valor)
+    dataset.cargar_datos()
+    return dataset.datos, 'ipc_valor'
+
+
+def _cargar_excel(fuente, region_name, fecha_vintage):
+    if fecha_vintage:
+        # Datos tal como se conocían a esa fecha (último archivo publicado hasta entonces)
+        dataset = DatasetVintage(os.path.dirname(fuente.ruta))
+        dataset.cargar_datos(region_name, fecha_vintage)
+    else:
+        dataset = DatasetExcel(fuente.ruta)
+        dataset.cargar_datos(region_name)
+    return dataset.datos, 'ipc_valor'
+
+
+CARGADORES = {
+    'api': _cargar_api,
+    'csv': _cargar_csv,
+    'excel': _cargar_excel,
+}
+
+_REGISTRO = {}
+_SERIES = {}
+# Uso del cache de series en este proceso: clave de _SERIES -> [aciertos, cargas, segundos de la última carga,
+# momento de la última carga]. Se actualiza sin lock: es una estadística, no importa perder algún conteo.
+_ESTADISTICAS = {}
+_lock = threading.Lock()
+
+
+def registrar(fuente):
+    """
+    Registra (o reemplaza) una fuente. Valida el tipo y la política de cache.
+    """
+    if fuente.tipo not in CARGADORES:
+        raise ValueError(f"Tipo de fuente desconocido: '{fuente.tipo}'.")
+    if fuente.cache not in (CACHE_ARCHIVO, CACHE_DIARIA, CACHE_NINGUNO):
+        raise ValueError(f"Política de cache desconocida: '{fuente.cache}'.")
+    _REGISTRO[fuente.codigo] = fuente
+    return fuente
+
+
+def obtener_fuente(codigo):
+    fuente = _REGISTRO.get(codigo)
+    if fuente is None:
+        raise ValueError("Opción de fuente de datos no válida.")
+    return fuente
+
+
+def fuentes_registradas():
+    return list(_REGISTRO.values())
+
+
+def obtener_region(fuente, region_choice):
+    """
+    Devuelve el nombre de la región elegida, o None si la fuente no es por región.
+    """
+    if not fuente.requiere_region:
+        return None
+    region_name = REGIONES.get(region_choice)
+    if not region_name:
+        raise ValueError("Opción de región no válida para Excel.")
+    return region_name
+
+
+def clave_serie(codigo, region_name=None, fecha_vintage=None):
+    """
+    Clave de los caches por serie: (codigo, region, 'AAAA-MM' del libro archivado vigente a 'fecha_vintage').
+
+    Todas las fechas que resuelven al mismo libro (ej. cualquier mes posterior al último archivado) comparten
+    la clave, así los caches crecen con la cantidad de libros y no con las fechas que piden los clientes.
+    Solo los Excel tienen versiones archivadas: para las demás fuentes la fecha no cambia la serie. Si no hay
+    ningún libro publicado a esa fecha se deja la fecha pedida (esa carga falla y no se cachea).
+    """
+    fuente = obtener_fuente(codigo)
+    if fecha_vintage is None or fuente.tipo != 'excel':
+        return (codigo, region_name, None)
+    try:
+        indice = obtener_indice(os.path.dirname(fuente.ruta))
+        return (codigo, region_name, meses_utils.texto(int(indice.vintages[indice.fila_vintage(fecha_vintage)])))
+    except (FileNotFoundError, ValueError):
+        return (codigo, region_name, fecha_vintage.strftime('%Y-%m'))
+
+
+def cargar_serie(codigo, region_name=None, fecha_vintage=None):
+    """
+    Devuelve la serie de una fuente, cargándola solo la primera vez (o cuando su versión cambia).
+
+    Returns:
+        tuple: (DataFrame de IPC, nombre de la columna de valores, versión de los datos).
+               El DataFrame es una copia superficial: se le puede cambiar el índice sin afectar al cache.
+               Si la recarga falla y había una serie anterior, se devuelve esa con su versión.
+    """
+    fuente = obtener_fuente(codigo)
+    version = fuente.version(fecha_vintage)
+    clave = clave_serie(codigo, region_name, fecha_vintage)
+
+    cacheado = _SERIES.get(clave)
+    if cacheado is None or cacheado[0] != version:
+        inicio = time.perf_counter()
+        df, columna = CARGADORES[fuente.tipo](fuente, region_name, fecha_vintage)
+        segundos = time.perf_counter() - inicio
+        if df is not None and not df.empty:
+            # Calidad controlada una vez por versión; si la serie anterior es un prefijo de la nueva
+            # (ej. la API agregó el último mes) solo se controlan los meses nuevos
+            extiende = cacheado is not None and cacheado[3] is not None and es_extension(cacheado[1], cacheado[2], df, columna)
+            calidad = validar_serie(df, columna, anterior=cacheado[3] if extiende else None)
+            for advertencia in calidad.advertencias():
+                logger.warning("Advertencia de calidad en '%s'%s: %s.", fuente.nombre,
+                               f" ({region_name})" if region_name else '', advertencia)
+            cacheado = (version, df, columna, calidad)
+            if fuente.cache != CACHE_NINGUNO:
+                with _lock:
+                    _SERIES[clave] = cacheado
+            # Las estadísticas se crean recién con una carga exitosa: un pedido que falla no deja entradas
+            estadisticas = _ESTADISTICAS.setdefault(clave, [0, 0, None, None])
+            estadisticas[1:] = [estadisticas[1] + 1, segundos, datetime.now()]
+        elif cacheado is None:
+            cacheado = (version, df, columna, None)
+        else:
+            # La carga falló (ej. API caída o circuito abierto): se responde con la última serie cargada,
+            # con su versión, y no se cachea el fallo para reintentar en el próximo pedido
+            logger.warning("No se pudo actualizar '%s'; se usa la serie cargada anteriormente.", fuente.nombre)
+    else:
+        _ESTADISTICAS.setdefault(clave, [0, 0, None, None])[0] += 1
+
+    version, df, columna, _ = cacheado
+    return (df.copy(deep=False) if df is not None else df), columna, version
+
+
+def calidad_series():
+    """
+    Reportes de calidad (ver calidad.py) de las series cargadas en este proceso.
+
+    Returns:
+        list: dicts con 'fuente', 'region', 'fecha_vintage', 'version' y el reporte.
+    """
+    return [
+        dict(calidad.como_dict(), fuente=codigo, region=region_name, fecha_vintage=vintage, version=version)
+        for (codigo, region_name, vintage), (version, _, _, calidad) in list(_SERIES.items())
+        if calidad is not None
+    ]
+
+
+def estado_series():
+    """
+    Estado de cada serie pedida en este proceso: último mes, archivo o ID de origen, versión,
+    duración de la última carga y tasa de aciertos del cache.
+
+    Returns:
+        list: dicts con 'fuente', 'region', 'fecha_vintage', 'cargada' (bool), 'ubicacion', 'version',
+              'ultimo_mes', 'filas', 'cargada_en', 'segundos_carga', 'aciertos', 'cargas' y 'tasa_aciertos'.
+    """
+    estado = []
+    for clave, (aciertos, cargas, segundos, cargada_en) in list(_ESTADISTICAS.items()):
+        codigo, region_name, vintage = clave
+        cacheado = _SERIES.get(clave)
+        calidad = cacheado[3] if cacheado is not None else None
+        pedidos = aciertos + cargas
+        estado.append({
+            'fuente': codigo,
+            'region': region_name,
+            'fecha_vintage': vintage,
+            'cargada': calidad is not None,
+            'ubicacion': _REGISTRO[codigo].ubicacion if codigo in _REGISTRO else None,
+            'version': cacheado[0] if cacheado is not None else None,
+            'ultimo_mes': meses_utils.texto(calidad.mes_max) if calidad is not None and calidad.filas else None,
+            'filas': calidad.filas if calidad is not None else 0,
+            'cargada_en': cargada_en.isoformat(timespec='seconds') if cargada_en else None,
+            'segundos_carga': round(segundos, 3) if segundos is not None else None,
+            'aciertos': aciertos,
+            'cargas': cargas,
+            'tasa_aciertos': round(aciertos / pedidos, 4) if pedidos else None,
+        })
+    return estado
+
+
+def cargar_configuracion(ruta):
+    """
+    Registra las fuentes definidas en un archivo JSON (lista de objetos con los campos de Fuente).
+    """
+    with open(ruta, encoding='utf-8') as archivo:
+        for definicion in json.load(archivo):
+            registrar(Fuente(**definicion))
+
+
+registrar(Fuente(
+    codigo='1', nombre="INDEC (API)", tipo='api', ubicacion=DatasetAPI.IPC_NATIONAL_ID,
+    etiqueta="Datos oficiales del INDEC hasta 12/2025(API)",
+    base="Dic 2016=100", desde='2016-12-01', cache=CACHE_DIARIA,
+))
+registrar(Fuente(
+    codigo='2', nombre="IPC Chaco (CSV)", tipo='csv', ubicacion='file/ipc-chaco-historico.csv',
+    etiqueta="Datos históricos de IPC Chaco hasta 08/2025(CSV)",
+    columna_fecha='indice_tiempo', columna_valor='ipc_chaco_historico_ng',
+))
+registrar(Fuente(
+    codigo='3', nombre="Variación Mensual (Excel)", tipo='excel', ubicacion='file/sh_ipc_01_26.xls',
+    etiqueta="Datos de variación mensual por Región hasta 12/2025(Excel)",
+    base="Dic 2016=100",
+))
+
+if os.environ.get('COMPARADOR_FUENTES_JSON'):
+    cargar_configuracion(os.environ['COMPARADOR_FUENTES_JSON'])
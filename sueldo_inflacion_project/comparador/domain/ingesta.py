@@ -0,0 +1,70 @@
+# domain/ingesta.py
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from . import artefactos
+from .dataset_excel import ARTEFACTO_NIVEL_GENERAL, compilar_excel
+
+# Cantidad de procesos para parsear libros Excel. 0 o 1 = en el mismo proceso (sin pool).
+# Por defecto 1: en el proceso web (gunicorn con hilos, el hilo del registro de comparaciones, el de la
+# precarga) no se levanta un pool por pedido. El parseo en paralelo es para el build: 'manage.py calentar'
+# compila los artefactos de todos los libros con --workers y el proceso web después solo los lee.
+INGESTA_WORKERS = int(os.environ.get('COMPARADOR_INGESTA_WORKERS', 1))
+
+
+def _parsear_archivo(ruta, regiones):
+    """
+    Trabajo de un proceso del pool: parsea un libro y devuelve solo arrays numpy
+    (meses, variaciones, divisiones) por región, que se serializan mucho más livianos que un DataFrame.
+    """
+    extraido = compilar_excel(ruta)
+    if regiones is not None:
+        extraido = {region: arrays for region, arrays in extraido.items() if region in regiones}
+    return extraido
+
+
+def ingerir_archivos(rutas, regiones=None, max_workers=None):
+    """
+    Parsea varios libros sh_ipc_*.xls, en paralelo con un ProcessPoolExecutor si max_workers > 1.
+
+    Cada trabajo es un archivo completo: todas las regiones de un libro salen de la misma
+    lectura de la hoja, así que repartir por (archivo, región) solo repetiría la apertura del .xls.
+
+    Args:
+        rutas (list[str]): Archivos a parsear.
+        regiones (set[str], optional): Regiones a conservar. None = todas.
+        max_workers (int, optional): Procesos a usar. Por defecto COMPARADOR_INGESTA_WORKERS.
+
+    Returns:
+        dict: {ruta: {region: (meses, variaciones, divisiones)}}, con las rutas en orden alfabético
+              sin importar el orden en que terminen los procesos.
+    """
+    rutas = sorted(rutas)
+    resultado = {}
+
+    # Los archivos con artefacto compilado vigente no se parsean: solo van al pool los que cambiaron
+    pendientes = []
+    for ruta in rutas:
+        compilado = artefactos.buscar(ruta, ARTEFACTO_NIVEL_GENERAL)
+        if compilado is None:
+            pendientes.append(ruta)
+        else:
+            resultado[ruta] = compilado if regiones is None else {
+                region: arrays for region, arrays in compilado.items() if region in regiones
+            }
+
+    if max_workers is None:
+        max_workers = INGESTA_WORKERS
+    max_workers = min(max_workers, len(pendientes))
+
+    if max_workers <= 1:
+        resultado.update((ruta, _parsear_archivo(ruta, regiones)) for ruta in pendientes)
+    else:
+        # 'spawn' y no 'fork': un fork de un proceso con hilos puede heredar locks tomados por otro hilo
+        with ProcessPoolExecutor(max_workers=max_workers, mp_context=multiprocessing.get_context('spawn')) as executor:
+            # map() devuelve los resultados en el orden de las rutas, lo que hace el merge determinístico
+            resultados = executor.map(_parsear_archivo, pendientes, [regiones] * len(pendientes))
+            resultado.update(zip(pendientes, resultados))
+
+    return {ruta: resultado[ruta] for ruta in rutas}
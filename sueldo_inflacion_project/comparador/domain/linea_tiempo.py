@@ -0,0 +1,105 @@
+# domain/linea_tiempo.py
+"""
+Datos del gráfico de línea de tiempo: el índice de precios contra el sueldo a lo largo del período elegido.
+
+Para rangos largos (ej. IPC Chaco desde 1960) la serie se reduce a una cantidad máxima de puntos
+conservando en cada tramo el mínimo y el máximo de cada serie, así los picos no desaparecen del gráfico.
+La codificación compacta manda los meses como diferencias y los valores como diferencias de su
+log10 cuantizado: enteros chicos, con un error relativo menor a 0,012% por punto.
+"""
+import numpy as np
+
+from . import meses as meses_utils
+
+# log10(valor) * ESCALA_LOG redondeado a entero
+ESCALA_LOG = 10000
+
+SERIES = ('indice', 'sueldo_nominal', 'sueldo_real')
+
+
+def linea_tiempo(meses_serie, valores_serie, mes_desde=None, mes_hasta=None, sueldo_inicial=None, sueldo_final=None):
+    """
+    Arrays alineados por mes para la ventana [mes_desde, mes_hasta] de la serie.
+
+    - 'indice': el índice con base 100 en el primer mes de la ventana.
+    - 'sueldo_nominal': el sueldo, de sueldo_inicial a sueldo_final con crecimiento mensual constante,
+      también con base 100 para compararlo directamente con el índice.
+    - 'sueldo_real': ese sueldo en pesos del primer mes de la ventana.
+
+    Los sueldos solo se incluyen si ambos son positivos.
+
+    Raises:
+        ValueError: Si la serie no tiene datos en la ventana.
+    """
+    inicio = 0 if mes_desde is None else int(np.searchsorted(meses_serie, mes_desde, side='left'))
+    fin = len(meses_serie) if mes_hasta is None else int(np.searchsorted(meses_serie, mes_hasta, side='right'))
+    meses, valores = meses_serie[inicio:fin], valores_serie[inicio:fin]
+    validos = valores > 0
+    meses, valores = meses[validos], valores[validos]
+    if len(meses) == 0:
+        raise ValueError("No hay datos del índice para el período elegido.")
+
+    datos = {'meses': meses, 'indice': valores / valores[0] * 100}
+    if sueldo_inicial and sueldo_final and sueldo_inicial > 0 and sueldo_final > 0:
+        fraccion = (meses - meses[0]) / max(int(meses[-1] - meses[0]), 1)
+        nominal = sueldo_inicial * (sueldo_final / sueldo_inicial) ** fraccion
+        datos['sueldo_nominal'] = nominal / sueldo_inicial * 100
+        datos['sueldo_real'] = nominal / datos['indice'] * 100
+    return datos
+
+
+def reducir_min_max(datos, max_puntos):
+    """
+    Reduce los arrays a unos max_puntos conservando el primer y el último punto y, en cada tramo,
+    las posiciones del mínimo y del máximo de cada serie.
+    """
+    meses = datos['meses']
+    series = [nombre for nombre in SERIES if nombre in datos]
+    n = len(meses)
+    if n <= max_puntos:
+        return datos
+
+    # Cada tramo aporta hasta 2 puntos por serie
+    tramos = max((max_puntos - 2) // (2 * len(series)), 1)
+    tramo = np.minimum((np.arange(n) * tramos) // n, tramos - 1)
+
+    posiciones = [np.array([0, n - 1])]
+    limites = np.flatnonzero(np.diff(tramo)) + 1
+    inicios = np.concatenate(([0], limites))
+    fines = np.concatenate((limites, [n])) - 1
+    for nombre in series:
+        # Ordenando por (tramo, valor), el primero de cada tramo es su mínimo y el último su máximo
+        orden = np.lexsort((datos[nombre], tramo))
+        posiciones.extend((orden[inicios], orden[fines]))
+    elegidas = np.unique(np.concatenate(posiciones))
+    return {nombre: array[elegidas] for nombre, array in datos.items()}
+
+
+def codificar(datos):
+    """
+    Codificación compacta para JSON: 'mes_inicial' ('AAAA-MM'), 'pasos_meses' (diferencias entre meses
+    consecutivos, o None si son todos 1) y, por serie, [primer valor, diferencias...] de round(log10(valor) * escala).
+    """
+    meses = datos['meses']
+    pasos = np.diff(meses)
+    codificado = {
+        'mes_inicial': meses_utils.texto(int(meses[0])),
+        'pasos_meses': None if (pasos == 1).all() else pasos.tolist(),
+        'escala': ESCALA_LOG,
+    }
+    for nombre in SERIES:
+        if nombre in datos:
+            cuantizado = np.rint(np.log10(datos[nombre]) * ESCALA_LOG).astype(np.int64)
+            codificado[nombre] = [int(cuantizado[0])] + np.diff(cuantizado).tolist()
+    return codificado
+
+
+def plano(datos, decimales=4):
+    """
+    Versión sin codificar (meses 'AAAA-MM' y valores redondeados), para depurar o para otros clientes.
+    """
+    resultado = {'meses': [meses_utils.texto(mes) for mes in datos['meses'].tolist()]}
+    for nombre in SERIES:
+        if nombre in datos:
+            resultado[nombre] = np.round(datos[nombre], decimales).tolist()
+    return resultado
@@ -0,0 +1,149 @@
+# domain/meses.py
+"""
+Meses como enteros ("ordinales de mes"): año * 12 + mes - 1, es decir enero de 2024 = 24288.
+
+Todas las series del comparador son mensuales, así que loaders y cálculos trabajan con estos enteros:
+restar uno es "el mes anterior", las búsquedas son np.searchsorted sobre int64 y no hay ambigüedad
+entre índices de primer día y de fin de mes. Las conversiones de arrays son vectorizadas y estrictas:
+un valor inválido lanza ValueError (o, en las celdas de Excel, queda marcado como no válido).
+"""
+import numpy as np
+import pandas as pd
+from datetime import datetime
+
+# datetime64[M] cuenta meses desde enero de 1970
+_EPOCA = 1970 * 12
+
+
+def ordinal(anio, mes):
+    """
+    Ordinal de un año y mes (1 a 12).
+    """
+    if not 1 <= mes <= 12:
+        raise ValueError(f"Mes fuera de rango: {mes}.")
+    return anio * 12 + mes - 1
+
+
+def parsear(texto):
+    """
+    Convierte 'AAAA-MM' en su ordinal. Es estricto: rechaza cualquier otro formato.
+
+    Raises:
+        ValueError: Si el texto no es exactamente 'AAAA-MM' con un mes válido.
+    """
+    if (not isinstance(texto, str) or len(texto) != 7 or texto[4] != '-' or not texto.isascii()
+            or not texto[:4].isdigit() or not texto[5:].isdigit()):
+        raise ValueError(f"Fecha inválida: {texto!r}. Se esperaba el formato AAAA-MM.")
+    return ordinal(int(texto[:4]), int(texto[5:]))
+
+
+def texto(mes):
+    """
+    Ordinal -> 'AAAA-MM'.
+    """
+    return f"{mes // 12:04d}-{mes % 12 + 1:02d}"
+
+
+def de_fecha(fecha):
+    """
+    Ordinal del mes de una fecha (date, datetime o Timestamp).
+    """
+    return fecha.year * 12 + fecha.month - 1
+
+
+def a_fecha(mes):
+    """
+    Ordinal -> datetime del primer día del mes.
+    """
+    return datetime(mes // 12, mes % 12 + 1, 1)
+
+
+def desde_fechas(fechas):
+    """
+    Versión vectorizada de de_fecha para DatetimeIndex, Series, arrays datetime64 o listas de fechas.
+    Si ya son enteros se devuelven como ordinales sin convertir.
+
+    Returns:
+        np.ndarray: int64.
+
+    Raises:
+        ValueError: Si hay fechas faltantes (NaT).
+    """
+    if isinstance(fechas, (pd.Index, pd.Series)):
+        fechas = fechas.to_numpy()
+    fechas = np.asarray(fechas)
+    if fechas.dtype.kind in 'iu':
+        return fechas.astype(np.int64, copy=False)
+    if fechas.dtype.kind != 'M':
+        fechas = pd.DatetimeIndex(fechas).to_numpy()
+    if np.isnat(fechas).any():
+        raise ValueError("Hay fechas faltantes (NaT): no se pueden convertir a meses.")
+    return fechas.astype('datetime64[M]').astype(np.int64) + _EPOCA
+
+
+def desde_textos(textos):
+    """
+    Versión vectorizada de parsear para textos 'AAAA-MM' (se acepta también 'AAAA-MM-DD': el día se ignora).
+
+    Raises:
+        ValueError: Si algún texto no tiene ese formato.
+    """
+    textos = np.asarray(textos, dtype=str)
+    if textos.size and (np.char.str_len(textos) < 7).any():
+        raise ValueError("Fecha inválida: se esperaba el formato AAAA-MM.")
+    try:
+        # datetime64 rechaza formatos distintos de AAAA-MM (y meses fuera de rango)
+        return textos.astype('U7').astype('datetime64[M]').astype(np.int64) + _EPOCA
+    except ValueError as e:
+        raise ValueError(f"Fecha inválida, se esperaba el formato AAAA-MM: {e}") from None
+
+
+def desde_celdas_excel(celdas):
+    """
+    Meses de una fila de celdas de Excel: fechas ya convertidas por el lector, textos de fecha o
+    números de serie de Excel (días desde 1899-12-30).
+
+    Returns:
+        tuple: (meses int64, válidos bool). Las celdas que no son fechas quedan con válidos=False.
+    """
+    celdas = pd.Series(np.asarray(celdas, dtype=object))
+    numericas = celdas.map(lambda celda: isinstance(celda, (int, float, np.number)) and not isinstance(celda, bool)).to_numpy(dtype=bool)
+
+    fechas = np.full(len(celdas), np.datetime64('NaT'), dtype='datetime64[D]')
+    if numericas.any():
+        dias = pd.to_numeric(celdas[numericas], errors='coerce').to_numpy(dtype=np.float64)
+        seriales = np.full(len(dias), np.datetime64('NaT'), dtype='datetime64[D]')
+        finitos = np.isfinite(dias)
+        seriales[finitos] = np.datetime64('1899-12-30') + dias[finitos].astype(np.int64)
+        fechas[numericas] = seriales
+    if (~numericas).any():
+        fechas[~numericas] = pd.to_datetime(celdas[~numericas], errors='coerce', format='mixed').to_numpy(dtype='datetime64[D]')
+
+    validos = ~np.isnat(fechas)
+    meses = np.zeros(len(celdas), dtype=np.int64)
+    meses[validos] = fechas[validos].astype('datetime64[M]').astype(np.int64) + _EPOCA
+    return meses, validos
+
+
+def a_fechas(meses, name='fecha'):
+    """
+    Ordinales -> DatetimeIndex con el primer día de cada mes (el formato de índice de todos los datasets).
+    """
+    meses = np.asarray(meses, dtype=np.int64)
+    return pd.DatetimeIndex((meses - _EPOCA).astype('datetime64[M]').astype('datetime64[ns]'), name=name)
+
+
+def de_serie(df, valor_columna='ipc_valor'):
+    """
+    Meses y valores de una serie mensual (DataFrame con índice de fechas), sin NaN y en orden.
+
+    Returns:
+        tuple: (meses int64, valores float64).
+    """
+    serie = df[valor_columna].dropna()
+    meses = desde_fechas(serie.index)
+    valores = serie.to_numpy(dtype=np.float64)
+    if len(meses) > 1 and (np.diff(meses) < 0).any():
+        orden = np.argsort(meses, kind='stable')
+        meses, valores = meses[orden], valores[orden]
+    return meses, valores
@@ -0,0 +1,155 @@
+# domain/periodos.py
+"""
+Agregados trimestrales y anuales (año calendario o ejercicio con otro mes de inicio) de una serie mensual.
+
+La grilla de meses contiguos de la analítica (ver analitica.grilla_mensual) se completa con NaN hasta
+períodos enteros y se reacomoda como matriz (períodos x meses del período): cada convención es una
+reducción por fila. Con "fin de período" el nivel es el índice del último mes; con "promedio", el
+promedio de los meses del período (la convención del INDEC para los índices anuales). Un período con
+algún mes sin dato queda en NaN en ambas, para no comparar un año a medio publicar con uno completo.
+
+Se calcula una sola vez por versión de la serie, frecuencia y mes de inicio; comparar dos períodos es
+buscar sus posiciones por etiqueta.
+"""
+import os
+import threading
+
+import numpy as np
+
+from .analitica import obtener_analitica
+from .fuentes import clave_serie
+
+# Meses por período de cada frecuencia
+FRECUENCIAS = {'trimestral': 3, 'anual': 12}
+
+CONVENCIONES = ('fin', 'promedio')
+
+# Mes de inicio del ejercicio por defecto (1 = año calendario; ej. 7 para ejercicios de julio a junio)
+INICIO_EJERCICIO = int(os.environ.get('COMPARADOR_INICIO_EJERCICIO', 1))
+
+# Agregados ya calculados: (codigo, region, vintage, frecuencia, mes de inicio) -> (versión, resultado)
+_CACHE = {}
+_lock = threading.Lock()
+
+
+def etiquetas(inicios, meses_por_periodo, mes_inicio=1):
+    """
+    Etiqueta de cada período a partir del ordinal de su primer mes: '2024' o '2024-T1' en año calendario;
+    '2024/25' o '2024/25-T1' en un ejercicio que empieza en otro mes (el año es el del mes de inicio).
+    """
+    resultado = []
+    for inicio in inicios.tolist():
+        # Meses desde el comienzo del ejercicio 0
+        relativo = inicio - (mes_inicio - 1)
+        anio = relativo // 12
+        texto = str(anio) if mes_inicio == 1 else f"{anio}/{(anio + 1) % 100:02d}"
+        if meses_por_periodo != 12:
+            texto += f"-T{relativo % 12 // meses_por_periodo + 1}"
+        resultado.append(texto)
+    return resultado
+
+
+def _variacion(niveles, k):
+    """
+    Variación porcentual de cada período contra k períodos antes.
+    """
+    resultado = np.full(len(niveles), np.nan)
+    if k < len(niveles):
+        with np.errstate(divide='ignore', invalid='ignore'):
+            resultado[k:] = (niveles[k:] / niveles[:-k] - 1) * 100
+    return resultado
+
+
+def agregar(meses, valores, meses_por_periodo, mes_inicio=1):
+    """
+    Niveles por período y sus variaciones, en forma vectorizada.
+
+    Args:
+        meses (np.ndarray): Meses contiguos (int64), como los de analitica.grilla_mensual.
+        valores (np.ndarray): Índice de cada mes, NaN donde no hay dato.
+        meses_por_periodo (int): 3 (trimestres) o 12 (años).
+        mes_inicio (int): Mes (1 a 12) en que empieza el año: 1 para el año calendario.
+
+    Returns:
+        dict: 'periodos' (etiquetas), 'inicio' (ordinal del primer mes de cada período), 'meses_con_dato' y,
+              para cada convención ('fin' y 'promedio'), el nivel y la variación contra el período anterior
+              ('fin', 'variacion_fin', ...). Los trimestres suman la variación contra el mismo trimestre del
+              año anterior ('interanual_fin', 'interanual_promedio').
+    """
+    if not 1 <= mes_inicio <= 12:
+        raise ValueError(f"Mes de inicio del ejercicio fuera de rango: {mes_inicio}.")
+    desfase = mes_inicio - 1
+    if len(meses) == 0:
+        primero, ultimo = 0, -1
+    else:
+        # Primer mes del período que contiene al primer mes de la serie, y último del que contiene al último
+        primero = (int(meses[0]) - desfase) // meses_por_periodo * meses_por_periodo + desfase
+        ultimo = (int(meses[-1]) - desfase) // meses_por_periodo * meses_por_periodo + desfase + meses_por_periodo - 1
+    cantidad = (ultimo - primero + 1) // meses_por_periodo
+
+    grilla = np.full(cantidad * meses_por_periodo, np.nan)
+    if len(meses):
+        grilla[meses - primero] = valores
+    matriz = grilla.reshape(cantidad, meses_por_periodo)
+
+    con_dato = (~np.isnan(matriz)).sum(axis=1)
+    completos = con_dato == meses_por_periodo
+    inicios = primero + np.arange(cantidad, dtype=np.int64) * meses_por_periodo
+
+    resultado = {
+        'periodos': etiquetas(inicios, meses_por_periodo, mes_inicio),
+        'inicio': inicios,
+        'meses_con_dato': con_dato,
+        # La suma de una fila con NaN es NaN: los períodos incompletos quedan sin nivel en ambas convenciones
+        'fin': np.where(completos, matriz[:, -1], np.nan),
+        'promedio': matriz.sum(axis=1) / meses_por_periodo,
+    }
+    por_anio = 12 // meses_por_periodo
+    for convencion in CONVENCIONES:
+        resultado[f'variacion_{convencion}'] = _variacion(resultado[convencion], 1)
+        if por_anio > 1:
+            resultado[f'interanual_{convencion}'] = _variacion(resultado[convencion], por_anio)
+    return resultado
+
+
+def obtener_periodos(codigo, region_name=None, fecha_vintage=None, frecuencia='anual', mes_inicio=None):
+    """
+    Agregados de una serie del registro, calculados una sola vez por versión de datos, frecuencia y mes de inicio.
+
+    Returns:
+        tuple: (versión de los datos, dict de agregar con además 'posiciones': etiqueta -> fila)
+    """
+    if frecuencia not in FRECUENCIAS:
+        raise ValueError(f"Frecuencia no válida: use {' o '.join(FRECUENCIAS)}.")
+    mes_inicio = INICIO_EJERCICIO if mes_inicio is None else mes_inicio
+    version, analitica = obtener_analitica(codigo, region_name, fecha_vintage)
+
+    clave = clave_serie(codigo, region_name, fecha_vintage) + (frecuencia, mes_inicio)
+    cacheado = _CACHE.get(clave)
+    if cacheado is None or cacheado[0] != version:
+        datos = agregar(analitica['meses'], analitica['indice'], FRECUENCIAS[frecuencia], mes_inicio)
+        datos['posiciones'] = {etiqueta: fila for fila, etiqueta in enumerate(datos['periodos'])}
+        cacheado = (version, datos)
+        with _lock:
+            _CACHE[clave] = cacheado
+    return cacheado
+
+
+def comparar_periodos(datos, periodo_desde, periodo_hasta):
+    """
+    Variación del índice entre dos períodos en cada convención: dos búsquedas por etiqueta.
+
+    Returns:
+        dict: {convención: variación en % (NaN si alguno de los períodos está incompleto)}
+
+    Raises:
+        ValueError: Si alguna etiqueta no corresponde a un período de la serie.
+    """
+    filas = []
+    for periodo in (periodo_desde, periodo_hasta):
+        if periodo not in datos['posiciones']:
+            raise ValueError(f"Período '{periodo}' fuera de la serie (ej. de etiqueta: '{datos['periodos'][-1]}').")
+        filas.append(datos['posiciones'][periodo])
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return {convencion: float((datos[convencion][filas[1]] / datos[convencion][filas[0]] - 1) * 100)
+                for convencion in CONVENCIONES}
@@ -0,0 +1,192 @@
+# domain/resiliencia.py
+"""
+Pedidos HTTP acotados en tiempo a servicios externos: timeouts de conexión y lectura, reintentos
+limitados con espera exponencial aleatoria ("full jitter") y un circuito que, tras varias fallas
+seguidas, rechaza los pedidos al instante durante un tiempo en lugar de dejar colgados a los workers.
+"""
+import random
+import threading
+import time
+
+import requests
+import urllib3
+
+CERRADO = 'cerrado'        # funcionamiento normal
+ABIERTO = 'abierto'        # el servicio falla: se rechaza sin llamar hasta que pase la espera
+SEMIABIERTO = 'semiabierto'  # pasó la espera: un único pedido de prueba decide si se cierra o se reabre
+
+
+class CircuitoAbierto(requests.exceptions.RequestException):
+    """
+    Pedido rechazado sin llamar al servicio porque el circuito está abierto.
+    Hereda de RequestException para que quien ya maneja errores de red lo trate igual.
+    """
+
+
+class Circuito:
+    """
+    Circuit breaker para un servicio externo.
+
+    Args:
+        nombre (str): Nombre del servicio (para métricas y mensajes).
+        fallas_apertura (int): Fallas consecutivas que abren el circuito.
+        espera (float): Segundos que el circuito queda abierto antes de permitir un pedido de prueba.
+    """
+
+    def __init__(self, nombre, fallas_apertura=3, espera=30.0):
+        self.nombre = nombre
+        self.fallas_apertura = fallas_apertura
+        self.espera = espera
+        self._lock = threading.Lock()
+        self._estado = CERRADO
+        self._fallas_seguidas = 0
+        self._abierto_desde = None
+        self._prueba_en_curso = False
+        self._metricas = {'exitos': 0, 'fallas': 0, 'rechazos': 0, 'aperturas': 0, 'ultimo_error': None}
+
+    def permitir(self):
+        """
+        Indica si se puede llamar al servicio ahora. En estado semiabierto deja pasar un solo pedido.
+        """
+        with self._lock:
+            if self._estado == ABIERTO and time.monotonic() - self._abierto_desde >= self.espera:
+                self._estado = SEMIABIERTO
+            if self._estado == CERRADO:
+                return True
+            if self._estado == SEMIABIERTO and not self._prueba_en_curso:
+                self._prueba_en_curso = True
+                return True
+            self._metricas['rechazos'] += 1
+            return False
+
+    def registrar_exito(self):
+        with self._lock:
+            self._metricas['exitos'] += 1
+            self._estado = CERRADO
+            self._fallas_seguidas = 0
+            self._prueba_en_curso = False
+
+    def registrar_falla(self, error):
+        with self._lock:
+            self._metricas['fallas'] += 1
+            self._metricas['ultimo_error'] = str(error)
+            self._fallas_seguidas += 1
+            if self._estado == SEMIABIERTO or self._fallas_seguidas >= self.fallas_apertura:
+                if self._estado != ABIERTO:
+                    self._metricas['aperturas'] += 1
+                self._estado = ABIERTO
+                self._abierto_desde = time.monotonic()
+            self._prueba_en_curso = False
+
+    def estado(self):
+        """
+        Estado actual y contadores del circuito (para /debug/api/).
+        """
+        with self._lock:
+            estado = dict(self._metricas, nombre=self.nombre, estado=self._estado,
+                          fallas_seguidas=self._fallas_seguidas)
+            if self._estado == ABIERTO:
+                estado['segundos_para_reintentar'] = round(max(0.0, self.espera - (time.monotonic() - self._abierto_desde)), 1)
+        return estado
+
+
+def _error_del_pedido(error):
+    """
+    Un 4xx (salvo 429) es un error del pedido, no de la salud del servicio: no se reintenta ni abre el circuito.
+    """
+    return (isinstance(error, requests.exceptions.HTTPError) and error.response is not None
+            and 400 <= error.response.status_code < 500 and error.response.status_code != 429)
+
+
+def _reintentable(error):
+    # Errores de red, timeouts, cuerpos cortados a mitad de camino y 5xx/429 son transitorios
+    if isinstance(error, requests.exceptions.HTTPError) and error.response is not None:
+        return error.response.status_code >= 500 or error.response.status_code == 429
+    return isinstance(error, (requests.exceptions.ConnectionError, requests.exceptions.Timeout,
+                              requests.exceptions.ChunkedEncodingError))
+
+
+def _leer_cuerpo(respuesta, limite):
+    """
+    Lee el cuerpo de una respuesta pedida con stream=True. El timeout de lectura de requests se aplica
+    a cada lectura del socket: un servidor que manda el cuerpo de a poco no lo dispara nunca, así que
+    además se corta la descarga al pasar 'limite' (time.monotonic()). Se lee con read1, que devuelve lo
+    que ya llegó en lugar de esperar a completar el bloque, y los errores de urllib3 se traducen a los
+    mismos de requests que produciría Response.content.
+    """
+    bloques = []
+    while True:
+        try:
+            bloque = respuesta.raw.read1(64 * 1024, decode_content=True)
+        except urllib3.exceptions.ReadTimeoutError as e:
+            raise requests.exceptions.ReadTimeout(e, response=respuesta)
+        except urllib3.exceptions.ProtocolError as e:
+            raise requests.exceptions.ChunkedEncodingError(e, response=respuesta)
+        except urllib3.exceptions.DecodeError as e:
+            raise requests.exceptions.ContentDecodingError(e, response=respuesta)
+        if not bloque:
+            break
+        bloques.append(bloque)
+        if time.monotonic() > limite:
+            raise requests.exceptions.ReadTimeout(f"La descarga de {respuesta.url} superó el tiempo máximo.",
+                                                  response=respuesta)
+    # Mismo atributo que completa Response.content al leer el cuerpo: desde acá .content y .json() lo usan
+    respuesta._content = b"".join(bloques)
+    return respuesta
+
+
+def pedir_con_reintentos(sesion, url, circuito, timeout=(3.05, 8.0), reintentos=1, espera_base=0.5,
+                         espera_maxima=4.0, presupuesto=20.0, params=None):
+    """
+    GET con timeouts, reintentos acotados y circuito.
+
+    Args:
+        sesion (requests.Session): Sesión a usar (reutiliza conexiones). No se comparte entre hilos.
+        url (str): URL a pedir.
+        circuito (Circuito): Circuito del servicio.
+        timeout (tuple): Segundos de (conexión, lectura) de cada intento. La suma es además el tiempo
+            máximo de un intento completo, incluida la descarga del cuerpo.
+        reintentos (int): Reintentos después del primer intento.
+        espera_base, espera_maxima (float): La espera antes del reintento n es aleatoria entre 0 y
+            min(espera_maxima, espera_base * 2**n).
+        presupuesto (float): Tiempo total máximo: no se empieza un intento que podría pasarse de él y
+            la descarga de un cuerpo se corta al llegar a él.
+        params (dict, optional): Parámetros de la consulta.
+
+    Returns:
+        requests.Response: Respuesta exitosa (2xx), con el cuerpo ya leído.
+
+    Raises:
+        CircuitoAbierto: Si el circuito rechazó el pedido.
+        requests.exceptions.RequestException: El error del último intento.
+    """
+    inicio = time.monotonic()
+    limite_intento = sum(timeout) if isinstance(timeout, tuple) else timeout
+    for intento in range(reintentos + 1):
+        if not circuito.permitir():
+            raise CircuitoAbierto(f"Servicio {circuito.nombre} no disponible (circuito abierto); se reintentará más tarde.")
+        try:
+            respuesta = sesion.get(url, params=params, timeout=timeout, stream=True)
+            respuesta.raise_for_status()
+            _leer_cuerpo(respuesta, min(time.monotonic() + limite_intento, inicio + presupuesto))
+        except requests.exceptions.RequestException as e:
+            if getattr(e, 'response', None) is not None:
+                e.response.close() # Devuelve la conexión al pool sin leer el resto del cuerpo
+            if _error_del_pedido(e):
+                circuito.registrar_exito() # El servicio respondió: el error es del pedido, no de su salud
+                raise
+            circuito.registrar_falla(e)
+            if intento == reintentos or not _reintentable(e):
+                raise
+            pausa = random.uniform(0, min(espera_maxima, espera_base * 2 ** intento))
+            if time.monotonic() - inicio + pausa + limite_intento > presupuesto:
+                raise
+            time.sleep(pausa)
+        except BaseException as e:
+            # Cualquier otro error (ej. un bug al leer la respuesta) también termina el intento: si era la
+            # prueba del estado semiabierto, sin esto el circuito quedaría rechazando pedidos para siempre
+            circuito.registrar_falla(e)
+            raise
+        else:
+            circuito.registrar_exito()
+            return respuesta
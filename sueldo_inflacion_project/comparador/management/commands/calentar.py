@@ -0,0 +1,68 @@
+# comparador/management/commands/calentar.py
+import contextlib
+import io
+import os
+import time
+
+import requests
+from django.core.management.base import BaseCommand, CommandError
+
+from comparador.domain import calentamiento
+from comparador.domain.fuentes import estado_series
+
+
+class Command(BaseCommand):
+    help = ("Precarga todas las series del registro y muestra su estado (último mes, versión, duración de la carga). "
+            "En el build sirve para verificar las fuentes y dejar compilados los artefactos del Excel; con --url "
+            "espera a que el endpoint /listo/ de un servidor ya levantado responda 200 (hook post-deploy).")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--url', help="URL de /listo/ a consultar en lugar de precargar en este proceso.")
+        parser.add_argument('--timeout', type=float, default=120.0,
+                            help="Segundos máximos de espera con --url (por defecto 120).")
+        parser.add_argument('--intervalo', type=float, default=2.0, help="Segundos entre consultas con --url.")
+        parser.add_argument('--estricto', action='store_true', help="Falla si alguna serie no se pudo cargar.")
+        parser.add_argument('--workers', type=int, default=os.cpu_count() or 1,
+                            help="Procesos para compilar los libros archivados (vintages) antes de precargar "
+                                 "(por defecto uno por CPU; 0 = no compilarlos).")
+
+    def handle(self, *args, **options):
+        if options['url']:
+            respuesta = self._esperar(options['url'], options['timeout'], options['intervalo'])
+            errores = respuesta.get('errores', {})
+            series = respuesta.get('series', [])
+            self.stdout.write(f"Worker {respuesta.get('pid')} listo en {respuesta.get('segundos')} s.")
+        else:
+            inicio = time.perf_counter()
+            if options['workers'] > 0:
+                libros = calentamiento.compilar_vintages(options['workers'])
+                self.stdout.write(f"{libros} libros archivados compilados en {time.perf_counter() - inicio:.2f} s "
+                                  f"({options['workers']} procesos).")
+            # Los datasets imprimen mucho diagnóstico: se descarta para no ensuciar la salida del comando
+            with contextlib.redirect_stdout(io.StringIO()):
+                errores = calentamiento.calentar()
+            series = estado_series()
+            self.stdout.write(f"Series precargadas en {time.perf_counter() - inicio:.2f} s.")
+
+        for serie in series:
+            nombre = f"{serie['fuente']}/{serie['region']}" if serie['region'] else serie['fuente']
+            self.stdout.write(f"  {nombre:<22} último mes {serie['ultimo_mes'] or '-':<8} versión {serie['version'] or '-':<16} "
+                              f"carga {serie['segundos_carga'] if serie['segundos_carga'] is not None else '-'} s")
+        for nombre, error in errores.items():
+            self.stderr.write(f"  {nombre}: {error}")
+        if errores and options['estricto']:
+            raise CommandError(f"{len(errores)} series no se pudieron cargar.")
+
+    def _esperar(self, url, timeout, intervalo):
+        limite = time.monotonic() + timeout
+        while True:
+            try:
+                respuesta = requests.get(url, timeout=10)
+                if respuesta.status_code == 200:
+                    return respuesta.json()
+                detalle = f"HTTP {respuesta.status_code}"
+            except requests.exceptions.RequestException as e:
+                detalle = str(e)
+            if time.monotonic() >= limite:
+                raise CommandError(f"{url} no respondió 200 en {timeout:.0f} s (último intento: {detalle}).")
+            time.sleep(intervalo)
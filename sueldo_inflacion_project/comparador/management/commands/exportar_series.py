@@ -0,0 +1,48 @@
+# comparador/management/commands/exportar_series.py
+import contextlib
+import io
+
+from django.core.management.base import BaseCommand, CommandError
+
+from comparador.domain.exportacion import exportar
+from comparador.domain.fuentes import REGIONES, cargar_serie, fuentes_registradas
+
+
+class Command(BaseCommand):
+    help = ("Exporta todas las series (por fuente y región) con índice encadenado, variación mensual "
+            "e interanual a archivos columnares particionados (.npz, o Parquet si pyarrow está instalado).")
+
+    def add_arguments(self, parser):
+        parser.add_argument('directorio', help="Directorio de salida.")
+        parser.add_argument('--fuentes', help="Códigos de fuente separados por coma (por defecto todas).")
+        parser.add_argument('--formato', choices=['parquet', 'npz'],
+                            help="Formato de salida (por defecto npz; parquet requiere pyarrow).")
+
+    def handle(self, *args, **options):
+        fuentes = fuentes_registradas()
+        if options['fuentes']:
+            pedidas = set(options['fuentes'].split(','))
+            fuentes = [fuente for fuente in fuentes if fuente.codigo in pedidas]
+
+        series = []
+        for fuente in fuentes:
+            regiones = REGIONES.values() if fuente.requiere_region else [None]
+            for region_name in regiones:
+                # Los datasets imprimen mucho diagnóstico: se descarta para no ensuciar la salida del comando
+                with contextlib.redirect_stdout(io.StringIO()):
+                    df, columna, version = cargar_serie(fuente.codigo, region_name)
+                nombre = fuente.source_name(region_name)
+                if df is None or df.empty:
+                    self.stderr.write(f"Sin datos para {nombre}: se omite.")
+                    continue
+                series.append((fuente.codigo, fuente.nombre, region_name, version, df, columna))
+
+        try:
+            manifiesto = exportar(options['directorio'], series, options['formato'])
+        except ValueError as e:
+            raise CommandError(str(e))
+
+        for particion in manifiesto['particiones']:
+            filas = sum(grupo['filas'] for grupo in particion['grupos'])
+            self.stdout.write(f"{particion['directorio']}: {filas} meses en {len(particion['grupos'])} grupos")
+        self.stdout.write(f"Exportación ({manifiesto['formato']}) escrita en {options['directorio']}")
@@ -0,0 +1,332 @@
+# comparador/management/commands/prueba_carga.py
+"""
+Prueba de carga de la vista del comparador.
+
+Levanta un servidor falso de la API de datos.gob.ar y la app en un servidor WSGI local (un "worker" con
+hilos) en un subproceso, reproduce una mezcla de POSTs sobre las fuentes 1/2/3 y todas las regiones con la
+concurrencia pedida, y reporta throughput, percentiles de latencia, crecimiento de RSS del worker y errores.
+
+El worker corre en su propio proceso para que el RSS medido sea solo el suyo (sin los clientes ni la API
+falsa), como el de un worker de gunicorn, y con el registro de comparaciones desactivado
+(COMPARADOR_REGISTRO_COMPARACIONES=False) para no medir las escrituras en la base.
+
+Uso:
+    python manage.py prueba_carga --pedidos 2000 --concurrencia 8 --salida carga.json
+
+Con la misma --semilla la secuencia de pedidos es idéntica, así que los JSON de distintos commits
+son comparables.
+"""
+import argparse
+import http.cookiejar
+import json
+import os
+import random
+import re
+import socketserver
+import subprocess
+import sys
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from wsgiref.simple_server import WSGIRequestHandler, WSGIServer, make_server
+
+import numpy as np
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.core.wsgi import get_wsgi_application
+
+from comparador.domain.fuentes import REGIONES, fuentes_registradas
+
+
+def rss_kb(pid):
+    """
+    RSS actual de un proceso en KB, leído de /proc (Linux). None si no está disponible.
+    """
+    try:
+        with open(f'/proc/{pid}/status') as status:
+            for linea in status:
+                if linea.startswith('VmRSS:'):
+                    return int(linea.split()[1])
+    except OSError:
+        pass
+    return None
+
+
+class _ServidorWSGIConHilos(socketserver.ThreadingMixIn, WSGIServer):
+    daemon_threads = True
+
+
+class _HandlerSilencioso(WSGIRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+
+def _serie_api_falsa():
+    """
+    Serie mensual sintética con el formato de datos.gob.ar: Dic 2016 = 100 y ~3% mensual.
+    """
+    datos = []
+    valor = 100.0
+    for mes in range(2016 * 12 + 11, 2025 * 12 + 12):
+        datos.append([f"{mes // 12}-{mes % 12 + 1:02d}-01", round(valor, 4)])
+        valor *= 1.03
+    return datos
+
+
+def servidor_api_falso(latencia=0.0, tasa_errores=0.0):
+    """
+    Arranca en un hilo un servidor HTTP que imita /series/api/series de datos.gob.ar.
+
+    Args:
+        latencia (float): Segundos de demora agregados a cada respuesta.
+        tasa_errores (float): Proporción de respuestas 500 (0 a 1).
+
+    Returns:
+        ThreadingHTTPServer: Servidor en ejecución (llamar a shutdown() al terminar).
+    """
+    serie = _serie_api_falsa()
+    azar = random.Random(0)
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if latencia:
+                time.sleep(latencia)
+            if azar.random() < tasa_errores:
+                self.send_error(500)
+                return
+            params = urllib.parse.parse_qs(urllib.parse.urlparse(self.path).query)
+            desde = params.get('start_date', [''])[0]
+            hasta = params.get('end_date', ['9999'])[0]
+            limite = int(params.get('limit', ['100'])[0])
+            filas = [fila for fila in serie if desde <= fila[0] <= hasta][:limite]
+            cuerpo = json.dumps({'data': filas, 'count': len(filas), 'meta': []}).encode()
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(cuerpo)))
+            self.end_headers()
+            self.wfile.write(cuerpo)
+
+        def log_message(self, format, *args):
+            pass
+
+    servidor = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    servidor.daemon_threads = True
+    threading.Thread(target=servidor.serve_forever, daemon=True).start()
+    return servidor
+
+
+def servir(puerto):
+    """
+    El worker: sirve la app con el servidor WSGI con hilos hasta que lo terminen. Anuncia el puerto
+    en la primera línea de stdout ("PUERTO <n>") para el proceso que lo lanzó.
+    """
+    if '127.0.0.1' not in settings.ALLOWED_HOSTS and '*' not in settings.ALLOWED_HOSTS:
+        settings.ALLOWED_HOSTS.append('127.0.0.1')
+    servidor = make_server('127.0.0.1', puerto, get_wsgi_application(),
+                           server_class=_ServidorWSGIConHilos, handler_class=_HandlerSilencioso)
+    print(f"PUERTO {servidor.server_port}", flush=True)
+    # Los diagnósticos de la app no se leen: se descartan para que el pipe no se llene
+    sys.stdout = open(os.devnull, 'w')
+    servidor.serve_forever()
+
+
+def lanzar_worker(url_api, timeout=60):
+    """
+    Lanza 'manage.py prueba_carga --servir 0' en un subproceso apuntado a la API falsa y sin registro de
+    comparaciones, y espera a que anuncie su puerto.
+
+    Returns:
+        tuple: (subprocess.Popen, URL de la app)
+    """
+    entorno = dict(os.environ, COMPARADOR_API_URL=url_api, COMPARADOR_REGISTRO_COMPARACIONES='False')
+    proceso = subprocess.Popen([sys.executable, os.path.join(settings.BASE_DIR, 'manage.py'), 'prueba_carga', '--servir', '0'],
+                               env=entorno, stdout=subprocess.PIPE, text=True)
+    resultado = {}
+    lector = threading.Thread(target=lambda: resultado.update(linea=proceso.stdout.readline()), daemon=True)
+    lector.start()
+    lector.join(timeout)
+    coincidencia = re.match(r'PUERTO (\d+)', resultado.get('linea') or '')
+    if not coincidencia:
+        proceso.kill()
+        raise CommandError(f"El worker no arrancó en {timeout} s (código de salida: {proceso.poll()}).")
+    return proceso, f"http://127.0.0.1:{coincidencia.group(1)}/"
+
+
+def generar_pedidos(cantidad, semilla, pesos_fuentes):
+    """
+    Genera una lista reproducible de formularios POST con fuentes, regiones, fechas y sueldos variados.
+    """
+    azar = random.Random(semilla)
+    codigos = list(pesos_fuentes)
+    pesos = [pesos_fuentes[codigo] for codigo in codigos]
+    por_codigo = {fuente.codigo: fuente for fuente in fuentes_registradas()}
+    pedidos = []
+    for _ in range(cantidad):
+        fuente = por_codigo[azar.choices(codigos, pesos)[0]]
+        # Rango común a todas las fuentes (el Excel y la API empiezan en 2017)
+        mes_inicio = azar.randrange(2017 * 12, 2025 * 12 + 6)
+        mes_fin = azar.randrange(mes_inicio, 2025 * 12 + 7)
+        sueldo_inicial = azar.randrange(100, 2000) * 1000
+        pedidos.append({
+            'source_choice': fuente.codigo,
+            'region_choice': azar.choice(list(REGIONES)) if fuente.requiere_region else '',
+            'sueldo_inicial': str(sueldo_inicial),
+            'fecha_sueldo_inicial': f"{mes_inicio // 12}-{mes_inicio % 12 + 1:02d}",
+            'sueldo_final': str(int(sueldo_inicial * azar.uniform(1.0, 20.0))),
+            'fecha_sueldo_final': f"{mes_fin // 12}-{mes_fin % 12 + 1:02d}",
+        })
+    return pedidos
+
+
+class Cliente:
+    """
+    Cliente HTTP con cookies: obtiene el token CSRF con un GET y luego envía POSTs como un navegador.
+    """
+    def __init__(self, url):
+        self.url = url
+        self.opener = urllib.request.build_opener(urllib.request.HTTPCookieProcessor(http.cookiejar.CookieJar()))
+        with self.opener.open(url, timeout=30) as respuesta:
+            html = respuesta.read().decode()
+        self.token = re.search(r'name="csrfmiddlewaretoken" value="([^"]+)"', html).group(1)
+
+    def enviar(self, formulario):
+        datos = urllib.parse.urlencode(dict(formulario, csrfmiddlewaretoken=self.token)).encode()
+        pedido = urllib.request.Request(self.url, data=datos, headers={'Referer': self.url})
+        inicio = time.perf_counter()
+        try:
+            with self.opener.open(pedido, timeout=60) as respuesta:
+                html = respuesta.read().decode()
+                estado = respuesta.status
+        except urllib.error.HTTPError as e:
+            html, estado = '', e.code
+        except (urllib.error.URLError, OSError):
+            html, estado = '', 0
+        latencia = time.perf_counter() - inicio
+        # La vista responde 200 también con errores de cálculo: se distinguen por el mensaje en la página
+        error_vista = 'class="error-message"' in html and 'Advertencia' not in html
+        return latencia, estado, error_vista
+
+
+class Command(BaseCommand):
+    help = "Prueba de carga de la vista del comparador con un servidor falso de datos.gob.ar."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--pedidos', type=int, default=500, help="Cantidad de POSTs a enviar.")
+        parser.add_argument('--concurrencia', type=int, default=4, help="Clientes simultáneos.")
+        parser.add_argument('--calentamiento', type=int, default=10, help="Pedidos previos no medidos.")
+        parser.add_argument('--semilla', type=int, default=42, help="Semilla de la mezcla de pedidos.")
+        parser.add_argument('--mezcla', default='1:1,2:1,3:2',
+                            help="Pesos por fuente 'codigo:peso,...' (por defecto 1:1,2:1,3:2).")
+        parser.add_argument('--latencia-api', type=float, default=0.0, help="Demora (s) del servidor falso de la API.")
+        parser.add_argument('--errores-api', type=float, default=0.0, help="Proporción de respuestas 500 de la API falsa.")
+        parser.add_argument('--url', help="URL de un servidor ya levantado (no se mide su RSS ni se usa la API falsa).")
+        parser.add_argument('--salida', help="Archivo JSON donde guardar el reporte.")
+        parser.add_argument('--servir', type=int, help=argparse.SUPPRESS) # Uso interno: el subproceso worker
+
+    def handle(self, *args, **options):
+        if options['servir'] is not None:
+            servir(options['servir'])
+            return
+        try:
+            pesos = {codigo: float(peso) for codigo, peso in
+                     (par.split(':') for par in options['mezcla'].split(','))}
+        except ValueError:
+            raise CommandError("--mezcla debe tener el formato 'codigo:peso,codigo:peso'.")
+        registradas = {fuente.codigo for fuente in fuentes_registradas()}
+        if not set(pesos) <= registradas:
+            raise CommandError(f"Fuentes desconocidas en --mezcla: {', '.join(sorted(set(pesos) - registradas))}")
+
+        worker = servidor_api = None
+        url = options['url']
+        try:
+            if not url:
+                servidor_api = servidor_api_falso(options['latencia_api'], options['errores_api'])
+                worker, url = lanzar_worker(f"http://127.0.0.1:{servidor_api.server_port}/series/api/series")
+            reporte = self._ejecutar(url, options, pesos, pid_worker=worker.pid if worker else None)
+        finally:
+            if worker:
+                worker.terminate()
+                worker.wait(10)
+            if servidor_api:
+                servidor_api.shutdown()
+
+        self._imprimir(reporte)
+        if options['salida']:
+            with open(options['salida'], 'w', encoding='utf-8') as archivo:
+                json.dump(reporte, archivo, indent=2, ensure_ascii=False)
+            self.stdout.write(f"Reporte guardado en {options['salida']}")
+
+    def _ejecutar(self, url, options, pesos, pid_worker):
+        concurrencia = options['concurrencia']
+        pedidos = generar_pedidos(options['pedidos'] + options['calentamiento'], options['semilla'], pesos)
+        calentamiento, medidos = pedidos[:options['calentamiento']], pedidos[options['calentamiento']:]
+
+        clientes = [Cliente(url) for _ in range(concurrencia)]
+        # Los pedidos de calentamiento cargan las fuentes; el RSS inicial se toma después
+        for i, formulario in enumerate(calentamiento):
+            clientes[i % concurrencia].enviar(formulario)
+        rss_inicial = rss_kb(pid_worker) if pid_worker else None
+
+        def trabajar(indice):
+            cliente = clientes[indice]
+            return [cliente.enviar(formulario) for formulario in medidos[indice::concurrencia]]
+
+        inicio = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrencia) as executor:
+            resultados = [r for parcial in executor.map(trabajar, range(concurrencia)) for r in parcial]
+        duracion = time.perf_counter() - inicio
+        rss_final = rss_kb(pid_worker) if pid_worker else None
+
+        latencias = np.array([latencia for latencia, _, _ in resultados]) * 1000
+        errores_http = sum(1 for _, estado, _ in resultados if estado != 200)
+        errores_vista = sum(1 for _, estado, error in resultados if estado == 200 and error)
+
+        return {
+            'commit': self._commit_actual(),
+            'parametros': {clave: options[clave] for clave in
+                           ('pedidos', 'concurrencia', 'calentamiento', 'semilla', 'mezcla', 'latencia_api', 'errores_api')},
+            'duracion_s': round(duracion, 3),
+            'throughput_rps': round(len(resultados) / duracion, 2) if duracion else None,
+            'latencia_ms': {
+                'p50': round(float(np.percentile(latencias, 50)), 2),
+                'p90': round(float(np.percentile(latencias, 90)), 2),
+                'p95': round(float(np.percentile(latencias, 95)), 2),
+                'p99': round(float(np.percentile(latencias, 99)), 2),
+                'max': round(float(latencias.max()), 2),
+            } if len(latencias) else {},
+            'errores_http': errores_http,
+            'errores_vista': errores_vista,
+            'tasa_errores': round((errores_http + errores_vista) / len(resultados), 4) if resultados else 0,
+            'rss_kb': {
+                'pid': pid_worker,
+                'inicial': rss_inicial,
+                'final': rss_final,
+                'crecimiento': rss_final - rss_inicial,
+            } if rss_inicial is not None and rss_final is not None else None,
+        }
+
+    @staticmethod
+    def _commit_actual():
+        try:
+            return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                                  cwd=settings.BASE_DIR, timeout=5).stdout.strip() or None
+        except (OSError, subprocess.SubprocessError):
+            return None
+
+    def _imprimir(self, reporte):
+        self.stdout.write(f"Commit: {reporte['commit']}")
+        self.stdout.write(f"Duración: {reporte['duracion_s']} s - Throughput: {reporte['throughput_rps']} pedidos/s")
+        latencia = reporte['latencia_ms']
+        if latencia:
+            self.stdout.write(
+                f"Latencia (ms): p50={latencia['p50']} p90={latencia['p90']} p95={latencia['p95']} "
+                f"p99={latencia['p99']} max={latencia['max']}")
+        self.stdout.write(
+            f"Errores: HTTP={reporte['errores_http']} vista={reporte['errores_vista']} (tasa {reporte['tasa_errores']:.2%})")
+        if reporte['rss_kb']:
+            rss = reporte['rss_kb']
+            self.stdout.write(f"RSS del worker (pid {rss['pid']}, KB): inicial={rss['inicial']} final={rss['final']} crecimiento={rss['crecimiento']}")
@@ -0,0 +1,288 @@
+# comparador/management/commands/verificar_calculos.py
+"""
+Oráculo diferencial de los cálculos del comparador.
+
+Genera muchas comparaciones al azar (fuente, región, fecha de publicación, meses y sueldos, incluyendo
+meses fuera de la serie para ejercitar las contingencias de asof() en los bordes) y calcula cada una con
+el camino original —calcular_inflacion_periodo más el bloque de poder adquisitivo que tenía views.index,
+sobre el mismo DataFrame que este modifica— y con cada camino nuevo. Informa las diferencias que superan
+la tolerancia y, de la misma corrida, el throughput de cada camino.
+
+Uso:
+    python manage.py verificar_calculos --casos 5000 --semilla 1 --salida oraculo.json
+
+Diferencia conocida: calcular_inflacion_periodo busca la base en (fin del mes inicial) - DateOffset(months=1),
+que para meses más cortos que el anterior (febrero, abril, junio, septiembre, noviembre) cae antes del fin
+del mes anterior, y asof() devuelve el IPC de DOS meses antes. Los caminos nuevos usan el mes anterior,
+como dice la documentación de la función. Esas diferencias se verifican contra el cálculo original con la
+base corregida y se informan aparte; el comando termina con error solo si queda alguna sin explicar.
+"""
+import contextlib
+import io
+import json
+import os
+import random
+import time
+
+import numpy as np
+import pandas as pd
+from django.core.management.base import BaseCommand, CommandError
+
+from comparador.domain import meses
+from comparador.domain.calculo import calcular_comparaciones, comparar_meses
+from comparador.domain.dataset_vintage import obtener_indice
+from comparador.domain.fuentes import REGIONES, cargar_serie, fuentes_registradas
+from comparador.views import calcular_inflacion_periodo
+
+# Margen (en meses) antes del comienzo y después del final de cada serie en el que se sortean fechas
+MARGEN_MESES = 24
+
+
+def camino_original(df, columna, caso):
+    """
+    La comparación como la calculaba views.index antes de usar ordinales de mes.
+
+    Returns:
+        tuple: (inflación o None, incremento salarial, sueldo real ajustado o None)
+    """
+    df = df.copy(deep=False) # calcular_inflacion_periodo ordena y cambia el índice del DataFrame que recibe
+    fecha_inicial = meses.a_fecha(caso['mes_inicial'])
+    fecha_final = meses.a_fecha(caso['mes_final'])
+    sueldo_inicial, sueldo_final = caso['sueldo_inicial'], caso['sueldo_final']
+
+    inflacion = calcular_inflacion_periodo(df, fecha_inicial, fecha_final, columna)
+    if inflacion is None:
+        return None, None, None
+    incremento = ((sueldo_final - sueldo_inicial) / sueldo_inicial) * 100 if sueldo_inicial != 0 else 0
+
+    # Bloque de poder adquisitivo, sobre el df con índice a fin de mes que dejó calcular_inflacion_periodo
+    ipc_inicio_sueldo = df[columna].asof(fecha_inicial + pd.offsets.MonthEnd(0))
+    ipc_final_sueldo = df[columna].asof(fecha_final + pd.offsets.MonthEnd(0))
+    if pd.isna(ipc_inicio_sueldo) or pd.isna(ipc_final_sueldo) or ipc_inicio_sueldo == 0:
+        sueldo_real = None
+    else:
+        sueldo_real = sueldo_final / (ipc_final_sueldo / ipc_inicio_sueldo)
+    return inflacion, incremento, sueldo_real
+
+
+def inflacion_original_corregida(df, columna, caso):
+    """
+    calcular_inflacion_periodo (asof sobre fin de mes y las mismas contingencias) con la base en el fin
+    del mes anterior al inicial. Explica las diferencias de la base corrida un mes (ver arriba).
+    """
+    serie = df[columna].sort_index()
+    serie.index = serie.index.to_period('M').to_timestamp('M')
+    base = meses.a_fecha(caso['mes_inicial'] - 1) + pd.offsets.MonthEnd(0)
+    ipc_inicio = serie.asof(base)
+    if pd.isna(ipc_inicio):
+        posteriores = serie.index[serie.index >= base]
+        if posteriores.empty:
+            return None
+        ipc_inicio = serie[posteriores.min()]
+    ipc_fin = serie.asof(meses.a_fecha(caso['mes_final']) + pd.offsets.MonthEnd(0))
+    if pd.isna(ipc_fin) or ipc_inicio == 0:
+        return None
+    return (ipc_fin / ipc_inicio - 1) * 100
+
+
+def _opcional(valor):
+    return None if np.isnan(valor) else float(valor)
+
+
+def camino_comparar_meses(df, columna, caso):
+    """
+    El cálculo de views.index: comparar_meses sobre ordinales de mes, una comparación por llamada.
+    """
+    meses_serie, valores_serie = meses.de_serie(df, columna)
+    resultado = comparar_meses(meses_serie, valores_serie, [caso['mes_inicial']], [caso['mes_final']],
+                               [caso['sueldo_inicial']], [caso['sueldo_final']])
+    inflacion = _opcional(resultado['inflacion_acumulada'][0])
+    if inflacion is None:
+        return None, None, None
+    return inflacion, float(resultado['incremento_salarial'][0]), _opcional(resultado['sueldo_real_ajustado'][0])
+
+
+def lote_calcular_comparaciones(df, columna, casos):
+    """
+    El cálculo por lotes de main.py: calcular_comparaciones con todas las comparaciones de una serie juntas.
+    """
+    tabla = calcular_comparaciones(
+        df, [caso['mes_inicial'] for caso in casos], [caso['mes_final'] for caso in casos],
+        [caso['sueldo_inicial'] for caso in casos], [caso['sueldo_final'] for caso in casos], columna)
+    resultados = []
+    for inflacion, incremento, sueldo_real in zip(tabla['inflacion_acumulada'], tabla['incremento_salarial'],
+                                                  tabla['sueldo_real_ajustado']):
+        if np.isnan(inflacion):
+            resultados.append((None, None, None))
+        else:
+            resultados.append((float(inflacion), float(incremento), _opcional(sueldo_real)))
+    return resultados
+
+
+# Caminos a verificar contra camino_original: nombre -> (función, si recibe todos los casos de una serie juntos)
+CAMINOS = {
+    'comparar_meses': (camino_comparar_meses, False),
+    'calcular_comparaciones': (lote_calcular_comparaciones, True),
+}
+
+CAMPOS = ('inflacion_acumulada', 'incremento_salarial', 'sueldo_real_ajustado')
+
+
+def _clase(inflacion, incremento):
+    # Lo que ve el usuario: ganó, perdió o empató (views.index)
+    if inflacion is None:
+        return None
+    return 'gano' if incremento > inflacion else 'perdio' if incremento < inflacion else 'empato'
+
+
+def _iguales(a, b, tolerancia):
+    if a is None or b is None:
+        return a is b
+    return abs(a - b) <= tolerancia * max(1.0, abs(a))
+
+
+def comparar_resultados(esperado, obtenido, tolerancia):
+    """
+    Campos que difieren entre dos resultados (None solo coincide con None), con error relativo
+    mayor a 'tolerancia', o cuya clase de resultado mostrada (ganó/perdió/empató) no coincide.
+    """
+    diferencias = [campo for campo, a, b in zip(CAMPOS, esperado, obtenido) if not _iguales(a, b, tolerancia)]
+    if _clase(esperado[0], esperado[1]) != _clase(obtenido[0], obtenido[1]) and not diferencias:
+        diferencias.append('resultado')
+    return diferencias
+
+
+class Command(BaseCommand):
+    help = ("Compara el cálculo original de la inflación y el poder adquisitivo con los caminos nuevos "
+            "sobre comparaciones generadas al azar, e informa diferencias y throughput.")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--casos', type=int, default=2000, help="Comparaciones a generar.")
+        parser.add_argument('--semilla', type=int, default=0, help="Semilla del generador.")
+        parser.add_argument('--tolerancia', type=float, default=1e-9, help="Error relativo máximo aceptado.")
+        parser.add_argument('--fuentes', help="Códigos de fuente separados por coma (por defecto todas las locales, sin la API).")
+        parser.add_argument('--vintages', type=float, default=0.2,
+                            help="Proporción de casos Excel con fecha de publicación (0 a 1).")
+        parser.add_argument('--mostrar', type=int, default=10, help="Diferencias a listar.")
+        parser.add_argument('--salida', help="Archivo JSON donde guardar el reporte.")
+
+    def _series(self, pedidas, proporcion_vintages):
+        """
+        Sortea las series a usar: (codigo, region, fecha_vintage) -> (df, columna, nombre).
+        """
+        series = {}
+        for fuente in fuentes_registradas():
+            if (pedidas is None and fuente.tipo == 'api') or (pedidas is not None and fuente.codigo not in pedidas):
+                continue
+            regiones = list(REGIONES.values()) if fuente.requiere_region else [None]
+            vintages = [None]
+            if fuente.requiere_region and proporcion_vintages > 0:
+                with contextlib.redirect_stdout(io.StringIO()):
+                    vintages += [meses.a_fecha(int(vintage)) for vintage in obtener_indice(os.path.dirname(fuente.ruta)).vintages]
+            for region_name in regiones:
+                for vintage in vintages:
+                    with contextlib.redirect_stdout(io.StringIO()):
+                        df, columna, _ = cargar_serie(fuente.codigo, region_name, vintage)
+                    if df is None or df.empty:
+                        continue
+                    series[(fuente.codigo, region_name, vintage)] = (df, columna, fuente.source_name(region_name, vintage))
+        if not series:
+            raise CommandError("No hay series para verificar.")
+        return series
+
+    def handle(self, *args, **options):
+        rng = random.Random(options['semilla'])
+        pedidas = set(options['fuentes'].split(',')) if options['fuentes'] else None
+        series = self._series(pedidas, options['vintages'])
+        claves = sorted(series, key=lambda clave: (clave[0], clave[1] or '', clave[2] or pd.Timestamp(0)))
+        actuales = [clave for clave in claves if clave[2] is None]
+        con_vintage = [clave for clave in claves if clave[2] is not None]
+
+        # --- Casos: meses sorteados alrededor del rango de cada serie, sueldos con algunos ceros y empates ---
+        casos_por_serie = {clave: [] for clave in claves}
+        for _ in range(options['casos']):
+            clave = rng.choice(con_vintage if con_vintage and rng.random() < options['vintages'] else actuales)
+            df, columna, _ = series[clave]
+            meses_serie = meses.desde_fechas(df.index)
+            desde, hasta = int(meses_serie.min()) - MARGEN_MESES, int(meses_serie.max()) + MARGEN_MESES
+            mes_inicial = rng.randint(desde, hasta)
+            mes_final = rng.randint(mes_inicial, hasta) if rng.random() < 0.9 else rng.randint(desde, hasta)
+            sueldo_inicial = round(10 ** rng.uniform(2, 7), 2) if rng.random() > 0.02 else 0.0
+            sueldo_final = round(sueldo_inicial * 10 ** rng.uniform(-0.5, 2), 2) if rng.random() > 0.05 else sueldo_inicial
+            casos_por_serie[clave].append({'mes_inicial': mes_inicial, 'mes_final': mes_final,
+                                           'sueldo_inicial': sueldo_inicial, 'sueldo_final': sueldo_final})
+
+        # --- Camino original (con su diagnóstico por print descartado) ---
+        esperados = {}
+        inicio = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            for clave, casos in casos_por_serie.items():
+                df, columna, _ = series[clave]
+                esperados[clave] = [camino_original(df, columna, caso) for caso in casos]
+        tiempos = {'original': time.perf_counter() - inicio}
+
+        # --- Caminos nuevos, comparados caso por caso ---
+        diferencias = []
+        contadores = {}
+        conocidas = {}
+        for nombre, (camino, en_lote) in CAMINOS.items():
+            inicio = time.perf_counter()
+            obtenidos = {}
+            for clave, casos in casos_por_serie.items():
+                df, columna, _ = series[clave]
+                if en_lote:
+                    obtenidos[clave] = camino(df, columna, casos) if casos else []
+                else:
+                    obtenidos[clave] = [camino(df, columna, caso) for caso in casos]
+            tiempos[nombre] = time.perf_counter() - inicio
+
+            contadores[nombre] = 0
+            conocidas[nombre] = 0
+            for clave, casos in casos_por_serie.items():
+                df, columna, _ = series[clave]
+                for caso, esperado, obtenido in zip(casos, esperados[clave], obtenidos[clave]):
+                    campos = comparar_resultados(esperado, obtenido, options['tolerancia'])
+                    if campos and set(campos) <= {'inflacion_acumulada', 'resultado'} and _iguales(
+                            inflacion_original_corregida(df, columna, caso), obtenido[0], options['tolerancia']):
+                        conocidas[nombre] += 1 # Base corrida un mes en el camino original
+                    elif campos:
+                        contadores[nombre] += 1
+                        diferencias.append({
+                            'camino': nombre, 'serie': series[clave][2], 'campos': campos,
+                            'mes_inicial': meses.texto(caso['mes_inicial']), 'mes_final': meses.texto(caso['mes_final']),
+                            'sueldo_inicial': caso['sueldo_inicial'], 'sueldo_final': caso['sueldo_final'],
+                            'esperado': esperado, 'obtenido': obtenido,
+                        })
+
+        # --- Reporte ---
+        total = sum(len(casos) for casos in casos_por_serie.values())
+        sin_inflacion = sum(esperado[0] is None for resultados in esperados.values() for esperado in resultados)
+        reporte = {
+            'casos': total,
+            'series': len([clave for clave, casos in casos_por_serie.items() if casos]),
+            'casos_sin_inflacion': sin_inflacion,
+            'tolerancia': options['tolerancia'],
+            'diferencias': contadores,
+            'diferencias_conocidas_base': conocidas,
+            'throughput': {nombre: {'segundos': round(segundos, 4),
+                                    'casos_por_segundo': round(total / segundos, 1) if segundos else None}
+                           for nombre, segundos in tiempos.items()},
+            'ejemplos': diferencias[:options['mostrar']],
+        }
+
+        self.stdout.write(f"{total} casos sobre {reporte['series']} series ({sin_inflacion} sin inflación calculable)")
+        for nombre, datos in reporte['throughput'].items():
+            detalle = '' if nombre == 'original' else (f", {contadores[nombre]} diferencias sin explicar,"
+                                                       f" {conocidas[nombre]} por la base del original")
+            self.stdout.write(f"  {nombre:<24} {datos['casos_por_segundo']:>12} casos/s{detalle}")
+        for diferencia in reporte['ejemplos']:
+            self.stdout.write(f"  ! {diferencia['camino']} {diferencia['serie']} {diferencia['mes_inicial']}..{diferencia['mes_final']} "
+                              f"{diferencia['campos']}: esperado {diferencia['esperado']}, obtenido {diferencia['obtenido']}")
+
+        if options['salida']:
+            with open(options['salida'], 'w', encoding='utf-8') as archivo:
+                json.dump(reporte, archivo, ensure_ascii=False, indent=2)
+
+        if diferencias:
+            raise CommandError(f"{len(diferencias)} diferencias por encima de la tolerancia.")
+        self.stdout.write(self.style.SUCCESS("Sin diferencias."))
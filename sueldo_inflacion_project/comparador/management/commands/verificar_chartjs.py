@@ -0,0 +1,22 @@
+# comparador/management/commands/verificar_chartjs.py
+import hashlib
+
+from django.conf import settings
+from django.contrib.staticfiles import finders
+from django.core.management.base import BaseCommand, CommandError
+
+
+class Command(BaseCommand):
+    help = ("Verifica que el Chart.js versionado en los estáticos de la app (settings.COMPARADOR_CHARTJS_RUTA) "
+            "coincida con el SHA-256 fijado en settings.COMPARADOR_CHARTJS_SHA256. Falla si falta o no coincide.")
+
+    def handle(self, *args, **options):
+        ruta = finders.find(settings.COMPARADOR_CHARTJS_RUTA)
+        if not ruta:
+            raise CommandError(f"No se encontró {settings.COMPARADOR_CHARTJS_RUTA} en los estáticos de las apps.")
+        with open(ruta, 'rb') as archivo:
+            digest = hashlib.sha256(archivo.read()).hexdigest()
+        if digest != settings.COMPARADOR_CHARTJS_SHA256:
+            raise CommandError(f"El SHA-256 de {ruta} ({digest}) no coincide con COMPARADOR_CHARTJS_SHA256 "
+                               f"({settings.COMPARADOR_CHARTJS_SHA256}).")
+        self.stdout.write(self.style.SUCCESS(f"Chart.js {settings.COMPARADOR_CHARTJS_VERSION} verificado ({digest})."))
@@ -0,0 +1,104 @@
+# comparador/middleware.py
+import gc
+import logging
+import threading
+import time
+import tracemalloc
+from collections import deque
+
+import pandas as pd
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+
+logger = logging.getLogger('comparador.memoria')
+
+# Últimos pedidos perfilados (los consulta la vista de debug)
+REGISTROS = deque(maxlen=100)
+
+# tracemalloc es global al proceso: con varios hilos las asignaciones de pedidos simultáneos
+# se mezclarían, así que los pedidos perfilados se procesan de a uno.
+_lock = threading.Lock()
+
+_FILTROS = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+    tracemalloc.Filter(False, "<unknown>"),
+)
+
+
+def contar_objetos_pandas():
+    """
+    Cantidad de DataFrames y Series vivos en el proceso.
+    """
+    dataframes = series = 0
+    for objeto in gc.get_objects():
+        if isinstance(objeto, pd.DataFrame):
+            dataframes += 1
+        elif isinstance(objeto, pd.Series):
+            series += 1
+    return dataframes, series
+
+
+class PerfilMemoriaMiddleware:
+    """
+    Perfilado opcional de memoria por pedido (activar con COMPARADOR_PERFIL_MEMORIA=True).
+
+    Para cada pedido registra el pico de memoria asignada, el neto que quedó vivo, la variación
+    en la cantidad de DataFrames/Series y los sitios (archivo:línea) que más memoria asignaron.
+    Los registros se escriben en el logger 'comparador.memoria' y se consultan en /debug/memoria/.
+    """
+    def __init__(self, get_response):
+        if not getattr(settings, 'COMPARADOR_PERFIL_MEMORIA', False):
+            raise MiddlewareNotUsed()
+        self.get_response = get_response
+        self.top = getattr(settings, 'COMPARADOR_PERFIL_TOP', 10)
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(getattr(settings, 'COMPARADOR_PERFIL_FRAMES', 1))
+
+    def __call__(self, request):
+        if request.path.startswith('/static/') or request.path.endswith('/debug/memoria/'):
+            return self.get_response(request)
+
+        with _lock:
+            dataframes_antes, series_antes = contar_objetos_pandas()
+            antes = tracemalloc.take_snapshot().filter_traces(_FILTROS)
+            actual_antes, _ = tracemalloc.get_traced_memory()
+            tracemalloc.reset_peak()
+            inicio = time.perf_counter()
+
+            response = self.get_response(request)
+
+            duracion = time.perf_counter() - inicio
+            actual_despues, pico = tracemalloc.get_traced_memory()
+            despues = tracemalloc.take_snapshot().filter_traces(_FILTROS)
+            dataframes_despues, series_despues = contar_objetos_pandas()
+
+        diferencias = despues.compare_to(antes, 'lineno')
+        diferencias.sort(key=lambda estadistica: estadistica.size_diff, reverse=True)
+        registro = {
+            'metodo': request.method,
+            'ruta': request.path,
+            'estado': response.status_code,
+            'duracion_ms': round(duracion * 1000, 2),
+            'pico_kb': round((pico - actual_antes) / 1024, 1),
+            'neto_kb': round((actual_despues - actual_antes) / 1024, 1),
+            'dataframes': dataframes_despues - dataframes_antes,
+            'series': series_despues - series_antes,
+            'top': [
+                {
+                    'sitio': f"{estadistica.traceback[0].filename}:{estadistica.traceback[0].lineno}",
+                    'kb': round(estadistica.size_diff / 1024, 1),
+                    'bloques': estadistica.count_diff,
+                }
+                for estadistica in diferencias[:self.top] if estadistica.size_diff > 0
+            ],
+        }
+        REGISTROS.append(registro)
+        logger.info(
+            "%s %s: pico=%.1fKB neto=%.1fKB DataFrames=%+d Series=%+d top=%s",
+            registro['metodo'], registro['ruta'], registro['pico_kb'], registro['neto_kb'],
+            registro['dataframes'], registro['series'],
+            ", ".join(f"{sitio['sitio']} ({sitio['kb']}KB)" for sitio in registro['top'][:3]),
+        )
+        return response
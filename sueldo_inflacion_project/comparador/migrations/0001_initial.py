@@ -0,0 +1,55 @@
+# Generated by Django 5.2.3 on 2026-10-19 03:04
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RegistroComparacion',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('fecha_registro', models.DateTimeField(default=django.utils.timezone.now)),
+                ('fuente', models.CharField(max_length=20)),
+                ('region', models.CharField(blank=True, max_length=50)),
+                ('fecha_vintage', models.DateField(blank=True, null=True)),
+                ('mes_inicial', models.DateField()),
+                ('mes_final', models.DateField()),
+                ('sueldo_inicial', models.FloatField()),
+                ('sueldo_final', models.FloatField()),
+                ('inflacion_acumulada', models.FloatField()),
+                ('incremento_salarial', models.FloatField()),
+                ('diferencia', models.FloatField()),
+                ('resultado', models.CharField(choices=[('gano', 'Ganó'), ('perdio', 'Perdió'), ('empato', 'Empató')], max_length=6)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['fuente', 'region', 'mes_inicial'], name='registro_fuente_region_mes'), models.Index(fields=['fecha_registro'], name='registro_fecha')],
+            },
+        ),
+        migrations.CreateModel(
+            name='ResumenComparaciones',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('fuente', models.CharField(max_length=20)),
+                ('region', models.CharField(blank=True, max_length=50)),
+                ('mes_inicial', models.DateField()),
+                ('mes_final', models.DateField()),
+                ('comparaciones', models.PositiveIntegerField(default=0)),
+                ('ganadas', models.PositiveIntegerField(default=0)),
+                ('perdidas', models.PositiveIntegerField(default=0)),
+                ('empatadas', models.PositiveIntegerField(default=0)),
+                ('suma_diferencia', models.FloatField(default=0)),
+                ('ultima_consulta', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('fuente', 'region', 'mes_inicial', 'mes_final'), name='resumen_unico')],
+            },
+        ),
+    ]
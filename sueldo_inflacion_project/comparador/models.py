@@ -1,3 +1,62 @@
 from django.db import models
+from django.utils import timezone
 
-# Create your models here.
+
+class RegistroComparacion(models.Model):
+    """
+    Una comparación sueldo vs. inflación calculada en la web. Tabla de solo inserción: las filas
+    se escriben en lotes desde comparador/registro.py y nunca se actualizan.
+    """
+    RESULTADOS = [('gano', 'Ganó'), ('perdio', 'Perdió'), ('empato', 'Empató')]
+
+    fecha_registro = models.DateTimeField(default=timezone.now)
+    fuente = models.CharField(max_length=20)
+    region = models.CharField(max_length=50, blank=True) # Vacía para las fuentes sin región
+    fecha_vintage = models.DateField(null=True, blank=True)
+    mes_inicial = models.DateField() # Primer día del mes del sueldo inicial
+    mes_final = models.DateField()
+    sueldo_inicial = models.FloatField()
+    sueldo_final = models.FloatField()
+    inflacion_acumulada = models.FloatField()
+    incremento_salarial = models.FloatField()
+    diferencia = models.FloatField() # Incremento salarial menos inflación, en puntos porcentuales
+    resultado = models.CharField(max_length=6, choices=RESULTADOS)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['fuente', 'region', 'mes_inicial'], name='registro_fuente_region_mes'),
+            models.Index(fields=['fecha_registro'], name='registro_fecha'),
+        ]
+
+    def __str__(self):
+        return f"{self.fuente}/{self.region or '-'} {self.mes_inicial:%Y-%m} a {self.mes_final:%Y-%m}: {self.resultado}"
+
+
+class ResumenComparaciones(models.Model):
+    """
+    Agregados precalculados de RegistroComparacion por fuente, región y período consultado.
+    Se actualizan incrementalmente en la misma transacción que inserta cada lote de registros,
+    así las consultas de tablero leen esta tabla chica en lugar de recorrer los registros.
+    """
+    fuente = models.CharField(max_length=20)
+    region = models.CharField(max_length=50, blank=True)
+    mes_inicial = models.DateField()
+    mes_final = models.DateField()
+    comparaciones = models.PositiveIntegerField(default=0)
+    ganadas = models.PositiveIntegerField(default=0)
+    perdidas = models.PositiveIntegerField(default=0)
+    empatadas = models.PositiveIntegerField(default=0)
+    suma_diferencia = models.FloatField(default=0) # Para el promedio: suma_diferencia / comparaciones
+    ultima_consulta = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['fuente', 'region', 'mes_inicial', 'mes_final'], name='resumen_unico'),
+        ]
+
+    @property
+    def diferencia_promedio(self):
+        return self.suma_diferencia / self.comparaciones if self.comparaciones else None
+
+    def __str__(self):
+        return f"{self.fuente}/{self.region or '-'} {self.mes_inicial:%Y-%m} a {self.mes_final:%Y-%m}: {self.comparaciones}"
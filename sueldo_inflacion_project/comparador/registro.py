@@ -0,0 +1,133 @@
+# comparador/registro.py
+"""
+Registro de las comparaciones calculadas en la web (modelos RegistroComparacion y ResumenComparaciones).
+
+views.index solo agrega el registro a un buffer en memoria; un hilo en segundo plano lo vacía cada
+COMPARADOR_REGISTRO_INTERVALO segundos (o antes, al juntar COMPARADOR_REGISTRO_LOTE registros) con un
+único bulk_create, y en la misma transacción suma el lote a los agregados de ResumenComparaciones.
+Es el único registro de comparaciones: la persistencia con DataSaver (COMPARADOR_GUARDAR_DB) solo guarda series.
+"""
+import atexit
+import logging
+import threading
+from collections import Counter, deque
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import F, Sum
+from django.utils import timezone
+
+from .models import RegistroComparacion, ResumenComparaciones
+
+logger = logging.getLogger('comparador.registro')
+
+# Registros pendientes; acotado para que una base caída no haga crecer la memoria sin límite
+_PENDIENTES = deque(maxlen=10000)
+_hay_pendientes = threading.Event()
+_lock = threading.Lock()
+_hilo = None
+
+
+def registrar_comparacion(registro):
+    """
+    Agrega una comparación al buffer sin tocar la base de datos.
+
+    Args:
+        registro (dict): Campos de RegistroComparacion (sin fecha_registro, que se toma ahora).
+    """
+    if not settings.COMPARADOR_REGISTRO_COMPARACIONES or registro is None:
+        return
+    _PENDIENTES.append(dict(registro, fecha_registro=timezone.now()))
+    if len(_PENDIENTES) >= settings.COMPARADOR_REGISTRO_LOTE:
+        _hay_pendientes.set()
+    _iniciar()
+
+
+def _iniciar():
+    global _hilo
+    if _hilo is None or not _hilo.is_alive():
+        with _lock:
+            if _hilo is None or not _hilo.is_alive():
+                _hilo = threading.Thread(target=_trabajar, name='comparador-registro', daemon=True)
+                _hilo.start()
+
+
+def _trabajar():
+    while True:
+        _hay_pendientes.wait(settings.COMPARADOR_REGISTRO_INTERVALO)
+        _hay_pendientes.clear()
+        try:
+            vaciar()
+        except Exception: # El hilo no debe morir: los registros del lote fallido se pierden
+            logger.exception("Error guardando el registro de comparaciones")
+        finally:
+            connection.close() # Conexión propia de este hilo
+
+
+def vaciar():
+    """
+    Escribe todos los registros pendientes. Devuelve la cantidad escrita.
+    """
+    lote = []
+    with _lock:
+        while _PENDIENTES:
+            lote.append(_PENDIENTES.popleft())
+    if lote:
+        guardar_lote(lote)
+    return len(lote)
+
+
+def guardar_lote(registros):
+    """
+    Inserta un lote de registros y actualiza incrementalmente sus agregados, todo en una transacción.
+    """
+    agregados = {}
+    for registro in registros:
+        clave = (registro['fuente'], registro['region'], registro['mes_inicial'], registro['mes_final'])
+        parcial = agregados.setdefault(clave, Counter())
+        parcial['comparaciones'] += 1
+        parcial[{'gano': 'ganadas', 'perdio': 'perdidas', 'empato': 'empatadas'}[registro['resultado']]] += 1
+        parcial['suma_diferencia'] += registro['diferencia']
+    ultima = max(registro['fecha_registro'] for registro in registros)
+
+    with transaction.atomic():
+        RegistroComparacion.objects.bulk_create([RegistroComparacion(**registro) for registro in registros])
+        for (fuente, region, mes_inicial, mes_final), parcial in agregados.items():
+            incrementos = {campo: F(campo) + valor for campo, valor in parcial.items()}
+            claves = {'fuente': fuente, 'region': region, 'mes_inicial': mes_inicial, 'mes_final': mes_final}
+            actualizadas = ResumenComparaciones.objects.filter(**claves).update(ultima_consulta=ultima, **incrementos)
+            if not actualizadas:
+                # get_or_create cubre la carrera con otro proceso que haya creado la fila recién
+                fila, creada = ResumenComparaciones.objects.get_or_create(
+                    defaults=dict(parcial, ultima_consulta=ultima), **claves)
+                if not creada:
+                    ResumenComparaciones.objects.filter(pk=fila.pk).update(ultima_consulta=ultima, **incrementos)
+
+
+def resumen(fuente=None, region=None):
+    """
+    Totales por fuente y región leídos de los agregados (para tableros).
+
+    Returns:
+        QuerySet: dicts con fuente, region, comparaciones, ganadas, perdidas, empatadas y suma_diferencia.
+    """
+    filas = ResumenComparaciones.objects.all()
+    if fuente is not None:
+        filas = filas.filter(fuente=fuente)
+    if region is not None:
+        filas = filas.filter(region=region)
+    return (filas.values('fuente', 'region')
+            .annotate(comparaciones=Sum('comparaciones'), ganadas=Sum('ganadas'), perdidas=Sum('perdidas'),
+                      empatadas=Sum('empatadas'), suma_diferencia=Sum('suma_diferencia'))
+            .order_by('fuente', 'region'))
+
+
+def _vaciar_al_salir():
+    # Al terminar el proceso se intenta escribir lo que quedó en el buffer
+    try:
+        vaciar()
+    except Exception:
+        logger.exception("Error guardando el registro de comparaciones al salir")
+
+
+atexit.register(_vaciar_al_salir)
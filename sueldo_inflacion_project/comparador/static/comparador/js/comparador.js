@@ -0,0 +1,211 @@
+// comparador/static/comparador/js/comparador.js
+// Formulario y gráficos de la página del comparador. Se carga con 'defer' después de Chart.js:
+// corre cuando el HTML ya está armado, así que no necesita esperar a DOMContentLoaded.
+// Los datos del gráfico llegan como JSON en <script id="datos-grafico"> (ver _grafico.html).
+
+function toggleRegionSelection() {
+    var sourceSelect = document.getElementById('source_choice');
+    var regionSelection = document.getElementById('region_selection');
+    if (sourceSelect.options[sourceSelect.selectedIndex].dataset.requiereRegion === '1') { // Si la fuente es por región (Excel)
+        regionSelection.classList.remove('hidden');
+        document.getElementById('region_choice').setAttribute('required', 'required');
+    } else {
+        regionSelection.classList.add('hidden');
+        document.getElementById('region_choice').removeAttribute('required');
+    }
+}
+
+function toggleCanasta() {
+    var canasta = document.getElementById('canasta_divisiones');
+    if (document.getElementById('canasta_personal').checked) {
+        canasta.classList.remove('hidden');
+    } else {
+        canasta.classList.add('hidden');
+    }
+}
+
+// Barras: incremento salarial vs. inflación acumulada, en % (números, sin formato)
+function graficoComparacion(datos) {
+    const canvas = document.getElementById('myComparisonChart');
+    if (!canvas || typeof datos.incremento_salarial !== 'number' || typeof datos.inflacion_acumulada !== 'number') {
+        return;
+    }
+    new Chart(canvas.getContext('2d'), {
+        type: 'bar',
+        data: {
+            labels: ['Comparación'], // Una etiqueta para ambos valores
+            datasets: [
+                {
+                    label: 'Incremento Salarial (%)',
+                    data: [datos.incremento_salarial],
+                    backgroundColor: 'rgba(54, 162, 235, 0.7)', // Azul
+                    borderColor: 'rgba(54, 162, 235, 1)',
+                    borderWidth: 1
+                },
+                {
+                    label: 'Inflación Acumulada (%)',
+                    data: [datos.inflacion_acumulada],
+                    backgroundColor: 'rgba(255, 99, 132, 0.7)', // Rojo
+                    borderColor: 'rgba(255, 99, 132, 1)',
+                    borderWidth: 1
+                }
+            ]
+        },
+        options: {
+            responsive: true,
+            plugins: {
+                title: {
+                    display: true,
+                    text: 'Incremento Salarial vs. Inflación Acumulada',
+                    font: {
+                        size: 18
+                    }
+                },
+                tooltip: {
+                    callbacks: {
+                        label: function(context) {
+                            let label = context.dataset.label || '';
+                            if (label) {
+                                label += ': ';
+                            }
+                            if (context.parsed.y !== null) {
+                                label += context.parsed.y.toFixed(2) + '%';
+                            }
+                            return label;
+                        }
+                    }
+                }
+            },
+            scales: {
+                y: {
+                    beginAtZero: true,
+                    title: {
+                        display: true,
+                        text: 'Porcentaje (%)'
+                    },
+                    ticks: {
+                        callback: function(value) {
+                            return value + '%';
+                        }
+                    }
+                },
+                x: {
+                    grid: {
+                        display: false
+                    }
+                }
+            }
+        }
+    });
+}
+
+// Línea de tiempo: los valores llegan como diferencias de round(log10(valor) * escala), ver domain/linea_tiempo.py
+function decodificarLineaTiempo(datos) {
+    const anio = parseInt(datos.mes_inicial.slice(0, 4), 10);
+    const mes = parseInt(datos.mes_inicial.slice(5, 7), 10) - 1;
+    let ordinal = anio * 12 + mes;
+    const n = datos.indice.length;
+    const etiquetas = [];
+    for (let i = 0; i < n; i++) {
+        if (i > 0) {
+            ordinal += datos.pasos_meses ? datos.pasos_meses[i - 1] : 1;
+        }
+        etiquetas.push(Math.floor(ordinal / 12) + '-' + String(ordinal % 12 + 1).padStart(2, '0'));
+    }
+    const series = {};
+    for (const nombre of ['indice', 'sueldo_nominal', 'sueldo_real']) {
+        if (!datos[nombre]) {
+            continue;
+        }
+        let acumulado = 0;
+        series[nombre] = datos[nombre].map(function(delta) {
+            acumulado += delta;
+            return Math.pow(10, acumulado / datos.escala);
+        });
+    }
+    return {etiquetas: etiquetas, series: series};
+}
+
+function graficoLineaTiempo(url) {
+    const canvas = document.getElementById('graficoLineaTiempo');
+    if (!canvas || !url) {
+        return;
+    }
+    fetch(url)
+        .then(function(respuesta) { return respuesta.ok ? respuesta.json() : null; })
+        .then(function(datos) {
+            if (!datos) {
+                return;
+            }
+            const linea = decodificarLineaTiempo(datos);
+            const datasets = [{
+                label: 'Índice de precios (base 100)',
+                data: linea.series.indice,
+                borderColor: 'rgba(255, 99, 132, 1)',
+                pointRadius: 0,
+                yAxisID: 'y'
+            }];
+            if (linea.series.sueldo_nominal) {
+                datasets.push({
+                    label: 'Sueldo nominal (base 100)',
+                    data: linea.series.sueldo_nominal,
+                    borderColor: 'rgba(54, 162, 235, 1)',
+                    pointRadius: 0,
+                    yAxisID: 'y'
+                });
+                datasets.push({
+                    label: 'Sueldo real ($ del primer mes)',
+                    data: linea.series.sueldo_real,
+                    borderColor: 'rgba(75, 192, 192, 1)',
+                    borderDash: [5, 5],
+                    pointRadius: 0,
+                    yAxisID: 'y1'
+                });
+            }
+            new Chart(canvas.getContext('2d'), {
+                type: 'line',
+                data: {labels: linea.etiquetas, datasets: datasets},
+                options: {
+                    responsive: true,
+                    interaction: {mode: 'index', intersect: false},
+                    plugins: {
+                        title: {
+                            display: true,
+                            text: 'Índice de precios vs. Sueldo',
+                            font: {
+                                size: 18
+                            }
+                        }
+                    },
+                    scales: {
+                        y: {
+                            title: {display: true, text: 'Base 100'}
+                        },
+                        y1: {
+                            display: !!linea.series.sueldo_real,
+                            position: 'right',
+                            grid: {drawOnChartArea: false},
+                            title: {display: true, text: 'Pesos'}
+                        }
+                    }
+                }
+            });
+        });
+}
+
+(function() {
+    document.getElementById('source_choice').addEventListener('change', toggleRegionSelection);
+    document.getElementById('canasta_personal').addEventListener('change', toggleCanasta);
+    // Estado inicial (ej. al volver a la página con el formulario completo)
+    toggleRegionSelection();
+    toggleCanasta();
+
+    const elemento = document.getElementById('datos-grafico');
+    // Sin Chart.js (ej. la CDN de respaldo no respondió) solo se pierden los gráficos
+    if (!elemento || typeof Chart === 'undefined') {
+        return;
+    }
+    const datos = JSON.parse(elemento.textContent);
+    graficoComparacion(datos);
+    graficoLineaTiempo(datos.linea_tiempo_url);
+})();
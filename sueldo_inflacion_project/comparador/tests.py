@@ -1,3 +1,1234 @@
-from django.test import TestCase
+import io
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+import tracemalloc
+from contextlib import redirect_stdout
+from dataclasses import replace
+from datetime import date, datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 
-# Create your tests here.
+from unittest import mock
+
+import numpy as np
+import pandas as pd
+
+import requests
+from django.core.cache import caches
+from django.core.management import call_command
+from django.contrib.auth.models import AnonymousUser, User
+from django.core.exceptions import MiddlewareNotUsed
+from django.http import Http404, HttpResponse
+from django.db.models import QuerySet
+from django.test import RequestFactory, SimpleTestCase, TestCase, override_settings
+from django.utils import timezone
+
+from comparador import cache_resultados, middleware, registro, views
+from comparador.domain import (alineacion, analitica, artefactos, calculo, calentamiento, calidad, canasta, dataset_api,
+                               dataset_vintage, exportacion, fuentes, ingesta, linea_tiempo, meses, periodos)
+from comparador.domain.dataset_csv import DatasetCsv
+from comparador.domain.dataset_excel import DIVISIONES
+from comparador.management.commands import verificar_calculos as oraculo
+from comparador.cache_resultados import CACHE_ALIAS
+from comparador.models import RegistroComparacion, ResumenComparaciones
+
+from comparador.domain.resiliencia import ABIERTO, CERRADO, Circuito, CircuitoAbierto, pedir_con_reintentos
+
+
+class _ServidorHTTPSilencioso(ThreadingHTTPServer):
+    def handle_error(self, request, client_address):
+        # Los tests cortan conexiones a propósito (timeouts): no imprimir el BrokenPipeError del manejador
+        pass
+
+
+class _ServidorFalso:
+    """
+    Servidor HTTP local que responde a cada GET con la siguiente acción de una lista:
+    - ('estado', codigo, cuerpo): responde con ese código y cuerpo.
+    - ('lento', segundos): espera antes de responder 200 (para disparar el timeout de lectura).
+    - ('cortado',): anuncia un Content-Length mayor que el cuerpo y corta la conexión.
+    - ('goteo', bloques, pausa): manda el cuerpo de a un byte, con una pausa entre bloques.
+    Cuando se acaban las acciones responde 200.
+    """
+    def __init__(self, acciones):
+        self.acciones = list(acciones)
+        self.pedidos = 0
+        servidor = self
+
+        class Manejador(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                servidor.pedidos += 1
+                accion = servidor.acciones.pop(0) if servidor.acciones else ('estado', 200, b'{"ok": true}')
+                if accion[0] == 'lento':
+                    time.sleep(accion[1])
+                    accion = ('estado', 200, b'{"ok": true}')
+                if accion[0] == 'estado':
+                    self.send_response(accion[1])
+                    self.send_header('Content-Length', str(len(accion[2])))
+                    self.end_headers()
+                    self.wfile.write(accion[2])
+                elif accion[0] == 'cortado':
+                    self.send_response(200)
+                    self.send_header('Content-Length', '1000')
+                    self.end_headers()
+                    self.wfile.write(b'{"ok"')
+                    self.wfile.flush()
+                    self.close_connection = True
+                elif accion[0] == 'goteo':
+                    self.send_response(200)
+                    self.send_header('Content-Length', str(accion[1]))
+                    self.end_headers()
+                    for _ in range(accion[1]):
+                        self.wfile.write(b'x')
+                        self.wfile.flush()
+                        time.sleep(accion[2])
+
+        self.httpd = _ServidorHTTPSilencioso(('127.0.0.1', 0), Manejador)
+        self.url = f"http://127.0.0.1:{self.httpd.server_address[1]}/series"
+
+    def __enter__(self):
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *args):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+class PedirConReintentosTests(SimpleTestCase):
+    def pedir(self, servidor, circuito, **opciones):
+        opciones = dict({'timeout': (1.0, 1.0), 'reintentos': 1, 'espera_base': 0.01, 'espera_maxima': 0.01}, **opciones)
+        with requests.Session() as sesion:
+            return pedir_con_reintentos(sesion, servidor.url, circuito, **opciones)
+
+    def test_5xx_y_despues_exito(self):
+        circuito = Circuito('falso')
+        with _ServidorFalso([('estado', 503, b'caido')]) as servidor:
+            respuesta = self.pedir(servidor, circuito)
+        self.assertEqual(respuesta.json(), {'ok': True})
+        self.assertEqual(servidor.pedidos, 2)
+        self.assertEqual((circuito.estado()['fallas'], circuito.estado()['exitos']), (1, 1))
+
+    def test_429_se_reintenta(self):
+        circuito = Circuito('falso')
+        with _ServidorFalso([('estado', 429, b'despacio')]) as servidor:
+            respuesta = self.pedir(servidor, circuito)
+        self.assertEqual(respuesta.status_code, 200)
+        self.assertEqual(servidor.pedidos, 2)
+
+    def test_4xx_no_se_reintenta_ni_abre_el_circuito(self):
+        circuito = Circuito('falso', fallas_apertura=1)
+        with _ServidorFalso([('estado', 404, b'no existe')]) as servidor:
+            with self.assertRaises(requests.exceptions.HTTPError):
+                self.pedir(servidor, circuito, reintentos=3)
+        self.assertEqual(servidor.pedidos, 1)
+        self.assertEqual(circuito.estado()['estado'], CERRADO)
+        self.assertEqual(circuito.estado()['fallas'], 0)
+
+    def test_timeout_de_lectura(self):
+        circuito = Circuito('falso')
+        with _ServidorFalso([('lento', 0.5)]) as servidor:
+            with self.assertRaises(requests.exceptions.Timeout):
+                self.pedir(servidor, circuito, timeout=(1.0, 0.1), reintentos=0)
+        self.assertEqual(circuito.estado()['fallas'], 1)
+
+    def test_cuerpo_cortado_es_una_falla_reintentable(self):
+        circuito = Circuito('falso')
+        with _ServidorFalso([('cortado',)]) as servidor:
+            respuesta = self.pedir(servidor, circuito)
+        self.assertEqual(respuesta.json(), {'ok': True})
+        self.assertEqual(servidor.pedidos, 2)
+        self.assertEqual(circuito.estado()['fallas'], 1)
+
+    def test_cuerpo_cortado_abre_el_circuito(self):
+        circuito = Circuito('falso', fallas_apertura=2)
+        with _ServidorFalso([('cortado',), ('cortado',)]) as servidor:
+            for _ in range(2):
+                with self.assertRaises(requests.exceptions.RequestException):
+                    self.pedir(servidor, circuito, reintentos=0)
+        self.assertEqual(circuito.estado()['estado'], ABIERTO)
+
+    def test_descarga_lenta_respeta_el_tiempo_maximo(self):
+        # Cada byte llega antes del timeout de lectura, pero el cuerpo completo tardaría 2 s
+        circuito = Circuito('falso')
+        with _ServidorFalso([('goteo', 20, 0.1)]) as servidor:
+            inicio = time.monotonic()
+            with self.assertRaises(requests.exceptions.RequestException):
+                self.pedir(servidor, circuito, timeout=(0.3, 0.3), reintentos=0)
+        self.assertLess(time.monotonic() - inicio, 1.5)
+
+    def test_circuito_se_abre_y_pasa_a_semiabierto(self):
+        circuito = Circuito('falso', fallas_apertura=2, espera=0.2)
+        with _ServidorFalso([('estado', 500, b''), ('estado', 500, b'')]) as servidor:
+            for _ in range(2):
+                with self.assertRaises(requests.exceptions.HTTPError):
+                    self.pedir(servidor, circuito, reintentos=0)
+            self.assertEqual(circuito.estado()['estado'], ABIERTO)
+            with self.assertRaises(CircuitoAbierto):
+                self.pedir(servidor, circuito, reintentos=0)
+            self.assertEqual(servidor.pedidos, 2)
+
+            # Pasada la espera, un pedido de prueba exitoso cierra el circuito
+            time.sleep(0.25)
+            self.assertEqual(self.pedir(servidor, circuito, reintentos=0).status_code, 200)
+        self.assertEqual(servidor.pedidos, 3)
+        self.assertEqual(circuito.estado()['estado'], CERRADO)
+
+    def test_error_inesperado_en_la_prueba_no_traba_el_circuito(self):
+        circuito = Circuito('falso', fallas_apertura=1, espera=0.05)
+        circuito.registrar_falla("caído")
+        time.sleep(0.1)
+        sesion = mock.Mock()
+        sesion.get.side_effect = RuntimeError("error inesperado")
+        with self.assertRaises(RuntimeError):
+            pedir_con_reintentos(sesion, 'http://servicio/', circuito, reintentos=0)
+        self.assertEqual(circuito.estado()['estado'], ABIERTO)
+        # Pasada la espera se vuelve a permitir un pedido de prueba
+        time.sleep(0.1)
+        self.assertTrue(circuito.permitir())
+
+    def test_presupuesto_corta_los_reintentos(self):
+        circuito = Circuito('falso', fallas_apertura=10)
+        with _ServidorFalso([('estado', 500, b'')] * 5) as servidor:
+            with self.assertRaises(requests.exceptions.HTTPError):
+                # Un intento puede durar 2 s: con 1 s de presupuesto no se empieza ningún reintento
+                self.pedir(servidor, circuito, reintentos=4, presupuesto=1.0)
+        self.assertEqual(servidor.pedidos, 1)
+
+
+class EstaticosTests(SimpleTestCase):
+    def test_chartjs_versionado_coincide_con_el_hash_fijado(self):
+        call_command('verificar_chartjs', stdout=io.StringIO())
+
+
+# Sin el manifest de collectstatic: en los tests los estáticos se sirven con su nombre original
+ESTATICOS_SIN_MANIFEST = {
+    'default': {'BACKEND': 'django.core.files.storage.FileSystemStorage'},
+    'staticfiles': {'BACKEND': 'django.contrib.staticfiles.storage.StaticFilesStorage'},
+}
+
+
+@override_settings(STORAGES=ESTATICOS_SIN_MANIFEST)
+class IndexTests(SimpleTestCase):
+    FORMULARIO = {'source_choice': '2', 'sueldo_inicial': '1000', 'fecha_sueldo_inicial': '2024-02',
+                  'sueldo_final': '2000', 'fecha_sueldo_final': '2024-12'}
+
+    def setUp(self):
+        caches[CACHE_ALIAS].clear()
+        views._SERIES_GUARDADAS.clear()
+
+    def post(self, **datos):
+        # La serie real de Chaco tiene saltos que el control de calidad advierte al cargarla
+        with redirect_stdout(io.StringIO()), mock.patch.object(fuentes.logger, 'warning'):
+            return self.client.post('/', dict(self.FORMULARIO, **datos))
+
+    @override_settings(COMPARADOR_GUARDAR_DB=True, COMPARADOR_REGISTRO_COMPARACIONES=False)
+    def test_acierto_del_cache_encola_las_mismas_escrituras(self):
+        with mock.patch('comparador.views._encolar_escrituras') as encolar, \
+                mock.patch('comparador.views.registrar_comparacion') as registrar, \
+                mock.patch('comparador.views.comparar_meses', wraps=views.comparar_meses) as calcular:
+            primera = self.post()
+            segunda = self.post()
+        self.assertEqual(calcular.call_count, 1) # la segunda sale del cache de fragmentos
+        self.assertContains(primera, '65.89%')
+        self.assertContains(segunda, '65.89%')
+        self.assertEqual(encolar.call_count, 2)
+        self.assertEqual(registrar.call_count, 2)
+        self.assertEqual(registrar.call_args_list[0], registrar.call_args_list[1])
+
+
+class DebugEndpointsTests(SimpleTestCase):
+    VISTAS = (views.debug_api, views.debug_calidad)
+
+    def pedido(self, usuario=None):
+        # REMOTE_ADDR de localhost, como llega todo el tráfico detrás de un proxy
+        request = RequestFactory().get('/debug/', REMOTE_ADDR='127.0.0.1')
+        request.user = usuario or AnonymousUser()
+        return request
+
+    @override_settings(COMPARADOR_DEBUG_ENDPOINTS=False, DEBUG=False)
+    def test_desactivados_por_defecto_aunque_venga_de_localhost(self):
+        for vista in self.VISTAS + (views.debug_memoria, views.debug_escrituras):
+            with self.subTest(vista=vista.__name__), self.assertRaises(Http404):
+                vista(self.pedido())
+
+    @override_settings(COMPARADOR_DEBUG_ENDPOINTS=True)
+    def test_habilitados_por_setting(self):
+        for vista in self.VISTAS:
+            with self.subTest(vista=vista.__name__):
+                self.assertEqual(vista(self.pedido()).status_code, 200)
+
+    @override_settings(COMPARADOR_DEBUG_ENDPOINTS=False, DEBUG=False)
+    def test_habilitados_para_staff(self):
+        for vista in self.VISTAS:
+            with self.subTest(vista=vista.__name__):
+                self.assertEqual(vista(self.pedido(User(username='admin', is_staff=True))).status_code, 200)
+
+    @override_settings(COMPARADOR_DEBUG_ENDPOINTS=True, COMPARADOR_PERFIL_MEMORIA=False, COMPARADOR_GUARDAR_DB=False)
+    def test_memoria_y_escrituras_requieren_ademas_su_funcion_activa(self):
+        for vista in (views.debug_memoria, views.debug_escrituras):
+            with self.subTest(vista=vista.__name__), self.assertRaises(Http404):
+                vista(self.pedido())
+
+
+class OraculoCalculosTests(SimpleTestCase):
+    """
+    El oráculo de verificar_calculos sobre una serie chica: 2023-01 a 2024-12 con variaciones distintas
+    cada mes, para que una base corrida un mes cambie el resultado.
+    """
+    # Meses cuyo fin cae antes que el del anterior: el original toma la base de DOS meses antes
+    MESES_BASE_CORRIDA = {2, 4, 6, 9, 11}
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        variaciones = 1 + np.arange(1, 25) % 7 / 100
+        cls.df = pd.DataFrame({'ipc_valor': 100 * np.cumprod(variaciones)},
+                              index=pd.date_range('2023-01-01', periods=24, freq='MS', name='fecha'))
+        # Desde 2023-03: con el mes inicial en 2023-02 la base del original (2022-12) queda fuera de la serie
+        inicio = meses.ordinal(2023, 1)
+        cls.casos = [{'mes_inicial': mes_inicial, 'mes_final': mes_final, 'sueldo_inicial': 1000.0, 'sueldo_final': 1500.0}
+                     for mes_inicial in range(inicio + 2, inicio + 24) for mes_final in (mes_inicial, inicio + 23)]
+
+    def test_caminos_nuevos_coinciden_con_el_original_salvo_la_base_conocida(self):
+        lote = oraculo.lote_calcular_comparaciones(self.df, 'ipc_valor', self.casos)
+        with redirect_stdout(io.StringIO()):
+            originales = [oraculo.camino_original(self.df, 'ipc_valor', caso) for caso in self.casos]
+        for caso, original, en_lote in zip(self.casos, originales, lote):
+            nuevo = oraculo.camino_comparar_meses(self.df, 'ipc_valor', caso)
+            with self.subTest(inicial=meses.texto(caso['mes_inicial']), final=meses.texto(caso['mes_final'])):
+                self.assertEqual(oraculo.comparar_resultados(nuevo, en_lote, 1e-12), [])
+                diferencias = oraculo.comparar_resultados(original, nuevo, 1e-9)
+                if caso['mes_inicial'] % 12 + 1 in self.MESES_BASE_CORRIDA:
+                    # Diferencia esperada: solo la inflación, y se explica con la base en el mes anterior
+                    self.assertIn('inflacion_acumulada', diferencias)
+                    self.assertLessEqual(set(diferencias), {'inflacion_acumulada', 'resultado'})
+                    self.assertAlmostEqual(oraculo.inflacion_original_corregida(self.df, 'ipc_valor', caso), nuevo[0])
+                    base = self.df['ipc_valor'].iloc[caso['mes_inicial'] - meses.ordinal(2023, 1) - 2]
+                    fin = self.df['ipc_valor'].iloc[caso['mes_final'] - meses.ordinal(2023, 1)]
+                    self.assertAlmostEqual(original[0], (fin / base - 1) * 100)
+                else:
+                    self.assertEqual(diferencias, [])
+
+    def test_comando_sin_diferencias_sin_explicar(self):
+        salida = io.StringIO()
+        call_command('verificar_calculos', casos=200, semilla=1, stdout=salida)
+        self.assertIn('Sin diferencias', salida.getvalue())
+
+
+class CanastaTests(SimpleTestCase):
+    def divisiones(self, hueco=None):
+        # 4 meses desde 2024-01, todas las divisiones al 10% mensual; 'hueco' = (fila, división) sin dato
+        variaciones = np.full((4, len(DIVISIONES)), 10.0)
+        if hueco is not None:
+            variaciones[hueco] = np.nan
+        meses_serie = meses.ordinal(2024, 1) + np.arange(4, dtype=np.int64)
+        return ('v1', meses_serie, canasta.indices_divisiones(variaciones))
+
+    def test_hueco_en_una_division_con_peso_es_un_error_explicito(self):
+        ponderaciones = canasta.parsear_ponderaciones({'alimentos': 50, 'transporte': 50})
+        with mock.patch.object(canasta, 'obtener_divisiones', return_value=self.divisiones(hueco=(2, 0))):
+            with self.assertRaisesRegex(ValueError, r'Alimentos.*2024-03'):
+                canasta.serie_personal('3', 'Región GBA', ponderaciones)
+
+    def test_hueco_en_una_division_sin_peso_no_afecta(self):
+        ponderaciones = canasta.parsear_ponderaciones({'transporte': 1})
+        with mock.patch.object(canasta, 'obtener_divisiones', return_value=self.divisiones(hueco=(2, 0))):
+            _, meses_serie, valores = canasta.serie_personal('3', 'Región GBA', ponderaciones)
+        self.assertEqual(len(meses_serie), 4)
+        np.testing.assert_allclose(valores, 100 * 1.1 ** np.arange(1, 5))
+
+    def test_parsear_ponderaciones_normaliza_y_valida(self):
+        pesos = canasta.parsear_ponderaciones({'alimentos': '30', 'transporte': 10, 'salud': ''})
+        self.assertEqual(len(pesos), len(DIVISIONES))
+        self.assertAlmostEqual(pesos.sum(), 1.0)
+        self.assertAlmostEqual(pesos[0], 0.75)
+        for valores in ({'alimentos': 'mucho'}, {'alimentos': -1}, {'alimentos': 'nan'}, {}, {'alimentos': 0}):
+            with self.subTest(valores=valores), self.assertRaises(ValueError):
+                canasta.parsear_ponderaciones(valores)
+
+    def test_indice_personal_es_el_promedio_ponderado_de_las_divisiones(self):
+        variaciones = np.zeros((3, len(DIVISIONES)))
+        variaciones[:, 0] = 10.0  # alimentos sube 10% por mes, el resto queda fijo
+        variaciones[:, 1] = np.nan  # una división sin datos y sin peso no anula el índice
+        indices = canasta.indices_divisiones(variaciones)
+        np.testing.assert_allclose(indices[:, 0], [110.0, 121.0, 133.1])
+        self.assertTrue(np.isnan(indices[:, 1]).all())
+
+        ponderaciones = np.zeros(len(DIVISIONES))
+        ponderaciones[[0, 2]] = 0.5
+        np.testing.assert_allclose(canasta.indice_personal(indices, ponderaciones), [105.0, 110.5, 116.55])
+
+
+class DatasetCsvTests(SimpleTestCase):
+    def cargar(self, texto):
+        with tempfile.NamedTemporaryFile('w', suffix='.csv', delete=False) as archivo:
+            archivo.write(texto)
+        self.addCleanup(os.remove, archivo.name)
+        dataset = DatasetCsv(archivo.name, 'indice_tiempo', 'ipc')
+        with redirect_stdout(io.StringIO()), mock.patch('pandas.read_csv', wraps=pd.read_csv) as leer:
+            dataset.cargar_datos()
+        self.assertEqual(leer.call_count, 1) # una sola pasada por el archivo
+        return dataset.datos
+
+    def test_lee_ordena_y_descarta_columnas_extra(self):
+        datos = self.cargar("indice_tiempo,ipc,otra\n2024-01-01,1.5,a\n2024-03-01,3,b\n2024-02-01,2,c\n")
+        self.assertEqual(datos['ipc_valor'].tolist(), [1.5, 2.0, 3.0])
+        self.assertEqual(list(datos.index.strftime('%Y-%m')), ['2024-01', '2024-02', '2024-03'])
+
+    def test_valores_no_numericos_o_vacios_se_descartan(self):
+        datos = self.cargar("indice_tiempo,ipc\n2024-01-01,1.5\n2024-02-01,s/d\n2024-03-01,\n2024-04-01,3\n")
+        self.assertEqual(datos['ipc_valor'].tolist(), [1.5, 3.0])
+
+    def test_columna_faltante_deja_el_dataset_vacio(self):
+        self.assertTrue(self.cargar("fecha,ipc\n2024-01-01,1\n").empty)
+
+
+class MesesTests(SimpleTestCase):
+    def test_ordinal_texto_y_fecha_ida_y_vuelta(self):
+        mes = meses.ordinal(2024, 2)
+        self.assertEqual(mes, 2024 * 12 + 1)
+        self.assertEqual(meses.texto(mes), '2024-02')
+        self.assertEqual(meses.parsear('2024-02'), mes)
+        self.assertEqual(meses.a_fecha(mes), datetime(2024, 2, 1))
+        self.assertEqual(meses.de_fecha(pd.Timestamp('2024-02-29')), mes)
+
+    def test_parsear_es_estricto(self):
+        for texto in ('2024-2', '2024/02', '2024-13', '2024-02-01', '', None):
+            with self.subTest(texto=texto), self.assertRaises(ValueError):
+                meses.parsear(texto)
+
+    def test_desde_textos_acepta_el_dia_y_rechaza_otros_formatos(self):
+        np.testing.assert_array_equal(meses.desde_textos(['2024-01', '2024-03-01']),
+                                      [meses.ordinal(2024, 1), meses.ordinal(2024, 3)])
+        for textos in (['2024-1'], ['enero 24'], ['2024-13']):
+            with self.subTest(textos=textos), self.assertRaises(ValueError):
+                meses.desde_textos(textos)
+
+    def test_desde_fechas_y_a_fechas(self):
+        fechas = pd.DatetimeIndex(['2023-12-31', '2024-01-15'])
+        ordinales = meses.desde_fechas(fechas)
+        np.testing.assert_array_equal(ordinales, [meses.ordinal(2023, 12), meses.ordinal(2024, 1)])
+        self.assertEqual(list(meses.a_fechas(ordinales)), [pd.Timestamp('2023-12-01'), pd.Timestamp('2024-01-01')])
+        # Los enteros ya son ordinales
+        np.testing.assert_array_equal(meses.desde_fechas([5, 6]), [5, 6])
+        with self.assertRaises(ValueError):
+            meses.desde_fechas(pd.DatetimeIndex(['2024-01-01', None]))
+
+    def test_de_serie_ordena_y_descarta_faltantes(self):
+        df = pd.DataFrame({'ipc_valor': [3.0, np.nan, 1.0]},
+                          index=pd.DatetimeIndex(['2024-03-01', '2024-02-01', '2024-01-01']))
+        ordinales, valores = meses.de_serie(df)
+        np.testing.assert_array_equal(ordinales, [meses.ordinal(2024, 1), meses.ordinal(2024, 3)])
+        np.testing.assert_array_equal(valores, [1.0, 3.0])
+
+    def test_desde_celdas_excel(self):
+        # Fecha ya convertida, texto, número de serie de Excel (45292 = 2024-01-01) y celdas que no son fechas
+        ordinales, validos = meses.desde_celdas_excel([datetime(2023, 12, 1), '2024-02-01', 45292, 'Nivel general', np.nan])
+        np.testing.assert_array_equal(validos, [True, True, True, False, False])
+        np.testing.assert_array_equal(ordinales[validos], [meses.ordinal(2023, 12), meses.ordinal(2024, 2), meses.ordinal(2024, 1)])
+
+
+def serie_mensual(desde, valores):
+    """
+    (meses, valores) de una serie mensual consecutiva que empieza en 'desde' ('AAAA-MM').
+    """
+    valores = np.asarray(valores, dtype=np.float64)
+    return meses.parsear(desde) + np.arange(len(valores), dtype=np.int64), valores
+
+
+class CalculoTests(SimpleTestCase):
+    # 2024-01 a 2024-06, 10% mensual
+    MESES, VALORES = serie_mensual('2024-01', 100 * 1.1 ** np.arange(6))
+
+    def comparar(self, inicio, fin, sueldo_inicial=1000.0, sueldo_final=1500.0):
+        resultado = calculo.comparar_meses(self.MESES, self.VALORES, [meses.parsear(inicio)], [meses.parsear(fin)],
+                                           [sueldo_inicial], [sueldo_final])
+        return {clave: valores[0] for clave, valores in resultado.items()}
+
+    def test_base_en_el_mes_anterior_al_inicial(self):
+        resultado = self.comparar('2024-03', '2024-05')
+        self.assertAlmostEqual(resultado['inflacion_acumulada'], (1.1 ** 3 - 1) * 100)
+        self.assertAlmostEqual(resultado['incremento_salarial'], 50.0)
+        self.assertAlmostEqual(resultado['diferencia'], 50.0 - (1.1 ** 3 - 1) * 100)
+        # Poder adquisitivo: contra el IPC del mes del sueldo inicial, no de la base
+        self.assertAlmostEqual(resultado['sueldo_real_ajustado'], 1500 / 1.1 ** 2)
+
+    def test_bordes_de_la_serie(self):
+        # Inicio antes de la serie: la base es el primer valor; fin después: el último publicado
+        self.assertAlmostEqual(self.comparar('2023-06', '2025-01')['inflacion_acumulada'], (1.1 ** 5 - 1) * 100)
+        # Fin antes de la serie: no hay inflación calculable
+        self.assertTrue(np.isnan(self.comparar('2023-01', '2023-06')['inflacion_acumulada']))
+
+    def test_sueldo_inicial_cero(self):
+        self.assertEqual(self.comparar('2024-02', '2024-04', sueldo_inicial=0.0)['incremento_salarial'], 0.0)
+
+    def test_calcular_comparaciones_acepta_fechas_u_ordinales(self):
+        df = pd.DataFrame({'ipc_valor': self.VALORES}, index=meses.a_fechas(self.MESES))
+        por_fecha = calculo.calcular_comparaciones(df, pd.to_datetime(['2024-03-01', '2024-02-01']),
+                                                   pd.to_datetime(['2024-05-01', '2024-06-01']), [1000, 1000], [1500, 900])
+        por_ordinal = calculo.calcular_comparaciones(df, meses.desde_textos(['2024-03', '2024-02']),
+                                                     meses.desde_textos(['2024-05', '2024-06']), [1000, 1000], [1500, 900])
+        pd.testing.assert_frame_equal(por_fecha, por_ordinal)
+        self.assertEqual(list(por_fecha.columns), ['inflacion_acumulada', 'incremento_salarial', 'diferencia', 'sueldo_real_ajustado'])
+        self.assertAlmostEqual(por_fecha['inflacion_acumulada'][1], (1.1 ** 5 - 1) * 100)
+
+
+class ProyectarSueldoTests(SimpleTestCase):
+    MESES, VALORES = serie_mensual('2024-01', 100 * 1.1 ** np.arange(6))
+
+    def test_proyeccion_empata_con_comparar_meses(self):
+        inicial = meses.parsear('2024-03')
+        proyeccion = calculo.proyectar_sueldo(self.MESES, self.VALORES, inicial, 1000.0)
+        np.testing.assert_array_equal(proyeccion['meses'], self.MESES[2:])
+        np.testing.assert_allclose(proyeccion['sueldo_requerido'], 1000 * 1.1 ** np.arange(1, 5))
+        # El sueldo proyectado para un mes "empata" en la comparación del formulario
+        comparacion = calculo.comparar_meses(self.MESES, self.VALORES, [inicial], [self.MESES[-1]],
+                                             [1000.0], [proyeccion['sueldo_requerido'][-1]])
+        self.assertAlmostEqual(comparacion['diferencia'][0], 0.0)
+
+    def test_pagos_contra_el_proyectado(self):
+        proyeccion = calculo.proyectar_sueldo(self.MESES, self.VALORES, meses.parsear('2024-02'), 1000.0,
+                                              meses_pagos=meses.desde_textos(['2024-02', '2024-03', '2024-09']),
+                                              pagos=[1200.0, 1000.0, 5000.0])
+        np.testing.assert_allclose(proyeccion['requerido'][:2], [1100.0, 1210.0])
+        np.testing.assert_allclose(proyeccion['atraso'][:2], [0.0, 210.0])
+        # Un pago en un mes sin dato no se compara
+        self.assertTrue(np.isnan(proyeccion['requerido'][2]) and np.isnan(proyeccion['atraso'][2]))
+
+    def test_errores(self):
+        with self.assertRaises(ValueError):
+            calculo.proyectar_sueldo(self.MESES, self.VALORES, meses.parsear('2025-01'), 1000.0)
+        with self.assertRaises(ValueError):
+            calculo.proyectar_sueldo(self.MESES, self.VALORES, meses.parsear('2024-03'), 1000.0,
+                                     meses_pagos=[meses.parsear('2024-02')], pagos=[1000.0])
+
+
+def df_serie(desde, valores):
+    """
+    DataFrame de IPC (columna 'ipc_valor', índice de primeros de mes) como los que devuelven los datasets.
+    """
+    ordinales, valores = serie_mensual(desde, valores)
+    return pd.DataFrame({'ipc_valor': valores}, index=meses.a_fechas(ordinales))
+
+
+class AnaliticaTests(SimpleTestCase):
+    def test_grilla_mensual_completa_los_huecos(self):
+        df = df_serie('2024-01', [100.0, 110.0, 121.0]).drop(pd.Timestamp('2024-02-01'))
+        ordinales, valores = analitica.grilla_mensual(df)
+        np.testing.assert_array_equal(ordinales, meses.desde_textos(['2024-01', '2024-02', '2024-03']))
+        np.testing.assert_array_equal(valores, [100.0, np.nan, 121.0])
+
+    def test_variaciones_y_anualizadas(self):
+        ordinales, valores = serie_mensual('2023-01', 100 * 1.02 ** np.arange(14))
+        resultado = analitica.calcular_analitica(ordinales, valores)
+        self.assertTrue(np.isnan(resultado['mensual'][0]))
+        np.testing.assert_allclose(resultado['mensual'][1:], 2.0)
+        np.testing.assert_allclose(resultado['acumulada_3m'][3:], (1.02 ** 3 - 1) * 100)
+        np.testing.assert_allclose(resultado['acumulada_12m'][12:], (1.02 ** 12 - 1) * 100)
+        self.assertTrue(np.isnan(resultado['acumulada_12m'][:12]).all())
+        np.testing.assert_allclose(resultado['anualizada_mensual'][1:], (1.02 ** 12 - 1) * 100)
+        np.testing.assert_allclose(resultado['anualizada_3m'][3:], (1.02 ** 12 - 1) * 100)
+
+    def test_indice_no_positivo_o_faltante_queda_nan(self):
+        resultado = analitica.calcular_analitica(*serie_mensual('2024-01', [100.0, 0.0, np.nan, 110.0]))
+        self.assertTrue(np.isnan(resultado['mensual'][1:4]).all())
+
+    def test_se_calcula_una_vez_por_version(self):
+        analitica._CACHE.clear()
+        df = df_serie('2024-01', [100.0, 110.0])
+        with mock.patch.object(analitica, 'cargar_serie', return_value=(df, 'ipc_valor', 'v1')), \
+                mock.patch.object(analitica, 'calcular_analitica', wraps=analitica.calcular_analitica) as calcular:
+            primera = analitica.obtener_analitica('2')
+            self.assertIs(analitica.obtener_analitica('2'), primera)
+            self.assertEqual(calcular.call_count, 1)
+        with mock.patch.object(analitica, 'cargar_serie', return_value=(df, 'ipc_valor', 'v2')):
+            self.assertEqual(analitica.obtener_analitica('2')[0], 'v2')
+        with mock.patch.object(analitica, 'cargar_serie', return_value=(pd.DataFrame(), 'ipc_valor', 'v3')):
+            with self.assertRaises(ValueError):
+                analitica.obtener_analitica('2')
+        analitica._CACHE.clear()
+
+
+class LineaTiempoTests(SimpleTestCase):
+    MESES, VALORES = serie_mensual('2020-01', 100 * 1.03 ** np.arange(48))
+
+    def test_ventana_con_base_100_y_sueldos(self):
+        datos = linea_tiempo.linea_tiempo(self.MESES, self.VALORES, meses.parsear('2021-01'), meses.parsear('2021-12'),
+                                          sueldo_inicial=1000.0, sueldo_final=2000.0)
+        self.assertEqual(len(datos['meses']), 12)
+        self.assertAlmostEqual(datos['indice'][0], 100.0)
+        self.assertAlmostEqual(datos['indice'][-1], 100 * 1.03 ** 11)
+        self.assertAlmostEqual(datos['sueldo_nominal'][-1], 200.0)
+        self.assertAlmostEqual(datos['sueldo_real'][-1], 2000.0 / 1.03 ** 11) # en pesos del primer mes
+        # Sin sueldos positivos solo va el índice
+        self.assertNotIn('sueldo_real', linea_tiempo.linea_tiempo(self.MESES, self.VALORES, sueldo_inicial=0, sueldo_final=10))
+        with self.assertRaises(ValueError):
+            linea_tiempo.linea_tiempo(self.MESES, self.VALORES, meses.parsear('2030-01'))
+
+    def test_reducir_conserva_extremos_y_bordes(self):
+        ordinales = meses.parsear('2000-01') + np.arange(600, dtype=np.int64)
+        valores = 100 + np.sin(np.arange(600) / 7) * 10
+        valores[137] = 1000.0 # pico aislado
+        datos = linea_tiempo.linea_tiempo(ordinales, valores)
+        reducido = linea_tiempo.reducir_min_max(datos, 60)
+        self.assertLessEqual(len(reducido['meses']), 60)
+        self.assertEqual(reducido['meses'][0], ordinales[0])
+        self.assertEqual(reducido['meses'][-1], ordinales[-1])
+        self.assertIn(ordinales[137], reducido['meses'])
+        self.assertAlmostEqual(reducido['indice'].min(), datos['indice'].min())
+        # Si ya entra, no se toca
+        self.assertIs(linea_tiempo.reducir_min_max(datos, 1000), datos)
+
+    def test_codificar_y_decodificar(self):
+        datos = linea_tiempo.linea_tiempo(self.MESES, self.VALORES, sueldo_inicial=1000.0, sueldo_final=3000.0)
+        datos = {nombre: array[[0, 1, 2, 10, 47]] for nombre, array in datos.items()}
+        codificado = linea_tiempo.codificar(datos)
+        self.assertEqual(codificado['mes_inicial'], '2020-01')
+        self.assertEqual(codificado['pasos_meses'], [1, 1, 8, 37])
+        for nombre in linea_tiempo.SERIES:
+            decodificado = 10 ** (np.cumsum(codificado[nombre]) / codificado['escala'])
+            np.testing.assert_allclose(decodificado, datos[nombre], rtol=1.2e-4)
+        self.assertIsNone(linea_tiempo.codificar({'meses': self.MESES[:3], 'indice': self.VALORES[:3]})['pasos_meses'])
+
+
+class PeriodosTests(SimpleTestCase):
+    # 2023-01 a 2024-09: el índice vale el número de mes (1, 2, ... 21)
+    MESES, VALORES = serie_mensual('2023-01', np.arange(1, 22))
+
+    def test_anios_calendario(self):
+        datos = periodos.agregar(self.MESES, self.VALORES, 12)
+        self.assertEqual(datos['periodos'], ['2023', '2024'])
+        self.assertEqual(datos['meses_con_dato'].tolist(), [12, 9])
+        self.assertEqual(datos['fin'][0], 12.0)
+        self.assertEqual(datos['promedio'][0], 6.5)
+        # 2024 está incompleto: sin nivel en ninguna convención
+        self.assertTrue(np.isnan(datos['fin'][1]) and np.isnan(datos['promedio'][1]))
+        self.assertTrue(np.isnan(datos['variacion_fin']).all())
+
+    def test_trimestres_con_variacion_interanual(self):
+        datos = periodos.agregar(self.MESES, self.VALORES, 3)
+        self.assertEqual(datos['periodos'][:2], ['2023-T1', '2023-T2'])
+        self.assertEqual(datos['periodos'][-1], '2024-T3')
+        np.testing.assert_allclose(datos['fin'][:2], [3.0, 6.0])
+        self.assertAlmostEqual(datos['variacion_fin'][1], 100.0)
+        self.assertAlmostEqual(datos['interanual_promedio'][4], (14 / 2 - 1) * 100)
+
+    def test_ejercicio_de_julio_a_junio(self):
+        datos = periodos.agregar(self.MESES, self.VALORES, 12, mes_inicio=7)
+        self.assertEqual(datos['periodos'], ['2022/23', '2023/24', '2024/25'])
+        # Solo el ejercicio 2023/24 (jul 2023 a jun 2024) está completo
+        self.assertEqual(datos['fin'][1], 18.0)
+        self.assertTrue(np.isnan(datos['fin'][[0, 2]]).all())
+        with self.assertRaises(ValueError):
+            periodos.agregar(self.MESES, self.VALORES, 12, mes_inicio=13)
+
+    def test_comparar_periodos(self):
+        datos = periodos.agregar(self.MESES, self.VALORES, 3)
+        datos['posiciones'] = {etiqueta: fila for fila, etiqueta in enumerate(datos['periodos'])}
+        variacion = periodos.comparar_periodos(datos, '2023-T1', '2024-T1')
+        self.assertAlmostEqual(variacion['fin'], (15 / 3 - 1) * 100)
+        self.assertAlmostEqual(variacion['promedio'], (14 / 2 - 1) * 100)
+        with self.assertRaises(ValueError):
+            periodos.comparar_periodos(datos, '2022-T4', '2024-T1')
+
+
+class AlineacionTests(SimpleTestCase):
+    def panel(self):
+        # IPC 2024-01 a 2024-04; tipo de cambio 2024-02 a 2024-05 con un hueco en 2024-03
+        ipc = serie_mensual('2024-01', [100.0, 110.0, 121.0, 133.1])
+        cambio = (meses.desde_textos(['2024-05', '2024-02', '2024-04']), np.array([40.0, 10.0, 20.0]))
+        return alineacion.PanelMensual({'ipc': ipc, 'cambio': cambio})
+
+    def test_eje_comun_y_mascara(self):
+        panel = self.panel()
+        np.testing.assert_array_equal(panel.meses, meses.parsear('2024-01') + np.arange(5))
+        np.testing.assert_array_equal(panel.validos[1], [False, True, False, True, True])
+        np.testing.assert_array_equal(panel.comunes(), [False, True, False, True, False])
+        np.testing.assert_array_equal(panel.columnas(meses.desde_textos(['2023-12', '2024-03'])), [-1, 2])
+
+    def test_operaciones_por_columna(self):
+        panel = self.panel()
+        np.testing.assert_allclose(panel.cociente('ipc', 'cambio')[[1, 3]], [11.0, 133.1 / 20])
+        np.testing.assert_allclose(panel.rebasar(meses.parsear('2024-02'))[:, 3], [121.0, 200.0])
+        np.testing.assert_allclose(panel.variaciones(meses.parsear('2024-02'), meses.parsear('2024-04')), [21.0, 100.0])
+        # 1100 pesos de 2024-04 en pesos de 2024-02 y en "dólares" a la cotización de 2024-02
+        np.testing.assert_allclose(panel.deflactar(meses.desde_textos(['2024-04']), [1331.0], meses.parsear('2024-02'))[:, 0],
+                                   [1100.0, 665.5])
+        with self.assertRaises(ValueError):
+            panel.fila('salarios')
+
+    def test_variaciones_y_deflactar_coinciden_con_comparar_meses(self):
+        # Una serie 2023-01 a 2023-06 y otra con huecos: bordes, huecos y meses fuera de cada serie
+        series = {'ipc': serie_mensual('2023-01', 100 * 1.1 ** np.arange(6)),
+                  'huecos': (meses.desde_textos(['2023-03', '2023-04', '2023-07', '2023-08']),
+                             np.array([50.0, 55.0, 70.0, 77.0]))}
+        panel = alineacion.PanelMensual(series)
+        ejemplo = panel.variaciones(meses.parsear('2023-03') - 1, meses.parsear('2023-09'))
+        self.assertAlmostEqual(ejemplo[0], 46.41)
+
+        rango = meses.parsear('2022-11') + np.arange(14)
+        desde, hasta = (array.ravel() for array in np.meshgrid(rango, rango))
+        for fila, (meses_serie, valores_serie) in enumerate(series.values()):
+            esperado = calculo.comparar_meses(meses_serie, valores_serie, desde, hasta, np.full(len(desde), 1000.0),
+                                              np.full(len(desde), 1000.0))
+            obtenido = [panel.variaciones(d - 1, h)[fila] for d, h in zip(desde, hasta)]
+            np.testing.assert_allclose(obtenido, esperado['inflacion_acumulada'])
+            deflactados = [panel.deflactar([h], [1000.0], d)[fila, 0] for d, h in zip(desde, hasta)]
+            np.testing.assert_allclose(deflactados, esperado['sueldo_real_ajustado'])
+
+    def test_obtener_panel_cachea_por_versiones(self):
+        alineacion._CACHE.clear()
+        cargadas = {'1': (df_serie('2024-01', [100.0, 110.0]), 'ipc_valor', 'a'),
+                    '2': (df_serie('2024-02', [5.0, 6.0]), 'ipc_valor', 'b')}
+        with mock.patch.object(alineacion, 'cargar_serie', side_effect=lambda codigo, *_: cargadas[codigo]):
+            panel = alineacion.obtener_panel([('1', None, None), ('2', None, None)])
+            self.assertEqual(panel.nombres, ['1', '2'])
+            self.assertIs(alineacion.obtener_panel([('1', None, None), ('2', None, None)]), panel)
+            cargadas['2'] = (df_serie('2024-02', [5.0, 7.0]), 'ipc_valor', 'c')
+            self.assertEqual(alineacion.obtener_panel([('1', None, None), ('2', None, None)]).valores[1, 2], 7.0)
+            with self.assertRaises(ValueError):
+                alineacion.obtener_panel([('1', None, None), ('1', None, None)])
+        alineacion._CACHE.clear()
+
+
+class ExportacionTests(SimpleTestCase):
+    def exportar(self, formato):
+        directorio = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directorio)
+        # 2023-11 a 2025-02 al 1% mensual, sin dato en 2024-06
+        df = df_serie('2023-11', 100 * 1.01 ** np.arange(16)).drop(pd.Timestamp('2024-06-01'))
+        manifiesto = exportacion.exportar(directorio, [('3', 'INDEC', 'Región GBA', 'v1', df, 'ipc_valor')], formato)
+        return directorio, manifiesto
+
+    def verificar(self, formato):
+        directorio, manifiesto = self.exportar(formato)
+        particion, = manifiesto['particiones']
+        self.assertEqual(particion['directorio'], os.path.join('fuente=3', 'region=region_gba'))
+        # Un grupo por año calendario, con su rango de meses
+        self.assertEqual([(g['mes_min'], g['mes_max'], g['filas']) for g in particion['grupos']],
+                         [(meses.parsear('2023-11'), meses.parsear('2023-12'), 2),
+                          (meses.parsear('2024-01'), meses.parsear('2024-12'), 11),
+                          (meses.parsear('2025-01'), meses.parsear('2025-02'), 2)])
+
+        columnas = exportacion.leer_exportacion(directorio, '3', 'Región GBA',
+                                                meses.parsear('2024-05'), meses.parsear('2024-08'))
+        np.testing.assert_array_equal(columnas['mes'], meses.desde_textos(['2024-05', '2024-07', '2024-08']))
+        np.testing.assert_allclose(columnas['indice'], 100 * 1.01 ** np.array([6, 8, 9]))
+        # La variación mensual después del hueco no se inventa; la interanual existe desde 2024-11
+        self.assertTrue(np.isnan(columnas['mensual'][1]))
+        self.assertAlmostEqual(columnas['mensual'][2], 1.0)
+        completa = exportacion.leer_exportacion(directorio, '3', 'Región GBA')
+        self.assertEqual(len(completa['mes']), 15)
+        self.assertAlmostEqual(completa['interanual'][-1], (1.01 ** 12 - 1) * 100)
+        with self.assertRaises(ValueError):
+            exportacion.leer_exportacion(directorio, '3', 'Región Patagonia')
+
+    def test_npz_por_anio(self):
+        self.verificar('npz')
+
+    def test_npz_es_el_formato_por_defecto(self):
+        _, manifiesto = self.exportar(None)
+        self.assertEqual(manifiesto['formato'], 'npz')
+        with self.assertRaises(ValueError):
+            self.exportar('csv')
+
+    def test_reexportar_borra_archivos_y_particiones_que_no_estan_en_el_manifiesto(self):
+        directorio, _ = self.exportar('npz')
+        otra = os.path.join(directorio, 'fuente=9', 'region=total')
+        os.makedirs(otra)
+        open(os.path.join(otra, 'serie-2020.npz'), 'wb').close()
+        # La nueva exportación es más corta: solo 2025
+        exportacion.exportar(directorio, [('3', 'INDEC', 'Región GBA', 'v2', df_serie('2025-01', [100.0, 101.0]), 'ipc_valor')])
+        particion = os.path.join(directorio, 'fuente=3', 'region=region_gba')
+        self.assertEqual(os.listdir(particion), ['serie-2025.npz'])
+        self.assertFalse(os.path.exists(os.path.join(directorio, 'fuente=9')))
+
+    def test_un_error_al_escribir_no_deja_temporales(self):
+        directorio = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directorio)
+        columnas = exportacion.columnas_serie(df_serie('2024-01', [100.0, 101.0]))
+        with mock.patch.object(np, 'savez', side_effect=OSError("disco lleno")), self.assertRaises(OSError):
+            exportacion.escribir_particion(directorio, columnas, 'npz')
+        self.assertEqual(os.listdir(directorio), [])
+
+    def test_parquet_con_un_row_group_por_anio(self):
+        if exportacion._pyarrow() is None:
+            with self.assertRaises(ValueError):
+                self.exportar('parquet')
+            self.skipTest("pyarrow no está instalado.")
+        self.verificar('parquet')
+
+
+class ArtefactosTests(SimpleTestCase):
+    def setUp(self):
+        directorio = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directorio)
+        parche = mock.patch.object(artefactos, 'ARTEFACTOS_DIR', os.path.join(directorio, 'artefactos'))
+        parche.start()
+        self.addCleanup(parche.stop)
+        self.fuente = os.path.join(directorio, 'libro.xls')
+        self.escribir(b'contenido original')
+
+    def escribir(self, contenido):
+        with open(self.fuente, 'wb') as archivo:
+            archivo.write(contenido)
+
+    def compilar(self, ruta):
+        self.compilaciones += 1
+        return {'Región GBA': (np.arange(3, dtype=np.int64), np.array([1.5, 2.5, np.nan]))}
+
+    def test_compila_una_vez_por_contenido(self):
+        self.compilaciones = 0
+        primero = artefactos.cargar_o_compilar(self.fuente, 'prueba', self.compilar)
+        segundo = artefactos.cargar_o_compilar(self.fuente, 'prueba', self.compilar)
+        self.assertEqual(self.compilaciones, 1)
+        self.assertEqual(list(segundo), ['Región GBA'])
+        np.testing.assert_array_equal(segundo['Región GBA'][0], primero['Región GBA'][0])
+        np.testing.assert_array_equal(segundo['Región GBA'][1], primero['Región GBA'][1])
+
+        # Si cambia el contenido del archivo, cambia el hash y se recompila
+        self.escribir(b'contenido modificado del libro')
+        artefactos.cargar_o_compilar(self.fuente, 'prueba', self.compilar)
+        self.assertEqual(self.compilaciones, 2)
+
+    def test_la_version_del_parser_forma_parte_de_la_clave(self):
+        ruta = artefactos.ruta_artefacto(self.fuente, 'prueba')
+        self.assertIn(f"-v{artefactos.VERSION_PARSER}-", os.path.basename(ruta))
+        with mock.patch.object(artefactos, 'VERSION_PARSER', artefactos.VERSION_PARSER + 1):
+            self.assertNotEqual(artefactos.ruta_artefacto(self.fuente, 'prueba'), ruta)
+
+    def test_artefacto_ilegible_se_recompila(self):
+        self.compilaciones = 0
+        artefactos.cargar_o_compilar(self.fuente, 'prueba', self.compilar)
+        with open(artefactos.ruta_artefacto(self.fuente, 'prueba'), 'wb') as archivo:
+            archivo.write(b'no es un npz')
+        self.assertIsNone(artefactos.buscar(self.fuente, 'prueba'))
+        artefactos.cargar_o_compilar(self.fuente, 'prueba', self.compilar)
+        self.assertEqual(self.compilaciones, 2)
+        self.assertEqual([n for n in os.listdir(artefactos.ARTEFACTOS_DIR) if n.endswith('.tmp')], [])
+
+
+class CacheResultadosTests(SimpleTestCase):
+    def setUp(self):
+        caches[CACHE_ALIAS].clear()
+
+    def test_clave_depende_de_la_version_y_de_las_entradas(self):
+        clave = cache_resultados.clave_resultado('v1', '1', '2024-01', '2024-06', 1000.0, 1500.0)
+        self.assertTrue(clave.startswith(f"resultado:v{cache_resultados.VERSION_FRAGMENTOS}:"))
+        self.assertEqual(clave, cache_resultados.clave_resultado('v1', '1', '2024-01', '2024-06', 1000.0, 1500.0))
+        self.assertNotEqual(clave, cache_resultados.clave_resultado('v2', '1', '2024-01', '2024-06', 1000.0, 1500.0))
+        self.assertNotEqual(clave, cache_resultados.clave_resultado('v1', '1', '2024-01', '2024-07', 1000.0, 1500.0))
+
+    def test_renderiza_una_vez_y_devuelve_lo_guardado(self):
+        clave = cache_resultados.clave_resultado('v1', 'prueba')
+        self.assertIsNone(cache_resultados.obtener_fragmentos(clave))
+        result = {'source_name': 'INDEC', 'sueldo_inicial': 1000.0, 'sueldo_final': 1500.0,
+                  'inflacion_acumulada': '40.00%', 'incremento_salarial': '50.00%', 'grafico': {'valores': [40.0, 50.0]}}
+        valores = {'inflacion': 40.0, 'incremento': 50.0}
+        fragmentos = cache_resultados.renderizar_fragmentos(clave, result, registro=valores)
+        self.assertIn('40.00%', fragmentos['resultado_html'])
+        self.assertIn('id="datos-grafico"', fragmentos['grafico_html'])
+        self.assertEqual(cache_resultados.obtener_fragmentos(clave), fragmentos)
+        self.assertEqual(cache_resultados.obtener_fragmentos(clave)['registro'], valores)
+
+
+class CargarSerieFallbackTests(SimpleTestCase):
+    CODIGO = 'prueba-api'
+
+    def setUp(self):
+        fuentes.registrar(fuentes.Fuente(self.CODIGO, 'API de prueba', 'api', 'serie_prueba', cache=fuentes.CACHE_DIARIA))
+        self.addCleanup(fuentes._REGISTRO.pop, self.CODIGO, None)
+        self.addCleanup(fuentes._SERIES.pop, (self.CODIGO, None, None), None)
+        self.addCleanup(fuentes._ESTADISTICAS.pop, (self.CODIGO, None, None), None)
+        self.respuestas = []
+        self.version = 'v1'
+        parches = [
+            mock.patch.dict(fuentes.CARGADORES, {'api': lambda *_: (self.respuestas.pop(0), 'ipc_valor')}),
+            mock.patch.object(fuentes.Fuente, 'version', side_effect=lambda *_: self.version),
+        ]
+        for parche in parches:
+            parche.start()
+            self.addCleanup(parche.stop)
+
+    def cargar(self):
+        with redirect_stdout(io.StringIO()):
+            return fuentes.cargar_serie(self.CODIGO)
+
+    def test_si_la_recarga_falla_se_usa_la_serie_anterior(self):
+        anterior = df_serie('2024-01', [100.0, 102.0, 104.0])
+        self.respuestas = [anterior, pd.DataFrame(), df_serie('2024-01', [100.0, 102.0, 104.0, 106.0])]
+        self.assertEqual(self.cargar()[2], 'v1')
+
+        # Cambia la versión (nuevo día) y la API no responde: se sigue sirviendo la serie anterior con su versión
+        self.version = 'v2'
+        with self.assertLogs('comparador.domain.fuentes', 'WARNING') as logs:
+            df, columna, version = self.cargar()
+        self.assertIn("se usa la serie cargada anteriormente", logs.output[0])
+        self.assertEqual((version, len(df), columna), ('v1', 3, 'ipc_valor'))
+
+        # El fallo no se cachea: el pedido siguiente reintenta y toma la serie nueva
+        df, _, version = self.cargar()
+        self.assertEqual((version, len(df)), ('v2', 4))
+        self.assertEqual(self.respuestas, [])
+
+    def test_sin_serie_anterior_el_fallo_se_informa_y_no_se_cachea(self):
+        self.respuestas = [None, df_serie('2024-01', [100.0, 102.0])]
+        df, _, _ = self.cargar()
+        self.assertIsNone(df)
+        self.assertEqual(len(self.cargar()[0]), 2)
+
+
+class CalidadTests(SimpleTestCase):
+    def test_controles_sobre_la_serie_completa(self):
+        serie = meses.desde_textos(['2024-01', '2024-02', '2024-05', '2024-06', '2024-06', '2024-03'])
+        reporte = calidad.validar(serie, [100.0, np.nan, 110.0, 500.0, -1.0, 120.0])
+        self.assertEqual((reporte.filas, reporte.faltantes, reporte.no_positivos), (6, 1, 1))
+        self.assertEqual((reporte.repetidos, reporte.desordenados), (1, 1))
+        self.assertEqual((reporte.meses_faltantes, reporte.huecos), (2, (('2024-03', '2024-04'),)))
+        self.assertEqual((reporte.cantidad_saltos, reporte.saltos), (1, (('2024-06', 354.5),)))
+        self.assertFalse(reporte.valido)
+        self.assertEqual(len(reporte.advertencias()), 6)
+        self.assertEqual(reporte.como_dict()['hasta'], '2024-06')
+
+    def test_huecos_y_saltos_son_solo_advertencias(self):
+        reporte = calidad.validar(meses.desde_textos(['2024-01', '2024-03']), [100.0, 110.0])
+        self.assertTrue(reporte.valido)
+        self.assertEqual(reporte.advertencias(), ['1 meses faltantes en 1 huecos (ej. 2024-02 a 2024-02)'])
+        self.assertTrue(calidad.validar([], []).valido)
+
+    def test_validacion_incremental_coincide_con_la_completa(self):
+        anterior = df_serie('2024-01', [100.0, 101.0, 102.0])
+        # La extensión agrega un salto justo en la unión y un hueco después
+        nueva = pd.concat([anterior, pd.DataFrame({'ipc_valor': [600.0, 610.0]},
+                                                  index=meses.a_fechas(meses.desde_textos(['2024-04', '2024-07'])))])
+        self.assertTrue(calidad.es_extension(anterior, 'ipc_valor', nueva, 'ipc_valor'))
+        self.assertFalse(calidad.es_extension(nueva, 'ipc_valor', anterior, 'ipc_valor'))
+
+        incremental = calidad.validar_serie(nueva, anterior=calidad.validar_serie(anterior))
+        completa = calidad.validar_serie(nueva)
+        self.assertTrue(incremental.incremental)
+        self.assertEqual(replace(incremental, incremental=False), completa)
+        self.assertEqual((completa.cantidad_saltos, completa.meses_faltantes), (1, 2))
+
+        # Si la fila de unión no coincide con el reporte anterior, se valida completa
+        otra = calidad.validar_serie(nueva, anterior=calidad.validar_serie(df_serie('2024-01', [100.0, 101.0, 999.0])))
+        self.assertFalse(otra.incremental)
+
+
+class IndiceVintageTests(SimpleTestCase):
+    # Tres libros archivados: cada uno publica más meses y el de 2025-07 corrige 2025-03, el de 2026-01 corrige 2025-06
+    LIBROS = [
+        ('2025-05', '/datos/sh_ipc_05_25.xls', [2.0, 2.0, 2.0, 2.0]),
+        ('2025-07', '/datos/sh_ipc_07_25.xls', [2.0, 2.0, 3.0, 2.0, 1.0, 1.0]),
+        ('2026-01', '/datos/sh_ipc_01_26.xls', [2.0, 2.0, 3.0, 2.0, 1.0, 1.5] + [1.0] * 6),
+    ]
+
+    def setUp(self):
+        extraidos = {ruta: {'Región GBA': serie_mensual('2025-01', variaciones)} for _, ruta, variaciones in self.LIBROS}
+        with mock.patch.object(dataset_vintage, 'ingerir_archivos', return_value=extraidos):
+            self.indice = dataset_vintage.IndiceVintage([(meses.parsear(vintage), ruta) for vintage, ruta, _ in self.LIBROS])
+
+    def test_fila_vintage(self):
+        self.assertEqual([meses.texto(vintage) for vintage in self.indice.vintages.tolist()], ['2025-05', '2025-07', '2026-01'])
+        with self.assertRaises(ValueError):
+            self.indice.fila_vintage(datetime(2025, 4, 1))
+        self.assertEqual(self.indice.fila_vintage(datetime(2025, 5, 1)), 0)
+        self.assertEqual(self.indice.fila_vintage(datetime(2025, 12, 1)), 1)
+        self.assertEqual(self.indice.fila_vintage(datetime(2030, 1, 1)), 2)
+        self.assertEqual(self.indice.fila_vintage(datetime(9999, 12, 1)), 2)
+        self.assertEqual(self.indice.fila_vintage(), 2)
+
+    def test_variacion_y_serie_tal_como_se_conocian(self):
+        self.assertEqual(self.indice.variacion('Región GBA', datetime(2025, 3, 1), datetime(2025, 6, 1)), 2.0)
+        self.assertEqual(self.indice.variacion('Región GBA', datetime(2025, 3, 1)), 3.0)
+        self.assertTrue(np.isnan(self.indice.variacion('Región GBA', datetime(2025, 6, 1), datetime(2025, 6, 1))))
+        serie = self.indice.serie('Región GBA', datetime(2025, 8, 1))
+        self.assertEqual(len(serie), 6)
+        self.assertAlmostEqual(serie['ipc_valor'].iloc[-1], 100 * 1.02 ** 3 * 1.03 * 1.01 ** 2)
+
+    def test_revisiones(self):
+        revisiones = self.indice.revisiones('Región GBA')
+        self.assertEqual(revisiones['mes'].tolist(), ['2025-03', '2025-06'])
+        self.assertEqual(revisiones['archivo'].tolist(), ['sh_ipc_07_25.xls', 'sh_ipc_01_26.xls'])
+        self.assertEqual(revisiones['valor_anterior'].tolist(), [2.0, 1.0])
+        self.assertEqual(revisiones['valor_nuevo'].tolist(), [3.0, 1.5])
+
+    def test_las_fechas_que_resuelven_al_mismo_libro_comparten_la_clave(self):
+        with mock.patch.object(fuentes, 'obtener_indice', return_value=self.indice):
+            claves = {fuentes.clave_serie('3', 'Región GBA', datetime(anio, 1, 1)) for anio in (2026, 2030, 9999)}
+            self.assertEqual(claves, {('3', 'Región GBA', '2026-01')})
+            self.assertEqual(fuentes.clave_serie('3', 'Región GBA', datetime(2025, 9, 1)), ('3', 'Región GBA', '2025-07'))
+            # Sin libro publicado a esa fecha queda la fecha pedida; las fuentes que no son Excel no tienen vintages
+            self.assertEqual(fuentes.clave_serie('3', 'Región GBA', datetime(2024, 1, 1)), ('3', 'Región GBA', '2024-01'))
+        self.assertEqual(fuentes.clave_serie('1', None, datetime(2024, 1, 1)), ('1', None, None))
+
+    def test_una_carga_fallida_no_deja_estadisticas(self):
+        clave = ('3', 'Región GBA', '2024-01')
+        with mock.patch.object(fuentes, 'obtener_indice', return_value=self.indice), \
+                mock.patch.dict(fuentes.CARGADORES, {'excel': lambda *_: (pd.DataFrame(), 'ipc_valor')}), \
+                redirect_stdout(io.StringIO()):
+            df, _, _ = fuentes.cargar_serie('3', 'Región GBA', datetime(2024, 1, 1))
+        self.assertTrue(df.empty)
+        self.assertNotIn(clave, fuentes._SERIES)
+        self.assertNotIn(clave, fuentes._ESTADISTICAS)
+
+
+class IngestaTests(SimpleTestCase):
+    def directorio_artefactos(self):
+        # Los procesos del pool (spawn) leen el directorio de la variable de entorno al importar artefactos
+        directorio = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directorio)
+        for parche in (mock.patch.dict(os.environ, {'COMPARADOR_ARTEFACTOS_DIR': directorio}),
+                       mock.patch.object(artefactos, 'ARTEFACTOS_DIR', directorio)):
+            parche.start()
+            self.addCleanup(parche.stop)
+        return directorio
+
+    def test_el_pool_compila_lo_mismo_que_el_proceso_actual(self):
+        rutas = [ruta for _, ruta in dataset_vintage.archivos_vintage(os.path.dirname(fuentes.obtener_fuente('3').ruta))]
+        self.assertGreater(len(rutas), 1)
+
+        # compilar_vintages reparte los libros en un pool y deja los artefactos; ingerir_archivos los lee
+        self.directorio_artefactos()
+        self.assertEqual(calentamiento.compilar_vintages(max_workers=2), len(rutas))
+        with mock.patch.object(ingesta, '_parsear_archivo') as parsear:
+            del_pool = ingesta.ingerir_archivos(rutas, regiones={'Región GBA'})
+        parsear.assert_not_called()
+
+        self.directorio_artefactos()
+        en_proceso = ingesta.ingerir_archivos(rutas, regiones={'Región GBA'}, max_workers=1)
+
+        self.assertEqual(list(del_pool), sorted(rutas))
+        self.assertEqual(list(en_proceso), sorted(rutas))
+        for ruta in rutas:
+            self.assertEqual(list(del_pool[ruta]), ['Región GBA'])
+            for array_pool, array_proceso in zip(del_pool[ruta]['Región GBA'], en_proceso[ruta]['Región GBA']):
+                np.testing.assert_array_equal(array_pool, array_proceso)
+
+
+class ConfiguracionFuentesTests(SimpleTestCase):
+    def escribir(self, nombre, contenido):
+        ruta = os.path.join(self.directorio, nombre)
+        with open(ruta, 'w', encoding='utf-8') as archivo:
+            archivo.write(contenido)
+        return ruta
+
+    def setUp(self):
+        self.directorio = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directorio)
+        for codigo in ('prueba-csv', 'prueba-mal'):
+            self.addCleanup(fuentes._REGISTRO.pop, codigo, None)
+            self.addCleanup(fuentes._SERIES.pop, (codigo, None, None), None)
+            self.addCleanup(fuentes._ESTADISTICAS.pop, (codigo, None, None), None)
+
+    def test_fuente_csv_definida_en_json_con_columnas_propias(self):
+        csv = self.escribir('salarios.csv', "periodo,indice_salarios,otra\n2024-02-01,110,x\n2024-01-01,100,y\n")
+        configuracion = self.escribir('fuentes.json', json.dumps([{
+            'codigo': 'prueba-csv', 'nombre': "Salarios (CSV)", 'tipo': 'csv', 'ubicacion': csv,
+            'columna_fecha': 'periodo', 'columna_valor': 'indice_salarios', 'etiqueta': "Índice de salarios",
+        }]))
+        fuentes.cargar_configuracion(configuracion)
+
+        fuente = fuentes.obtener_fuente('prueba-csv')
+        self.assertIn(fuente, fuentes.fuentes_registradas())
+        self.assertEqual(fuente.ruta, csv) # una ubicación absoluta no se resuelve desde la app
+        with redirect_stdout(io.StringIO()):
+            df, columna, _ = fuentes.cargar_serie('prueba-csv')
+        self.assertEqual(columna, 'ipc_valor')
+        self.assertEqual(df[columna].tolist(), [100.0, 110.0])
+        self.assertEqual(list(df.index.strftime('%Y-%m')), ['2024-01', '2024-02'])
+
+    def test_definiciones_invalidas(self):
+        for definicion in ({'codigo': 'prueba-mal', 'nombre': "X", 'tipo': 'xml', 'ubicacion': 'x'},
+                           {'codigo': 'prueba-mal', 'nombre': "X", 'tipo': 'csv', 'ubicacion': 'x', 'cache': 'siempre'}):
+            with self.subTest(definicion=definicion), self.assertRaises(ValueError):
+                fuentes.cargar_configuracion(self.escribir('fuentes.json', json.dumps([definicion])))
+        with self.assertRaises(TypeError):
+            fuentes.cargar_configuracion(self.escribir('fuentes.json', json.dumps([{'codigo': 'prueba-mal', 'columna': 'x'}])))
+        self.assertNotIn('prueba-mal', fuentes._REGISTRO)
+
+
+class PerfilMemoriaTests(SimpleTestCase):
+    def setUp(self):
+        self.addCleanup(middleware.REGISTROS.clear)
+        if not tracemalloc.is_tracing():
+            self.addCleanup(tracemalloc.stop)
+        self.vivos = []
+
+    def vista(self, request):
+        # Deja vivo un DataFrame de ~800 KB y asigna 2 MB temporales que se liberan antes de responder
+        self.vivos.append(pd.DataFrame({'valor': np.arange(100_000, dtype=np.float64)}))
+        temporal = bytearray(2 * 1024 * 1024)
+        del temporal
+        return HttpResponse("ok")
+
+    @override_settings(COMPARADOR_PERFIL_MEMORIA=True, COMPARADOR_PERFIL_TOP=5)
+    def test_registra_pico_neto_y_objetos_pandas(self):
+        perfil = middleware.PerfilMemoriaMiddleware(self.vista)
+        with self.assertLogs('comparador.memoria', 'INFO'):
+            respuesta = perfil(RequestFactory().get('/comparar/'))
+        self.assertEqual(respuesta.status_code, 200)
+        pedido, = middleware.REGISTROS
+        self.assertEqual((pedido['metodo'], pedido['ruta'], pedido['estado']), ('GET', '/comparar/', 200))
+        self.assertEqual(pedido['dataframes'], 1)
+        self.assertGreaterEqual(pedido['pico_kb'], 2048)
+        self.assertGreaterEqual(pedido['neto_kb'], 700)
+        self.assertLess(pedido['neto_kb'], 2048)
+        self.assertLessEqual(len(pedido['top']), 5)
+        self.assertTrue(any('tests.py' in sitio['sitio'] for sitio in pedido['top']))
+
+        # Los estáticos y la propia vista de debug no se perfilan
+        perfil(RequestFactory().get('/static/comparador/js/comparador.js'))
+        perfil(RequestFactory().get('/debug/memoria/'))
+        self.assertEqual(len(middleware.REGISTROS), 1)
+
+    @override_settings(COMPARADOR_PERFIL_MEMORIA=False)
+    def test_desactivado_no_se_instala(self):
+        with self.assertRaises(MiddlewareNotUsed):
+            middleware.PerfilMemoriaMiddleware(self.vista)
+
+
+@override_settings(COMPARADOR_REGISTRO_COMPARACIONES=True, COMPARADOR_REGISTRO_LOTE=3)
+class RegistroComparacionesTests(TestCase):
+    def setUp(self):
+        registro._PENDIENTES.clear()
+        self.addCleanup(registro._PENDIENTES.clear)
+        # Sin el hilo de fondo: los tests vacían el buffer a mano
+        parche = mock.patch.object(registro, '_iniciar')
+        parche.start()
+        self.addCleanup(parche.stop)
+
+    def comparacion(self, resultado, diferencia, fuente='2', mes_inicial=date(2024, 1, 1)):
+        return {'fuente': fuente, 'region': '', 'fecha_vintage': None, 'mes_inicial': mes_inicial,
+                'mes_final': date(2024, 12, 1), 'sueldo_inicial': 1000.0, 'sueldo_final': 2000.0,
+                'inflacion_acumulada': 100.0 - diferencia, 'incremento_salarial': 100.0, 'diferencia': diferencia,
+                'resultado': resultado}
+
+    def test_registrar_solo_encola(self):
+        registro.registrar_comparacion(self.comparacion('gano', 10.0))
+        registro.registrar_comparacion(None)
+        self.assertEqual(len(registro._PENDIENTES), 1)
+        self.assertFalse(registro._hay_pendientes.is_set())
+        self.assertFalse(RegistroComparacion.objects.exists())
+        # Al juntar un lote se despierta al hilo de escritura
+        registro.registrar_comparacion(self.comparacion('gano', 10.0))
+        registro.registrar_comparacion(self.comparacion('gano', 10.0))
+        self.assertTrue(registro._hay_pendientes.is_set())
+        registro._hay_pendientes.clear()
+        with override_settings(COMPARADOR_REGISTRO_COMPARACIONES=False):
+            registro.registrar_comparacion(self.comparacion('gano', 10.0))
+        self.assertEqual(len(registro._PENDIENTES), 3)
+
+    def test_vaciar_inserta_el_lote_y_acumula_el_resumen(self):
+        for resultado, diferencia in (('gano', 10.0), ('perdio', -5.0), ('empato', 0.0)):
+            registro.registrar_comparacion(self.comparacion(resultado, diferencia))
+        registro.registrar_comparacion(self.comparacion('perdio', -1.0, fuente='3'))
+        with mock.patch.object(RegistroComparacion.objects, 'bulk_create',
+                               wraps=RegistroComparacion.objects.bulk_create) as bulk_create:
+            self.assertEqual(registro.vaciar(), 4)
+        bulk_create.assert_called_once()
+        self.assertEqual(RegistroComparacion.objects.count(), 4)
+        self.assertEqual(len(registro._PENDIENTES), 0)
+
+        # Un segundo lote suma sobre la misma fila con F(), sin recontar los registros
+        registro.registrar_comparacion(self.comparacion('gano', 20.0))
+        registro.vaciar()
+        fila = ResumenComparaciones.objects.get(fuente='2')
+        self.assertEqual((fila.comparaciones, fila.ganadas, fila.perdidas, fila.empatadas), (4, 2, 1, 1))
+        self.assertAlmostEqual(fila.diferencia_promedio, 25.0 / 4)
+        self.assertEqual([(total['fuente'], total['comparaciones']) for total in registro.resumen()], [('2', 4), ('3', 1)])
+
+    def test_fila_creada_por_otro_proceso_entre_update_y_create(self):
+        claves = {'fuente': '2', 'region': '', 'mes_inicial': date(2024, 1, 1), 'mes_final': date(2024, 12, 1)}
+        ResumenComparaciones.objects.create(comparaciones=1, ganadas=1, suma_diferencia=10.0, **claves)
+        update = QuerySet.update
+        llamadas = []
+
+        def update_con_carrera(queryset, **campos):
+            # El primer update no encuentra la fila, como si el otro proceso la creara justo después
+            llamadas.append(campos)
+            return 0 if len(llamadas) == 1 else update(queryset, **campos)
+
+        with mock.patch.object(QuerySet, 'update', update_con_carrera):
+            registro.guardar_lote([dict(self.comparacion('perdio', -4.0), fecha_registro=timezone.now())] * 2)
+        self.assertEqual(len(llamadas), 2)
+        fila = ResumenComparaciones.objects.get(**claves)
+        self.assertEqual((fila.comparaciones, fila.ganadas, fila.perdidas), (3, 1, 2))
+        self.assertAlmostEqual(fila.suma_diferencia, 2.0)
+
+
+class DecodificarFilasTests(SimpleTestCase):
+    FILAS = [['2024-01-01', 100.0, 50.0], ['2024-02-01', 102.5, None], ['2024-03-01', None, 51.0], ['2024-04-01', 104, 52]]
+
+    def decodificar(self, filas):
+        with redirect_stdout(io.StringIO()):
+            return dataset_api.decodificar_filas(filas, 2)
+
+    def test_camino_vectorizado_igual_al_tolerante(self):
+        with mock.patch.object(dataset_api, '_decodificar_tolerante', wraps=dataset_api._decodificar_tolerante) as tolerante:
+            meses_api, valores = self.decodificar(self.FILAS)
+        tolerante.assert_not_called()
+        # La fila sin valor de la serie principal se descarta; los null de otra serie quedan NaN
+        np.testing.assert_array_equal(meses_api, meses.desde_textos(['2024-01', '2024-02', '2024-04']))
+        np.testing.assert_array_equal(valores, [[100.0, 50.0], [102.5, np.nan], [104.0, 52.0]])
+
+        meses_tolerante, valores_tolerante = dataset_api._decodificar_tolerante(self.FILAS, 2)
+        con_valor = ~np.isnan(valores_tolerante[:, 0])
+        np.testing.assert_array_equal(meses_tolerante[con_valor], meses_api)
+        np.testing.assert_array_equal(valores_tolerante[con_valor], valores)
+
+    def test_filas_mal_formadas_se_decodifican_una_por_una(self):
+        filas = self.FILAS + [['no es fecha', 1.0, 1.0], ['2024-05-01', 'abc', 53.0], ['2024-06-01', 106.0], []]
+        with mock.patch.object(dataset_api, '_decodificar_tolerante', wraps=dataset_api._decodificar_tolerante) as tolerante:
+            meses_api, valores = self.decodificar(filas)
+        tolerante.assert_called_once()
+        np.testing.assert_array_equal(meses_api, meses.desde_textos(['2024-01', '2024-02', '2024-04', '2024-06']))
+        np.testing.assert_array_equal(valores, [[100.0, 50.0], [102.5, np.nan], [104.0, 52.0], [106.0, np.nan]])
+
+
+class ListoTests(SimpleTestCase):
+    def setUp(self):
+        estado = dict(calentamiento._ESTADO)
+        self.addCleanup(calentamiento._ESTADO.update, estado)
+        calentamiento._ESTADO.update(estado=calentamiento.PENDIENTE, inicio=None, fin=None, segundos=None,
+                                     cargadas=0, total=0, errores={})
+        self.liberar = threading.Event()
+        self.cargas = []
+
+    def cargar_serie(self, codigo, region_name):
+        self.cargas.append(codigo)
+        self.liberar.wait(5)
+        if codigo == '1':
+            raise requests.exceptions.ConnectionError("API caída")
+        return df_serie('2024-01', [100.0, 101.0]), 'ipc_valor', 'v1'
+
+    def test_503_durante_la_precarga_y_200_al_terminar(self):
+        with mock.patch.object(calentamiento, 'series_configuradas', return_value=[('1', None), ('2', None)]), \
+                mock.patch.object(calentamiento, 'cargar_serie', side_effect=self.cargar_serie), \
+                redirect_stdout(io.StringIO()):
+            respuesta = self.client.get('/listo/')
+            self.assertEqual(respuesta.status_code, 503)
+            self.assertEqual(respuesta.json()['estado'], calentamiento.CARGANDO)
+            # Otra consulta mientras carga no dispara una segunda precarga
+            self.assertEqual(self.client.get('/listo/').status_code, 503)
+
+            self.liberar.set()
+            limite = time.monotonic() + 5
+            while calentamiento._ESTADO['estado'] != calentamiento.LISTO and time.monotonic() < limite:
+                time.sleep(0.01)
+            respuesta = self.client.get('/listo/')
+
+        self.assertEqual(self.cargas, ['1', '2'])
+        self.assertEqual(respuesta.status_code, 200)
+        datos = respuesta.json()
+        self.assertEqual((datos['estado'], datos['cargadas'], datos['total']), (calentamiento.LISTO, 2, 2))
+        # La API caída queda informada sin dejar al worker fuera de servicio
+        self.assertEqual(datos['errores'], {'1': "API caída"})
+        self.assertEqual(datos['pid'], os.getpid())
@@ -5,4 +5,14 @@ from . import views
 
 urlpatterns = [
     path('', views.index, name='index'), # La URL raíz de la aplicación comparador
+    path('analitica/', views.analitica, name='analitica'), # Series de inflación mensual, acumulada y anualizada
+    path('grafico/', views.grafico, name='grafico'), # Línea de tiempo índice vs. sueldo (JSON compacto)
+    path('comparar/', views.comparar, name='comparar'), # Un sueldo contra varias series mensuales alineadas
+    path('periodos/', views.periodos, name='periodos'), # Niveles e inflación trimestral, anual o por ejercicio
+    path('proyeccion/', views.proyeccion, name='proyeccion'), # Sueldo requerido mes a mes y atraso de cada pago
+    path('listo/', views.listo, name='listo'), # Readiness: precarga las series y responde 503 hasta terminar
+    path('debug/memoria/', views.debug_memoria, name='debug_memoria'), # Perfilado de memoria (opcional)
+    path('debug/api/', views.debug_api, name='debug_api'), # Estado del circuito de la API de datos.gob.ar
+    path('debug/calidad/', views.debug_calidad, name='debug_calidad'), # Reportes de calidad de las series cargadas
+    path('debug/escrituras/', views.debug_escrituras, name='debug_escrituras'), # Cola de escrituras de DataSaver (opcional)
 ]
\ No newline at end of file
@@ -1,16 +1,39 @@
 # comparador/views.py
+import json
+import logging
+import os
+import threading
+
+import numpy as np
 import pandas as pd
-from datetime import datetime, timedelta
 from django.shortcuts import render
-from django.http import HttpResponse
-
-# Importa tus clases de lógica de negocio (asumiendo que las clases en domain/ ya están como las pasaste)
-from comparador.domain.dataset_api import DatasetAPI
-from comparador.domain.dataset_csv import DatasetCsv
-from comparador.domain.dataset_excel import DatasetExcel
-# from comparador.data.data_saver import DataSaver # Asegúrate de tener esta clase implementada si la usas
+from django.conf import settings
+from django.core.cache import caches
+from django.urls import reverse
+from urllib.parse import urlencode
+from django.http import Http404, HttpResponse, JsonResponse
+
+# Importa tus clases de lógica de negocio: las fuentes de datos se resuelven a través del registro
+from comparador.domain.fuentes import REGIONES, calidad_series, cargar_serie, clave_serie, estado_series, fuentes_registradas, obtener_fuente, obtener_region
+from comparador import middleware
+from comparador.domain.analitica import obtener_analitica
+from comparador.domain.dataset_api import CIRCUITO_API
+from comparador.domain import meses
+from comparador.domain.calculo import comparar_meses, proyectar_sueldo
+from comparador.domain import linea_tiempo
+from comparador.domain import canasta
+from comparador.domain import calentamiento
+from comparador.domain.alineacion import obtener_panel
+from comparador.domain.periodos import CONVENCIONES as CONVENCIONES_PERIODO, comparar_periodos, obtener_periodos
+from comparador.domain.dataset_excel import DIVISIONES
+from comparador.cache_resultados import CACHE_ALIAS, clave_resultado, obtener_fragmentos, renderizar_fragmentos
+from comparador.registro import registrar_comparacion
+
+logger = logging.getLogger(__name__)
 
 # La función calcular_inflacion_periodo: Aquí está el cambio clave para el cálculo.
+# views.index ya no la llama (calcula con domain/calculo.comparar_meses sobre ordinales de mes);
+# se conserva como referencia del cálculo original para el oráculo 'manage.py verificar_calculos'.
 def calcular_inflacion_periodo(df, fecha_inicio_raw_form, fecha_fin_raw_form, valor_columna='ipc_valor'):
     """
     Calcula la inflación acumulada para un período dado (ej. de Enero a Mayo).
@@ -45,8 +68,6 @@ def calcular_inflacion_periodo(df, fecha_inicio_raw_form, fecha_fin_raw_form, va
 
         df.sort_index(inplace=True)
         # Convertir el índice a fin de mes para asegurar la consistencia con asof()
-        # Es posible que ya lo haga transformar_datos de la clase base Dataset (si la usas),
-        # pero es una buena práctica defensiva asegurar esto aquí.
         df.index = df.index.to_period('M').to_timestamp('M')
 
         # --- Determinación de las fechas de IPC para el cálculo ---
@@ -106,12 +127,49 @@ def calcular_inflacion_periodo(df, fecha_inicio_raw_form, fecha_fin_raw_form, va
         return None
 
 
+def _renderizar(request, context):
+    """
+    Renderiza la página agregando al contexto las fuentes y regiones del registro para el formulario.
+    """
+    divisiones = [(codigo, titulo, canasta.PONDERACIONES_INDEC[codigo]) for codigo, titulo in DIVISIONES]
+    context = dict(context, fuentes=fuentes_registradas(), regiones=REGIONES, divisiones=divisiones,
+                   chartjs_ruta=settings.COMPARADOR_CHARTJS_RUTA)
+    return render(request, 'comparador/index.html', context)
+
+
+# Versión de cada serie ya encolada para guardar: tabla -> versión (se reescribe solo si cambió)
+_SERIES_GUARDADAS = {}
+
+
+def _encolar_escrituras(fuente, region_name, fecha_vintage, source_name, df_ipc=None):
+    """
+    Encola en la cola de escritura de DataSaver la serie cargada, una vez por versión de datos.
+    Las comparaciones no se guardan acá: su único registro es RegistroComparacion (ver comparador/registro.py).
+
+    En un acierto del cache de fragmentos no hay DataFrame: solo si la serie de esta versión todavía no
+    se encoló en este proceso se pide al registro de fuentes (que la tiene cacheada).
+    """
+    from comparador.data.data_saver import cola_escritura # Import diferido: solo si la persistencia está activa
+
+    version = fuente.version(fecha_vintage)
+    table_name = "ipc_datos_" + source_name.replace(" ", "_").replace("(", "").replace(")", "").lower()
+    if _SERIES_GUARDADAS.get(table_name) == version:
+        return
+    if df_ipc is None:
+        df_ipc, _, _ = cargar_serie(fuente.codigo, region_name, fecha_vintage)
+        if df_ipc is None or df_ipc.empty:
+            return
+    _SERIES_GUARDADAS[table_name] = version
+    cola_escritura().encolar(df_ipc.reset_index(), table_name, if_exists='replace')
+
+
 def index(request):
     df_ipc = pd.DataFrame()
     source_name = ""
     ipc_value_column_name = None # El nombre de la columna del IPC puede variar según la fuente
     result = None
     error_message = None
+    fragmentos = {}
 
     if request.method == 'POST':
         # Recuperar datos del formulario
@@ -121,95 +179,94 @@ def index(request):
         fecha_sueldo_inicial_str = request.POST.get('fecha_sueldo_inicial') # Formato AAAA-MM
         sueldo_final_str = request.POST.get('sueldo_final')
         fecha_sueldo_final_str = request.POST.get('fecha_sueldo_final') # Formato AAAA-MM
+        fecha_vintage_str = request.POST.get('fecha_vintage') # Opcional, AAAA-MM (solo Excel)
+        canasta_personal = request.POST.get('canasta_personal') == '1' # Opcional, ponderaciones propias (solo Excel)
 
         # Validación básica de entradas
         try:
             sueldo_inicial = float(sueldo_inicial_str)
             sueldo_final = float(sueldo_final_str)
-            # Parsear las fechas a datetime objects (primer día del mes)
-            fecha_sueldo_inicial = datetime.strptime(fecha_sueldo_inicial_str, '%Y-%m')
-            fecha_sueldo_final = datetime.strptime(fecha_sueldo_final_str, '%Y-%m')
+            # Las fechas se manejan como ordinales de mes (ver domain/meses.py); el parseo es estricto 'AAAA-MM'
+            mes_sueldo_inicial = meses.parsear(fecha_sueldo_inicial_str)
+            mes_sueldo_final = meses.parsear(fecha_sueldo_final_str)
+            fecha_vintage = meses.a_fecha(meses.parsear(fecha_vintage_str)) if fecha_vintage_str else None
         except (ValueError, TypeError):
             error_message = "Por favor, ingrese valores numéricos válidos para los sueldos y fechas en formato AAAA-MM."
-            return render(request, 'comparador/index.html', {'error_message': error_message})
+            return _renderizar(request, {'error_message': error_message})
+        ponderaciones = None
 
-        # Rutas de los archivos de datos (ajusta si es necesario, ahora son relativas a la app)
-        csv_file_path = 'comparador/file/ipc-chaco-historico.csv'
-        excel_file_path = 'comparador/file/sh_ipc_01_26.xls' # xls según el que uses
-
-        # Instanciar los datasets
-        dataset_api_indec = DatasetAPI() # Se mantiene la inicialización original
-        dataset_csv = DatasetCsv(csv_file_path) # Se mantiene la inicialización original
-        dataset_excel = DatasetExcel(excel_file_path) # Se mantiene la inicialización original
-
-        # --- Selección y carga de la fuente de datos ---
+        # --- Selección de la fuente de datos (ver domain/fuentes.py) ---
         try:
-            if choice_source == '1': # INDEC API
-                source_name = "INDEC (API)"
-                # Calcular un rango de fechas amplio para la API para asegurar que los datos estén disponibles.
-                # Se utiliza el IPC_NATIONAL_ID de la clase DatasetAPI directamente.
-                api_start_date_obj = fecha_sueldo_inicial.replace(day=1).replace(year=fecha_sueldo_inicial.year - 1)
-                api_end_date_obj = fecha_sueldo_final.replace(day=1) + pd.DateOffset(months=1)
-                
-                # Asegurarse de que la fecha de inicio de la API no sea antes de la base del IPC (ej. Dic 2016)
-                if api_start_date_obj < datetime(2016, 12, 1):
-                    api_start_date_obj = datetime(2016, 12, 1)
-
-                # Se llama a cargar_datos de DatasetAPI con sus argumentos específicos (series_ids, start_date, end_date)
-                dataset_api_indec.cargar_datos(series_ids=[dataset_api_indec.IPC_NATIONAL_ID],
-                                               start_date=api_start_date_obj.strftime('%Y-%m-%d'),
-                                               end_date=api_end_date_obj.strftime('%Y-%m-%d'))
-                df_ipc = dataset_api_indec.datos
-                # El nombre de la columna para la API es su IPC_NATIONAL_ID, asumimos que DatasetAPI lo expone así.
-                ipc_value_column_name = dataset_api_indec.IPC_NATIONAL_ID 
-
-            elif choice_source == '2': # CSV
-                source_name = "IPC Chaco (CSV)"
-                # Se llama a cargar_datos de DatasetCsv sin argumentos adicionales, como en tu código original.
-                dataset_csv.cargar_datos() 
-                df_ipc = dataset_csv.datos # Acceder via propiedad .datos
-                # El nombre de la columna esperado del CSV es 'ipc_valor'.
-                ipc_value_column_name = 'ipc_valor' 
-
-            elif choice_source == '3': # Excel
-                region_map = {
-                    '1': "Total Nacional", '2': "Región GBA", '3': "Región Pampeana",
-                    '4': "Región Noroeste", '5': "Región Noreste", '6': "Región Cuyo",
-                    '7': "Región Patagonia"
-                }
-                selected_region = region_map.get(region_choice)
-                if not selected_region:
-                    raise ValueError("Opción de región no válida para Excel.")
-                
-                source_name = f"Variación Mensual (Excel) - {selected_region}"
-                # Se llama a cargar_datos de DatasetExcel con el argumento region_name, como en tu código original.
-                dataset_excel.cargar_datos(selected_region)
-                df_ipc = dataset_excel.datos # Acceder via propiedad .datos
-                # El nombre de la columna esperado del Excel es 'ipc_valor'.
-                ipc_value_column_name = 'ipc_valor' 
-
+            fuente = obtener_fuente(choice_source)
+            selected_region = obtener_region(fuente, region_choice)
+            if not fuente.requiere_region:
+                fecha_vintage = None # La fecha de publicación solo aplica a los Excel archivados
+                canasta_personal = False
+            source_name = fuente.source_name(selected_region, fecha_vintage)
+            if canasta_personal:
+                if fecha_vintage:
+                    raise ValueError("la canasta personal usa el último archivo publicado; deje vacía la fecha de publicación.")
+                ponderaciones = canasta.parsear_ponderaciones(
+                    {codigo: request.POST.get(f'peso_{codigo}') for codigo, _ in DIVISIONES})
+                source_name += " - canasta personal"
+        except ValueError as e:
+            error_message = f"Error al cargar datos desde la fuente seleccionada: {e}"
+            return _renderizar(request, {'error_message': error_message})
+
+        # --- Cache de resultados renderizados ---
+        # La clave combina las entradas normalizadas con la versión de los datos de la fuente elegida,
+        # así un mismo pedido (links compartidos, reintentos) no recalcula ni vuelve a renderizar.
+        clave = clave_resultado(
+            fuente.version(fecha_vintage), fuente.codigo, selected_region or '',
+            fecha_vintage.strftime('%Y-%m') if fecha_vintage else '',
+            meses.texto(mes_sueldo_inicial), meses.texto(mes_sueldo_final),
+            sueldo_inicial, sueldo_final,
+            *(np.round(ponderaciones, 12).tolist() if ponderaciones is not None else ()),
+        )
+        fragmentos = obtener_fragmentos(clave)
+        if fragmentos is not None:
+            # Las mismas escrituras que un pedido sin cache: el registro de la comparación y la serie
+            registrar_comparacion(fragmentos.get('registro'))
+            if settings.COMPARADOR_GUARDAR_DB and ponderaciones is None and not fragmentos.get('error_message'):
+                try:
+                    _encolar_escrituras(fuente, selected_region, fecha_vintage, source_name)
+                except Exception:
+                    logger.exception("Error al guardar datos con DataSaver")
+            return _renderizar(request, fragmentos)
+        fragmentos = {}
+
+        # --- Carga de la fuente de datos (perezosa y cacheada por el registro) ---
+        try:
+            if ponderaciones is not None:
+                # Índice de la canasta personal: producto de la matriz de índices por división (cacheada por región)
+                _, meses_serie, valores_serie = canasta.serie_personal(fuente.codigo, selected_region, ponderaciones)
+                if len(meses_serie) == 0:
+                    raise ValueError("No hay datos por división para las ponderaciones ingresadas.")
             else:
-                raise ValueError("Opción de fuente de datos no válida.")
+                df_ipc, ipc_value_column_name, _ = cargar_serie(fuente.codigo, selected_region, fecha_vintage)
 
-            # Validación final del DataFrame después de la carga
-            if df_ipc is None or df_ipc.empty:
-                raise ValueError("No se pudieron cargar los datos de IPC desde la fuente seleccionada. No se puede continuar.")
+                # Validación final del DataFrame después de la carga
+                if df_ipc is None or df_ipc.empty:
+                    raise ValueError("No se pudieron cargar los datos de IPC desde la fuente seleccionada. No se puede continuar.")
+                meses_serie, valores_serie = meses.de_serie(df_ipc, ipc_value_column_name)
 
         except Exception as e:
             error_message = f"Error al cargar datos desde la fuente seleccionada: {e}"
-            return render(request, 'comparador/index.html', {'error_message': error_message})
+            return _renderizar(request, {'error_message': error_message})
 
         # --- Análisis de Sueldo vs. Inflación ---
-        # Llamar a la función que calcula la inflación acumulada con las fechas y columna correctas.
-        inflacion_acumulada_sueldo_periodo = calcular_inflacion_periodo(
-            df_ipc, fecha_sueldo_inicial, fecha_sueldo_final, ipc_value_column_name
-        )
+        # Mismo cálculo que calcular_inflacion_periodo (base = mes anterior al inicial), hecho sobre
+        # ordinales de mes: sin conversiones a fin de mes ni DateOffset por pedido.
+        comparacion = comparar_meses(meses_serie, valores_serie, [mes_sueldo_inicial], [mes_sueldo_final],
+                                     [sueldo_inicial], [sueldo_final])
+        inflacion_acumulada_sueldo_periodo = comparacion['inflacion_acumulada'][0]
+        if np.isnan(inflacion_acumulada_sueldo_periodo):
+            inflacion_acumulada_sueldo_periodo = None
 
         if inflacion_acumulada_sueldo_periodo is not None:
-            if sueldo_inicial != 0:
-                incremento_salarial = ((sueldo_final - sueldo_inicial) / sueldo_inicial) * 100
-            else:
-                incremento_salarial = 0
+            inflacion_acumulada_sueldo_periodo = float(inflacion_acumulada_sueldo_periodo)
+            incremento_salarial = float(comparacion['incremento_salarial'][0])
+            if sueldo_inicial == 0:
                 error_message = "Advertencia: Sueldo inicial es cero, no se puede calcular el incremento salarial."
 
             # Comparar y preparar el resultado
@@ -225,29 +282,12 @@ def index(request):
                 resultado_texto = "Tu sueldo se mantuvo a la par de la inflación en este período. ⚖️"
                 clase_resultado = "resultado-neutro"
 
-            # Poder adquisitivo real
-            try:
-                # Las fechas para obtener el poder adquisitivo se refieren a los meses de los sueldos
-                # Se busca el IPC de fin de mes para las fechas de sueldo_inicial y sueldo_final.
-                # Aseguramos que el df_ipc.index sea DatetimeIndex y que esté en fin de mes al inicio de la función.
-                
-                # Ajusta las fechas de sueldo a fin de mes para la búsqueda en el DataFrame
-                fecha_sueldo_inicial_adj = fecha_sueldo_inicial + pd.offsets.MonthEnd(0)
-                fecha_sueldo_final_adj = fecha_sueldo_final + pd.offsets.MonthEnd(0)
-
-                # Usar asof() para buscar el IPC más cercano o exacto
-                ipc_inicio_sueldo_series = df_ipc[ipc_value_column_name].asof(fecha_sueldo_inicial_adj)
-                ipc_final_sueldo_series = df_ipc[ipc_value_column_name].asof(fecha_sueldo_final_adj)
-
-                if pd.isna(ipc_inicio_sueldo_series) or pd.isna(ipc_final_sueldo_series) or ipc_inicio_sueldo_series == 0:
-                    poder_adquisitivo_texto = "No se pudo calcular el poder adquisitivo real (IPC no disponible para las fechas de sueldo o IPC inicial es cero)."
-                else:
-                    ipc_inicio_sueldo = ipc_inicio_sueldo_series
-                    ipc_final_sueldo = ipc_final_sueldo_series
-                    sueldo_real_ajustado = sueldo_final / (ipc_final_sueldo / ipc_inicio_sueldo)
-                    poder_adquisitivo_texto = f"El poder adquisitivo de tu sueldo final (${sueldo_final:.2f}) es equivalente a ${sueldo_real_ajustado:.2f} en pesos de la fecha inicial."
-            except Exception as e:
-                poder_adquisitivo_texto = f"Ocurrió un error al calcular el poder adquisitivo: {e}"
+            # Poder adquisitivo real: sueldo final en pesos del mes del sueldo inicial
+            sueldo_real_ajustado = comparacion['sueldo_real_ajustado'][0]
+            if np.isnan(sueldo_real_ajustado):
+                poder_adquisitivo_texto = "No se pudo calcular el poder adquisitivo real (IPC no disponible para las fechas de sueldo o IPC inicial es cero)."
+            else:
+                poder_adquisitivo_texto = f"El poder adquisitivo de tu sueldo final (${sueldo_final:.2f}) es equivalente a ${sueldo_real_ajustado:.2f} en pesos de la fecha inicial."
 
             result = {
                 'sueldo_inicial': sueldo_inicial,
@@ -260,27 +300,391 @@ def index(request):
                 'clase_resultado': clase_resultado,
                 'poder_adquisitivo_texto': poder_adquisitivo_texto,
                 'source_name': source_name,
+                # Datos de los gráficos, como números (van como JSON a la página, ver _grafico.html).
+                # La línea de tiempo va desde el mes base (anterior al inicial) hasta el final; el endpoint
+                # usa el índice publicado, así que no aplica a la canasta personal.
+                'grafico': {
+                    'incremento_salarial': round(incremento_salarial, 4),
+                    'inflacion_acumulada': round(inflacion_acumulada_sueldo_periodo, 4),
+                    'linea_tiempo_url': None if ponderaciones is not None else reverse('grafico') + '?' + urlencode({
+                        'fuente': fuente.codigo,
+                        'region': region_choice if fuente.requiere_region else '',
+                        'fecha_vintage': fecha_vintage.strftime('%Y-%m') if fecha_vintage else '',
+                        'desde': meses.texto(mes_sueldo_inicial - 1),
+                        'hasta': meses.texto(mes_sueldo_final),
+                        'sueldo_inicial': sueldo_inicial,
+                        'sueldo_final': sueldo_final,
+                    }),
+                },
+            }
+            # Valores numéricos para el registro de comparaciones (ver comparador/registro.py)
+            registro = {
+                'fuente': fuente.codigo + ('-canasta' if ponderaciones is not None else ''),
+                'region': selected_region or '',
+                'fecha_vintage': fecha_vintage.date() if fecha_vintage else None,
+                'mes_inicial': meses.a_fecha(mes_sueldo_inicial).date(),
+                'mes_final': meses.a_fecha(mes_sueldo_final).date(),
+                'sueldo_inicial': sueldo_inicial,
+                'sueldo_final': sueldo_final,
+                'inflacion_acumulada': inflacion_acumulada_sueldo_periodo,
+                'incremento_salarial': incremento_salarial,
+                'diferencia': incremento_salarial - inflacion_acumulada_sueldo_periodo,
+                'resultado': {'resultado-ganado': 'gano', 'resultado-perdido': 'perdio'}.get(clase_resultado, 'empato'),
             }
+            fragmentos = renderizar_fragmentos(clave, result, error_message, registro)
+            registrar_comparacion(registro)
         else:
             error_message = f"No se pudo calcular la inflación para el período de sueldos ({fecha_sueldo_inicial_str} a {fecha_sueldo_final_str}). Asegúrese de que las fechas estén dentro del rango de datos cargados y que los datos sean válidos."
 
-        # --- Guardar datos en la base de datos (opcional, considera si es necesario aquí) ---
-        # Este bloque se mantiene como lo tenías. Si DataSaver no existe o no se usa, puedes dejarlo comentado.
-        if df_ipc is not None and not df_ipc.empty and not error_message:
+        # --- Guardar datos en la base de datos (opcional, ver COMPARADOR_GUARDAR_DB) ---
+        # Solo se encola: el hilo de DataSaver hace las escrituras en lotes fuera del pedido.
+        if settings.COMPARADOR_GUARDAR_DB and df_ipc is not None and not df_ipc.empty and not error_message:
             try:
-                # db = DataSaver()
-                # table_name = "ipc_datos_" + source_name.replace(" ", "_").replace("(", "").replace(")", "").lower()
-                # db.guardar_dataframe(df_ipc, table_name)
-                # print(f"Datos del IPC ({source_name}) guardados en la tabla '{table_name}'.")
-                pass # Eliminé el código comentado para evitar errores si DataSaver no está implementado
-            except NameError:
-                print("Advertencia: La clase DataSaver no está definida o importada. No se guardarán los datos.")
-            except Exception as e:
-                print(f"Error al guardar datos con DataSaver: {e}")
+                _encolar_escrituras(fuente, selected_region, fecha_vintage, source_name, df_ipc)
+            except Exception:
+                logger.exception("Error al guardar datos con DataSaver")
 
     # Renderizar la plantilla con los resultados o el formulario vacío
     context = {
-        'result': result,
+        'resultado_html': fragmentos.get('resultado_html'),
+        'grafico_html': fragmentos.get('grafico_html'),
         'error_message': error_message,
     }
-    return render(request, 'comparador/index.html', context)
+    return _renderizar(request, context)
+
+
+def _debug_habilitado(request):
+    """
+    Los endpoints /debug/ muestran estado interno del proceso: solo con COMPARADOR_DEBUG_ENDPOINTS o DEBUG
+    activos, o para un usuario staff logueado. No se filtra por REMOTE_ADDR: detrás de un proxy es la IP del proxy.
+    """
+    return settings.COMPARADOR_DEBUG_ENDPOINTS or settings.DEBUG or request.user.is_staff
+
+
+def debug_memoria(request):
+    """
+    Devuelve en JSON los últimos pedidos perfilados por PerfilMemoriaMiddleware y los sitios
+    que más memoria acumularon entre todos ellos. Solo con el perfilado activo (ver _debug_habilitado).
+    """
+    if not settings.COMPARADOR_PERFIL_MEMORIA or not _debug_habilitado(request):
+        raise Http404()
+
+    registros = list(middleware.REGISTROS)
+    acumulado = {}
+    for registro in registros:
+        for sitio in registro['top']:
+            acumulado[sitio['sitio']] = acumulado.get(sitio['sitio'], 0) + sitio['kb']
+    top = sorted(acumulado.items(), key=lambda item: item[1], reverse=True)[:settings.COMPARADOR_PERFIL_TOP]
+
+    return JsonResponse({
+        'pedidos': registros,
+        'top_sitios': [{'sitio': sitio, 'kb': round(kb, 1)} for sitio, kb in top],
+    }, json_dumps_params={'ensure_ascii': False, 'indent': 2})
+
+
+def debug_escrituras(request):
+    """
+    Devuelve en JSON el estado de la cola de escrituras de DataSaver: profundidad, descartes y tiempos de los lotes.
+    Solo con la persistencia activa (ver _debug_habilitado).
+    """
+    if not settings.COMPARADOR_GUARDAR_DB or not _debug_habilitado(request):
+        raise Http404()
+
+    from comparador.data.data_saver import cola_escritura
+    return JsonResponse(cola_escritura().estadisticas(), json_dumps_params={'indent': 2})
+
+
+def debug_api(request):
+    """
+    Devuelve en JSON el estado del circuito de la API de datos.gob.ar (cerrado/abierto/semiabierto),
+    sus contadores de éxitos, fallas, rechazos y aperturas, y el último error (ver _debug_habilitado).
+    """
+    if not _debug_habilitado(request):
+        raise Http404()
+    return JsonResponse(CIRCUITO_API.estado(), json_dumps_params={'ensure_ascii': False, 'indent': 2})
+
+
+def debug_calidad(request):
+    """
+    Devuelve en JSON el reporte de calidad de cada serie cargada en este proceso: valores faltantes o
+    no positivos, meses repetidos o desordenados, huecos y saltos implausibles (ver _debug_habilitado).
+    """
+    if not _debug_habilitado(request):
+        raise Http404()
+    return JsonResponse({'series': calidad_series()}, json_dumps_params={'ensure_ascii': False, 'indent': 2})
+
+
+# Cuerpos JSON de /analitica/ ya serializados, por serie (ver fuentes.clave_serie) -> (versión, bytes)
+_RESPUESTAS_ANALITICA = {}
+_lock_analitica = threading.Lock()
+
+
+def _a_lista(valores, decimales=None):
+    """
+    Convierte un array float a lista JSON con None en lugar de NaN, opcionalmente redondeada.
+    """
+    if decimales is not None:
+        valores = np.round(valores, decimales)
+    return [None if np.isnan(valor) else valor for valor in valores.tolist()]
+
+
+def analitica(request):
+    """
+    Devuelve en JSON, para todos los meses de una serie, el índice y las tasas mensual, acumuladas
+    a 3/6/12 meses (12 = interanual) y anualizadas.
+
+    Parámetros GET: 'fuente' (código del registro), 'region' (solo fuentes por región)
+    y 'fecha_vintage' (AAAA-MM, opcional, solo Excel).
+    """
+    try:
+        fuente = obtener_fuente(request.GET.get('fuente', ''))
+        region_name = obtener_region(fuente, request.GET.get('region', ''))
+        fecha_vintage_str = request.GET.get('fecha_vintage') if fuente.requiere_region else None
+        fecha_vintage = meses.a_fecha(meses.parsear(fecha_vintage_str)) if fecha_vintage_str else None
+        version, datos = obtener_analitica(fuente.codigo, region_name, fecha_vintage)
+    except ValueError as e:
+        return JsonResponse({'error': str(e)}, status=400)
+
+    clave = clave_serie(fuente.codigo, region_name, fecha_vintage)
+    cacheado = _RESPUESTAS_ANALITICA.get(clave)
+    if cacheado is None or cacheado[0] != version:
+        cuerpo = {
+            'fuente': fuente.source_name(region_name, fecha_vintage),
+            'version': version,
+            'meses': [meses.texto(mes) for mes in datos['meses'].tolist()],
+        }
+        for nombre, valores in datos.items():
+            if nombre != 'meses':
+                # El índice se envía completo (la serie de Chaco arranca en valores del orden de 1e-11)
+                cuerpo[nombre] = _a_lista(valores, None if nombre == 'indice' else 6)
+        cacheado = (version, json.dumps(cuerpo, ensure_ascii=False, separators=(',', ':')).encode('utf-8'))
+        with _lock_analitica:
+            _RESPUESTAS_ANALITICA[clave] = cacheado
+
+    return HttpResponse(cacheado[1], content_type='application/json')
+
+
+# Límites de puntos del gráfico de línea de tiempo (parámetro 'puntos')
+PUNTOS_GRAFICO = 240
+PUNTOS_GRAFICO_MAXIMO = 2000
+
+
+def grafico(request):
+    """
+    Devuelve en JSON los arrays alineados por mes del gráfico de línea de tiempo (ver domain/linea_tiempo.py):
+    índice base 100, sueldo nominal base 100 y sueldo real en pesos del primer mes.
+
+    Parámetros GET: 'fuente', 'region', 'fecha_vintage' (como en /analitica/), 'desde' y 'hasta' (AAAA-MM),
+    'sueldo_inicial' y 'sueldo_final' (opcionales), 'puntos' (máximo de puntos, por defecto 240) y
+    'formato' ('delta', por defecto, o 'plano').
+    """
+    try:
+        fuente = obtener_fuente(request.GET.get('fuente', ''))
+        region_name = obtener_region(fuente, request.GET.get('region', ''))
+        fecha_vintage_str = request.GET.get('fecha_vintage') if fuente.requiere_region else None
+        fecha_vintage = meses.a_fecha(meses.parsear(fecha_vintage_str)) if fecha_vintage_str else None
+        mes_desde = meses.parsear(request.GET['desde']) if request.GET.get('desde') else None
+        mes_hasta = meses.parsear(request.GET['hasta']) if request.GET.get('hasta') else None
+        sueldo_inicial = float(request.GET.get('sueldo_inicial') or 0)
+        sueldo_final = float(request.GET.get('sueldo_final') or 0)
+        puntos = min(max(int(request.GET.get('puntos') or PUNTOS_GRAFICO), 10), PUNTOS_GRAFICO_MAXIMO)
+        formato = request.GET.get('formato', 'delta')
+        if formato not in ('delta', 'plano'):
+            raise ValueError("Formato no válido: use 'delta' o 'plano'.")
+    except ValueError as e:
+        return JsonResponse({'error': str(e)}, status=400)
+
+    version = fuente.version(fecha_vintage)
+    clave = clave_resultado(version, 'grafico', fuente.codigo, region_name or '', fecha_vintage_str or '',
+                            mes_desde, mes_hasta, sueldo_inicial, sueldo_final, puntos, formato)
+    cuerpo = caches[CACHE_ALIAS].get(clave)
+    if cuerpo is None:
+        try:
+            df_ipc, columna, version = cargar_serie(fuente.codigo, region_name, fecha_vintage)
+            if df_ipc is None or df_ipc.empty:
+                raise ValueError("No se pudieron cargar los datos de IPC desde la fuente seleccionada.")
+            meses_serie, valores_serie = meses.de_serie(df_ipc, columna)
+            datos = linea_tiempo.linea_tiempo(meses_serie, valores_serie, mes_desde, mes_hasta, sueldo_inicial, sueldo_final)
+        except ValueError as e:
+            return JsonResponse({'error': str(e)}, status=400)
+
+        datos = linea_tiempo.reducir_min_max(datos, puntos)
+        respuesta = {'fuente': fuente.source_name(region_name, fecha_vintage), 'version': version, 'formato': formato}
+        respuesta.update(linea_tiempo.codificar(datos) if formato == 'delta' else linea_tiempo.plano(datos))
+        cuerpo = json.dumps(respuesta, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+        caches[CACHE_ALIAS].set(clave, cuerpo)
+
+    return HttpResponse(cuerpo, content_type='application/json')
+
+
+# Cantidad máxima de series por pedido a /comparar/
+MAX_SERIES_COMPARAR = 10
+
+
+def comparar(request):
+    """
+    Compara un sueldo contra varias series mensuales a la vez (IPC, tipo de cambio, índice de salarios,
+    cualquier fuente del registro), alineadas en un mismo eje de meses (ver domain/alineacion.py).
+
+    Parámetros GET: 'serie' (repetible) con el formato 'fuente', 'fuente:region' o 'fuente:region:AAAA-MM'
+    (fecha de publicación), 'desde' y 'hasta' (AAAA-MM) y, opcionales, 'sueldo_inicial' y 'sueldo_final'.
+    Para cada serie devuelve su variación entre el mes anterior a 'desde' y 'hasta' y el sueldo final
+    expresado en unidades del mes 'desde' de esa serie, con las mismas reglas que el formulario en los
+    bordes y huecos de cada serie (ver calculo.comparar_meses).
+    """
+    try:
+        pedidas = request.GET.getlist('serie')
+        if not pedidas or len(pedidas) > MAX_SERIES_COMPARAR:
+            raise ValueError(f"Indique entre 1 y {MAX_SERIES_COMPARAR} series con el parámetro 'serie'.")
+        series, nombres = [], []
+        for pedida in pedidas:
+            codigo, _, resto = pedida.partition(':')
+            region_choice, _, vintage_str = resto.partition(':')
+            fuente = obtener_fuente(codigo)
+            region_name = obtener_region(fuente, region_choice)
+            fecha_vintage = meses.a_fecha(meses.parsear(vintage_str)) if vintage_str and fuente.requiere_region else None
+            series.append((fuente.codigo, region_name, fecha_vintage))
+            nombres.append(fuente.source_name(region_name, fecha_vintage))
+        mes_desde = meses.parsear(request.GET.get('desde'))
+        mes_hasta = meses.parsear(request.GET.get('hasta'))
+        sueldo_inicial = float(request.GET.get('sueldo_inicial') or 0)
+        sueldo_final = float(request.GET.get('sueldo_final') or 0)
+        panel = obtener_panel(series)
+    except ValueError as e:
+        return JsonResponse({'error': str(e)}, status=400)
+
+    # Una operación por columna del panel: variación de todas las series y sueldo final en unidades de 'desde'
+    variaciones = panel.variaciones(mes_desde - 1, mes_hasta)
+    respuesta = {'desde': meses.texto(mes_desde), 'hasta': meses.texto(mes_hasta), 'series': []}
+    incremento = None
+    if sueldo_inicial > 0 and sueldo_final > 0:
+        incremento = (sueldo_final / sueldo_inicial - 1) * 100
+        respuesta['incremento_salarial'] = round(incremento, 4)
+        deflactados = panel.deflactar([mes_hasta], [sueldo_final], mes_desde)[:, 0]
+
+    for fila, nombre in enumerate(nombres):
+        variacion = variaciones[fila]
+        item = {'nombre': nombre, 'serie': panel.nombres[fila],
+                'variacion': None if np.isnan(variacion) else round(float(variacion), 4)}
+        if incremento is not None:
+            item['sueldo_final_equivalente'] = None if np.isnan(deflactados[fila]) else round(float(deflactados[fila]), 2)
+            item['gana'] = None if np.isnan(variacion) else bool(incremento > variacion)
+        respuesta['series'].append(item)
+    return JsonResponse(respuesta, json_dumps_params={'ensure_ascii': False})
+
+
+
+# Cantidad máxima de pagos por pedido a /proyeccion/ (50 años de sueldos mensuales)
+MAX_PAGOS_PROYECCION = 600
+
+
+def proyeccion(request):
+    """
+    Sueldo necesario para no perder contra la inflación en cada mes posterior al sueldo inicial, en un
+    solo cálculo sobre el índice ya cargado (ver domain/calculo.proyectar_sueldo).
+
+    Parámetros GET: 'fuente', 'region', 'fecha_vintage' (como en /analitica/), 'desde' (AAAA-MM, mes del
+    sueldo inicial), 'sueldo_inicial' y, opcional y repetible, 'pago' con el formato 'AAAA-MM:monto'
+    (sueldos efectivamente cobrados). Por cada pago devuelve el sueldo requerido de su mes y el atraso
+    (lo que faltó para empatar); 'atraso_total' suma los atrasos de todos los pagos.
+    """
+    try:
+        fuente = obtener_fuente(request.GET.get('fuente', ''))
+        region_name = obtener_region(fuente, request.GET.get('region', ''))
+        fecha_vintage_str = request.GET.get('fecha_vintage') if fuente.requiere_region else None
+        fecha_vintage = meses.a_fecha(meses.parsear(fecha_vintage_str)) if fecha_vintage_str else None
+        mes_inicial = meses.parsear(request.GET.get('desde'))
+        sueldo_inicial = float(request.GET.get('sueldo_inicial') or 0)
+        if not sueldo_inicial > 0:
+            raise ValueError("Ingrese un sueldo inicial mayor que cero.")
+        pedidos = request.GET.getlist('pago')
+        if len(pedidos) > MAX_PAGOS_PROYECCION:
+            raise ValueError(f"Indique como máximo {MAX_PAGOS_PROYECCION} pagos.")
+        meses_pagos, pagos = [], []
+        for pedido in pedidos:
+            mes_pago, _, monto = pedido.partition(':')
+            meses_pagos.append(meses.parsear(mes_pago))
+            pagos.append(float(monto))
+        # Índice cacheado por versión de los datos (el mismo de /analitica/)
+        version, datos = obtener_analitica(fuente.codigo, region_name, fecha_vintage)
+        proyectado = proyectar_sueldo(datos['meses'], datos['indice'], mes_inicial, sueldo_inicial, meses_pagos, pagos)
+    except ValueError as e:
+        return JsonResponse({'error': str(e)}, status=400)
+
+    respuesta = {
+        'fuente': fuente.source_name(region_name, fecha_vintage),
+        'version': version,
+        'desde': meses.texto(mes_inicial),
+        'sueldo_inicial': sueldo_inicial,
+        'meses': [meses.texto(mes) for mes in proyectado['meses'].tolist()],
+        'sueldo_requerido': _a_lista(proyectado['sueldo_requerido'], 2),
+    }
+    if pedidos:
+        requerido = _a_lista(proyectado['requerido'], 2)
+        diferencia = _a_lista(proyectado['diferencia'], 2)
+        atraso = _a_lista(proyectado['atraso'], 2)
+        respuesta['pagos'] = [
+            {'mes': meses.texto(mes), 'pagado': pago, 'requerido': requerido[i], 'diferencia': diferencia[i], 'atraso': atraso[i]}
+            for i, (mes, pago) in enumerate(zip(meses_pagos, pagos))
+        ]
+        respuesta['atraso_total'] = round(float(np.nansum(proyectado['atraso'])), 2)
+    return JsonResponse(respuesta, json_dumps_params={'ensure_ascii': False})
+
+
+def listo(request):
+    """
+    Readiness del worker que atiende el pedido. La primera consulta dispara la precarga de todas las series
+    del registro (ver domain/calentamiento.py) y, hasta que termina, responde 503 con el progreso.
+    Después responde 200 con, por serie: último mes, archivo o ID de origen, versión, duración de la carga
+    y tasa de aciertos del cache. Una serie que no se pudo cargar figura en 'errores' pero no deja al
+    worker fuera de servicio (las demás fuentes funcionan).
+    """
+    estado = calentamiento.iniciar()
+    respuesta = dict(calentamiento.estado(), pid=os.getpid())
+    series = estado_series()
+    aciertos = sum(serie['aciertos'] for serie in series)
+    pedidos = aciertos + sum(serie['cargas'] for serie in series)
+    respuesta['tasa_aciertos'] = round(aciertos / pedidos, 4) if pedidos else None
+    respuesta['series'] = series
+    return JsonResponse(respuesta, status=200 if estado == calentamiento.LISTO else 503,
+                        json_dumps_params={'ensure_ascii': False})
+
+
+def periodos(request):
+    """
+    Devuelve en JSON los niveles trimestrales o anuales de una serie (año calendario o ejercicio) con las
+    convenciones de fin de período y de promedio, y sus variaciones (ver domain/periodos.py).
+
+    Parámetros GET: 'fuente', 'region', 'fecha_vintage' (como en /analitica/), 'frecuencia' ('anual', por
+    defecto, o 'trimestral'), 'inicio_ejercicio' (mes 1 a 12, por defecto COMPARADOR_INICIO_EJERCICIO) y,
+    opcionales, 'desde' y 'hasta' con etiquetas de período (ej. '2023', '2024-T2' o '2023/24') para
+    devolver además la variación entre ambos.
+    """
+    try:
+        fuente = obtener_fuente(request.GET.get('fuente', ''))
+        region_name = obtener_region(fuente, request.GET.get('region', ''))
+        fecha_vintage_str = request.GET.get('fecha_vintage') if fuente.requiere_region else None
+        fecha_vintage = meses.a_fecha(meses.parsear(fecha_vintage_str)) if fecha_vintage_str else None
+        inicio_ejercicio = int(request.GET['inicio_ejercicio']) if request.GET.get('inicio_ejercicio') else None
+        version, datos = obtener_periodos(fuente.codigo, region_name, fecha_vintage,
+                                          request.GET.get('frecuencia', 'anual'), inicio_ejercicio)
+        comparacion = None
+        if request.GET.get('desde') or request.GET.get('hasta'):
+            comparacion = comparar_periodos(datos, request.GET.get('desde', ''), request.GET.get('hasta', ''))
+    except ValueError as e:
+        return JsonResponse({'error': str(e)}, status=400)
+
+    respuesta = {
+        'fuente': fuente.source_name(region_name, fecha_vintage),
+        'version': version,
+        'periodos': datos['periodos'],
+        'meses_con_dato': datos['meses_con_dato'].tolist(),
+    }
+    for nombre, valores in datos.items():
+        if nombre not in ('periodos', 'inicio', 'meses_con_dato', 'posiciones'):
+            respuesta[nombre] = _a_lista(valores, None if nombre in CONVENCIONES_PERIODO else 4)
+    if comparacion is not None:
+        respuesta['comparacion'] = {'desde': request.GET['desde'], 'hasta': request.GET['hasta']}
+        respuesta['comparacion'].update({convencion: None if np.isnan(variacion) else round(variacion, 4)
+                                         for convencion, variacion in comparacion.items()})
+    return JsonResponse(respuesta, json_dumps_params={'ensure_ascii': False})
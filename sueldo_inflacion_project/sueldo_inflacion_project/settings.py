@@ -47,6 +47,8 @@ MIDDLEWARE = [
     # WhiteNoise Middleware debe ir justo después de SecurityMiddleware
     # y antes de otros middleware de Django.
     'whitenoise.middleware.WhiteNoiseMiddleware', 
+    # Perfilado de memoria por pedido: solo se activa con COMPARADOR_PERFIL_MEMORIA=True
+    'comparador.middleware.PerfilMemoriaMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -106,6 +108,67 @@ else:
     }
 
 
+# Cache
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+# 'resultados' guarda los fragmentos HTML ya renderizados de cada comparación.
+# Por defecto en memoria local (por proceso). Con varios workers de gunicorn conviene
+# compartirlo en disco: CACHE_RESULTADOS_BACKEND=django.core.cache.backends.filebased.FileBasedCache
+# y CACHE_RESULTADOS_LOCATION=/ruta/a/un/directorio.
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    'resultados': {
+        'BACKEND': config('CACHE_RESULTADOS_BACKEND', default='django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': config('CACHE_RESULTADOS_LOCATION', default='comparador-resultados'),
+        'TIMEOUT': config('CACHE_RESULTADOS_TIMEOUT', default=60 * 60 * 24, cast=int),
+        'OPTIONS': {
+            'MAX_ENTRIES': config('CACHE_RESULTADOS_MAX_ENTRIES', default=5000, cast=int),
+        },
+    },
+}
+
+
+# Endpoints /debug/ (memoria, api, calidad, escrituras) con estado interno del proceso. Desactivados por
+# defecto: no se filtra por IP porque detrás del proxy de Render REMOTE_ADDR es siempre la del proxy.
+# Con DEBUG también están activos, y un usuario staff logueado en /admin/ los puede ver siempre.
+COMPARADOR_DEBUG_ENDPOINTS = config('COMPARADOR_DEBUG_ENDPOINTS', default=False, cast=bool)
+
+# Perfilado de memoria (tracemalloc) por pedido. Desactivado por defecto: agrega costo a cada pedido.
+# Los resultados van al logger 'comparador.memoria' y a /debug/memoria/ (ver COMPARADOR_DEBUG_ENDPOINTS).
+COMPARADOR_PERFIL_MEMORIA = config('COMPARADOR_PERFIL_MEMORIA', default=False, cast=bool)
+COMPARADOR_PERFIL_TOP = config('COMPARADOR_PERFIL_TOP', default=10, cast=int)
+COMPARADOR_PERFIL_FRAMES = config('COMPARADOR_PERFIL_FRAMES', default=1, cast=int)
+
+# Persistencia de las series cargadas con DataSaver. Desactivada por defecto: cuando se activa, las
+# escrituras se encolan y las hace un hilo en segundo plano (el pedido nunca espera a la base de datos).
+# Estado de la cola en /debug/escrituras/ (ver COMPARADOR_DEBUG_ENDPOINTS).
+COMPARADOR_GUARDAR_DB = config('COMPARADOR_GUARDAR_DB', default=False, cast=bool)
+
+# Registro de las comparaciones calculadas (modelos RegistroComparacion / ResumenComparaciones), el único
+# registro de comparaciones. Desactivado por defecto (guarda sueldos ingresados por los usuarios); cuando se
+# activa se escribe en lotes desde un hilo en segundo plano, cada INTERVALO segundos o al juntar LOTE registros.
+COMPARADOR_REGISTRO_COMPARACIONES = config('COMPARADOR_REGISTRO_COMPARACIONES', default=False, cast=bool)
+COMPARADOR_REGISTRO_INTERVALO = config('COMPARADOR_REGISTRO_INTERVALO', default=5.0, cast=float)
+COMPARADOR_REGISTRO_LOTE = config('COMPARADOR_REGISTRO_LOTE', default=200, cast=int)
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {
+            'class': 'logging.StreamHandler',
+        },
+    },
+    'loggers': {
+        'comparador': {
+            'handlers': ['console'],
+            'level': config('COMPARADOR_LOG_LEVEL', default='INFO'),
+        },
+    },
+}
+
+
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
 
@@ -152,7 +215,27 @@ STATICFILES_DIRS = [
 
 # Configuración de WhiteNoise para servir archivos estáticos comprimidos y con cache
 # Esto se usará tanto en collectstatic como en el servidor de producción.
-STATICFILES_STORAGE = 'whitenoise.storage.CompressedManifestStaticFilesStorage'
+# Django 5.1 eliminó STATICFILES_STORAGE (se ignoraba en silencio): el storage se define en STORAGES.
+# collectstatic guarda cada archivo con el hash de su contenido en el nombre y sus versiones .gz y .br
+# (Brotli, si está instalado); WhiteNoise sirve esos nombres con "Cache-Control: max-age=315360000,
+# public, immutable" y elige la versión comprimida según Accept-Encoding.
+STORAGES = {
+    'default': {
+        'BACKEND': 'django.core.files.storage.FileSystemStorage',
+    },
+    'staticfiles': {
+        'BACKEND': 'whitenoise.storage.CompressedManifestStaticFilesStorage',
+    },
+}
+
+# Chart.js versionado en el repositorio (comparador/static/comparador/vendor, licencia MIT al lado): se sirve
+# como cualquier otro estático, con hash en el nombre y cache inmutable. Es el build UMD minificado de la
+# versión 4.4.0 tal como lo distribuye el paquete django-unfold 0.91.0 (unfold/static/unfold/js/chart/chart.js).
+# build.sh corre 'manage.py verificar_chartjs', que falla si el archivo no coincide con este SHA-256.
+# Para actualizarlo: reemplazar el archivo y cambiar versión y hash juntos.
+COMPARADOR_CHARTJS_VERSION = '4.4.0'
+COMPARADOR_CHARTJS_RUTA = f'comparador/vendor/chart-{COMPARADOR_CHARTJS_VERSION}.umd.js'
+COMPARADOR_CHARTJS_SHA256 = 'db65ba70511147e08494c38a46030c89cb9e3153f455fec50440581fc67cb429'
 
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
\ No newline at end of file